@@ -1,21 +1,64 @@
 # agent.py
-import json
-from typing import List, Dict
-from llm_client import call_llama, SYSTEM_PROMPT
-from tools import TOOLS
+import time
+from typing import Any, List, Dict
+from llm_client import SYSTEM_PROMPT
+from llm_dispatch import dispatch_llm
+from tools import IDEMPOTENCY_ARG, TOOLS
+from result_compactor import compact_result
+from structured_output import compile_tool_validators, extract_json, looks_like_tool_call
+from turn_recorder import get_recorder, prompt_tokens
 
-def run_agent(user_query: str, history: List[Dict]) -> Dict:
+# Argument validators compiled once from the schemas declared in TOOLS.
+VALIDATORS = compile_tool_validators(TOOLS)
+
+REPAIR_PROMPT = (
+    "Your previous reply could not be parsed. Reply again with ONLY the compact "
+    "JSON object from the tool-calling protocol, with no other text."
+)
+
+def _dispatch(trace: Dict[str, Any], messages: List[Dict], session_id: str | None, task: str) -> str:
+    started = time.perf_counter()
+    raw = dispatch_llm(messages, session_id=session_id, task=task)
+    trace["llm_calls"].append({
+        "task": task,
+        "prompt_tokens": prompt_tokens(messages),
+        "ms": round((time.perf_counter() - started) * 1000, 3),
+        "response": raw,
+    })
+    return raw
+
+def run_agent(user_query: str, history: List[Dict], session_id: str | None = None) -> Dict:
     # history: list of {"role": "user/assistant", "content": "..."} for context
+    # session_id: used by the LLM dispatcher to queue sessions fairly
+    # With AGENT_RECORD_PATH set, the turn is also appended to a replay corpus.
+    trace: Dict[str, Any] = {"llm_calls": []}
+    started = time.perf_counter()
+    result = _run_turn(user_query, history, session_id, trace)
+    recorder = get_recorder()
+    if recorder is not None:
+        recorder.record_turn(
+            user_query, history, session_id, result, trace, (time.perf_counter() - started) * 1000
+        )
+    return result
 
+def _run_turn(user_query: str, history: List[Dict], session_id: str | None, trace: Dict[str, Any]) -> Dict:
     messages = [{"role": "system", "content": SYSTEM_PROMPT}] + history + [
         {"role": "user", "content": user_query}
     ]
-    raw = call_llama(messages)
+    raw = _dispatch(trace, messages, session_id, "tool_call")
 
-    # Try to parse JSON, and handle errors gracefully.
-    try:
-        parsed = json.loads(raw)
-    except json.JSONDecodeError:
+    # Parse (and locally repair) the protocol JSON. Only if that fails for a
+    # reply that was clearly attempting a tool call do we ask the model again,
+    # routed to the larger model.
+    parsed = extract_json(raw)
+    if parsed is None and looks_like_tool_call(raw):
+        retry_messages = messages + [
+            {"role": "assistant", "content": raw},
+            {"role": "user", "content": REPAIR_PROMPT},
+        ]
+        raw = _dispatch(trace, retry_messages, session_id, "escalate")
+        parsed = extract_json(raw)
+    if parsed is None:
         # Fallback: treat entire content as a natural reply.
         return {
             "assistant_message": raw,
@@ -27,7 +70,7 @@ def run_agent(user_query: str, history: List[Dict]) -> Dict:
     tool_call = parsed.get("tool_call")
     if tool_call:
         name = tool_call.get("name")
-        args = tool_call.get("arguments", {})
+        args = tool_call.get("arguments") or {}
         tool = TOOLS.get(name)
         if not tool:
             return {
@@ -36,7 +79,16 @@ def run_agent(user_query: str, history: List[Dict]) -> Dict:
                 "tool_result": None,
                 "raw": raw
             }
+        # Coerce arguments to the declared schema ("4" -> 4, dates -> ISO);
+        # values that cannot be coerced are dropped so the tool asks for them.
+        args, arg_errors = VALIDATORS[name](args)
+        # A model-invented key could turn a new booking into someone else's replay.
+        args.pop(IDEMPOTENCY_ARG, None)
+        tool_started = time.perf_counter()
         result = tool["fn"](args)
+        trace["tool_ms"] = (time.perf_counter() - tool_started) * 1000
+        # Only a compact, budgeted projection of the result goes back to the model.
+        result_text, result_stats = compact_result(name, result)
 
         # Now call the model again to explain result to user
         # Note: Avoid role 'tool' as Groq expects tool_call_id. Provide result in a normal message instead.
@@ -45,7 +97,7 @@ def run_agent(user_query: str, history: List[Dict]) -> Dict:
             {
                 "role": "user",
                 "content": (
-                    f"Tool '{name}' returned: {json.dumps(result)}. "
+                    f"Tool '{name}' returned: {result_text}. "
                     "Using only this tool output and the prior conversation, "
                     "reply to the user with a very short answer: either a single concise "
                     "sentence or a simple list of GoodFoods outlets/locations or the final "
@@ -53,11 +105,14 @@ def run_agent(user_query: str, history: List[Dict]) -> Dict:
                 ),
             },
         ]
-        final_raw = call_llama(followup_messages)
+        final_raw = _dispatch(trace, followup_messages, session_id, "reply")
         return {
             "assistant_message": final_raw,
             "tool_used": name,
+            "tool_arguments": args,
+            "argument_errors": arg_errors,
             "tool_result": result,
+            "result_stats": result_stats,
             "raw": final_raw
         }
 
@@ -0,0 +1,250 @@
+"""Headless HTTP API for the GoodFoods agent (for WhatsApp / web-widget channels).
+
+Run with:
+    uvicorn api_server:app --host 0.0.0.0 --port 8000
+
+The event loop only does routing and bookkeeping. Every blocking call
+(`run_agent` -> LLM HTTP + SQLite, direct tool calls) runs on a bounded thread
+pool, and a semaphore caps in-flight work so overload turns into a fast 503
+instead of an ever-growing queue.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import os
+import re
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, Dict
+
+from fastapi import FastAPI, Header, HTTPException
+from pydantic import BaseModel
+
+from agent import VALIDATORS, run_agent
+from demand_forecast import get_demand_table
+from llm_client import provider_stats
+from llm_dispatch import get_dispatcher
+from reservation_db import read_events
+from session_store import (
+    append_turn,
+    get_session_store,
+    history_messages,
+    new_session_state,
+    update_slots,
+)
+from tools import IDEMPOTENCY_ARG, TOOLS, WRITE_TOOLS
+
+MAX_CONCURRENT_TURNS = int(os.getenv("API_MAX_CONCURRENT_TURNS", "64"))
+QUEUE_TIMEOUT_SECONDS = float(os.getenv("API_QUEUE_TIMEOUT_SECONDS", "10"))
+EVICT_INTERVAL_SECONDS = float(os.getenv("API_EVICT_INTERVAL_SECONDS", "60"))
+# Upper bound on one turn (LLM calls + tools); a crashed worker's lease expires after it.
+TURN_LEASE_SECONDS = float(os.getenv("API_TURN_LEASE_SECONDS", "120"))
+TURN_LOCK_POLL_SECONDS = 0.05
+MAX_EVENTS_PAGE = 1000
+# The event feed carries guest names and phone numbers, so it is only served
+# to callers presenting this key (X-API-Key); unset, the feed is disabled.
+EVENTS_API_KEY = os.getenv("API_EVENTS_KEY")
+
+_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_TURNS, thread_name_prefix="agent")
+_slots = asyncio.Semaphore(MAX_CONCURRENT_TURNS)
+
+# Server-side conversation state (in-memory or SQLite, see session_store).
+store = get_session_store()
+_session_locks: Dict[str, asyncio.Lock] = {}
+
+
+async def _evict_idle_sessions() -> None:
+    while True:
+        await asyncio.sleep(EVICT_INTERVAL_SECONDS)
+        await asyncio.get_running_loop().run_in_executor(_executor, store.evict_idle)
+        for session_id in list(_session_locks):
+            if not _session_locks[session_id].locked():
+                _session_locks.pop(session_id, None)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    get_demand_table()  # load precomputed demand curves before serving
+    task = asyncio.create_task(_evict_idle_sessions())
+    yield
+    task.cancel()
+
+
+app = FastAPI(title="GoodFoods Reservation Agent API", lifespan=lifespan)
+
+
+class ChatRequest(BaseModel):
+    message: str
+
+
+class ChatResponse(BaseModel):
+    session_id: str
+    reply: str
+    tool_used: str | None = None
+
+
+async def _offload(fn, *args):
+    """Run a blocking call on the worker pool, respecting the concurrency cap."""
+    try:
+        await asyncio.wait_for(_slots.acquire(), timeout=QUEUE_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=503, detail="Server is busy, please retry.",
+                            headers={"Retry-After": "2"})
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, fn, *args)
+    finally:
+        _slots.release()
+
+
+@asynccontextmanager
+async def _session_turn(session_id: str):
+    """Serialize turns of one session, across workers when the store is shared.
+
+    The asyncio lock orders turns inside this process; the store lease keeps
+    another worker (SESSION_STORE=sqlite) from running a turn at the same time.
+    """
+    lock = _session_locks.setdefault(session_id, asyncio.Lock())
+    async with lock:
+        owner = uuid.uuid4().hex
+        deadline = asyncio.get_running_loop().time() + QUEUE_TIMEOUT_SECONDS
+        while not await _offload(store.try_lock_turn, session_id, owner, TURN_LEASE_SECONDS):
+            if asyncio.get_running_loop().time() > deadline:
+                raise HTTPException(status_code=409, detail="Another message in this session is still being handled.",
+                                    headers={"Retry-After": "2"})
+            await asyncio.sleep(TURN_LOCK_POLL_SECONDS)
+        try:
+            yield
+        finally:
+            await _offload(store.unlock_turn, session_id, owner)
+
+
+async def _get_session(session_id: str) -> Dict[str, Any]:
+    # Store calls are blocking (disk writes with SESSION_STORE=sqlite), so they
+    # run on the worker pool like every other blocking call.
+    state = await _offload(store.get, session_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired session.")
+    return state
+
+
+@app.get("/health")
+async def health() -> Dict[str, Any]:
+    return {"status": "ok"}
+
+
+@app.post("/v1/sessions")
+async def create_session() -> Dict[str, str]:
+    session_id = uuid.uuid4().hex
+    await _offload(store.put, session_id, new_session_state())
+    return {"session_id": session_id}
+
+
+@app.get("/v1/sessions/{session_id}")
+async def get_session(session_id: str) -> Dict[str, Any]:
+    state = await _get_session(session_id)
+    return {"session_id": session_id, **state}
+
+
+@app.delete("/v1/sessions/{session_id}")
+async def delete_session(session_id: str) -> Dict[str, bool]:
+    await _offload(store.delete, session_id)
+    _session_locks.pop(session_id, None)
+    return {"deleted": True}
+
+
+@app.post("/v1/sessions/{session_id}/messages", response_model=ChatResponse)
+async def chat(session_id: str, req: ChatRequest) -> ChatResponse:
+    # Turns within one conversation are serialized; different sessions run in parallel.
+    async with _session_turn(session_id):
+        state = await _get_session(session_id)
+        try:
+            result = await _offload(run_agent, req.message, history_messages(state), session_id)
+        except RuntimeError as e:
+            msg = str(e)
+            if "rate_limit_exceeded" in msg or "429" in msg:
+                raise HTTPException(status_code=503, detail="AI service is busy, please retry.",
+                                    headers={"Retry-After": "5"})
+            raise HTTPException(status_code=502, detail="AI service error.")
+        append_turn(state, req.message, result["assistant_message"])
+        update_slots(state, result.get("tool_arguments"))
+        await _offload(store.put, session_id, state)
+    return ChatResponse(
+        session_id=session_id,
+        reply=result["assistant_message"],
+        tool_used=result["tool_used"],
+    )
+
+
+@app.get("/v1/metrics/llm")
+async def llm_metrics() -> Dict[str, Any]:
+    return {"dispatcher": get_dispatcher().metrics(), "providers": provider_stats()}
+
+
+@app.get("/v1/events")
+async def events(
+    since: int = 0,
+    limit: int = 100,
+    x_api_key: str | None = Header(default=None),
+) -> Dict[str, Any]:
+    """Reservation change feed: pass back `next_since` to continue where you left off."""
+    if not EVENTS_API_KEY:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_api_key or not hmac.compare_digest(x_api_key, EVENTS_API_KEY):
+        raise HTTPException(status_code=401, detail="Missing or invalid X-API-Key.")
+    batch = await _offload(read_events, since, max(1, min(limit, MAX_EVENTS_PAGE)))
+    return {"events": batch, "next_since": batch[-1]["seq"] if batch else since}
+
+
+@app.get("/v1/tools")
+async def list_tools() -> Dict[str, Any]:
+    return {
+        "tools": [
+            {"name": name, "description": t["description"], "schema": t["schema"]}
+            for name, t in TOOLS.items()
+        ]
+    }
+
+
+def _scoped_idempotency_key(key: str, args: Dict[str, Any]) -> str:
+    """Scope a client's Idempotency-Key to the guest's phone number.
+
+    Two clients that happen to send the same key for different guests must
+    not get each other's booking back.
+    """
+    digits = re.sub(r"\D", "", str(args.get("phone") or ""))[-10:]
+    return hashlib.sha1(f"{digits}|{key}".encode("utf-8")).hexdigest()[:20]
+
+
+@app.post("/v1/tools/{name}")
+async def call_tool(
+    name: str,
+    args: Dict[str, Any],
+    idempotency_key: str | None = Header(default=None),
+) -> Dict[str, Any]:
+    tool = TOOLS.get(name)
+    if not tool:
+        raise HTTPException(status_code=404, detail=f"Unknown tool '{name}'.")
+    # Same schema coercion as the agent ("4" -> 4, dates -> ISO); unlike the
+    # agent, a direct caller gets values that cannot be coerced back as a 422.
+    args, arg_errors = VALIDATORS[name](args)
+    if arg_errors:
+        raise HTTPException(status_code=422, detail={
+            "error": "Invalid tool arguments.",
+            "invalid_fields": [e.split(":", 1)[0] for e in arg_errors],
+            "errors": arg_errors,
+        })
+    # Keys come only from the header, so they are always scoped per phone.
+    args.pop(IDEMPOTENCY_ARG, None)
+    if idempotency_key and name in WRITE_TOOLS:
+        # A retried POST with the same Idempotency-Key returns the original booking.
+        args = {**args, IDEMPOTENCY_ARG: _scoped_idempotency_key(idempotency_key, args)}
+    return await _offload(tool["fn"], args)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host=os.getenv("API_HOST", "127.0.0.1"), port=int(os.getenv("API_PORT", "8000")))
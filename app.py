@@ -1,21 +1,143 @@
  # app.py
 import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
 import streamlit as st
 from agent import run_agent
-from tools import tool_list_reservations
+from tools import tool_list_reservations, WRITE_TOOLS
 from restaurant_data import RESTAURANTS
+from reservation_db import get_slot_covers, init_db, list_active_between, mark_seated
+from llm_client import get_http_session
+from datetime import timedelta
+from datetime_parser import local_now, to_canonical
+from demand_forecast import get_demand_table
+from session_store import append_turn, get_session_store, history_messages, new_session_state, update_slots
+
+_render_started = time.perf_counter()
 
 st.set_page_config(page_title="GoodFoods AI Reservation Agent", page_icon="🍽️")
 
 st.title("🍽️ GoodFoods Reservation Assistant")
 
-if "history" not in st.session_state:
-    st.session_state.history = []
 
-tab_chat, tab_reservations = st.tabs(["Chat", "My Reservations"])
+# Process-level caches shared by every session and rerun. Anything that writes
+# bookings must call invalidate_booking_caches() afterwards.
+
+@st.cache_resource(show_spinner=False)
+def get_catalog_index() -> dict:
+    """restaurant_id -> restaurant, built once per process."""
+    return {r["id"]: r for r in RESTAURANTS}
+
+
+@st.cache_resource(show_spinner=False)
+def init_backends() -> None:
+    """Create DB tables, the shared LLM HTTP session and the demand table once per process."""
+    init_db()
+    get_http_session()
+    get_demand_table()
+
+
+@st.cache_resource(show_spinner=False)
+def get_store():
+    """Conversation store shared by all sessions (SESSION_STORE=sqlite to persist)."""
+    return get_session_store()
+
+
+# Same knobs as api_server: turns of one session never overlap, whichever
+# worker or channel (browser tab, API) runs them.
+TURN_LEASE_SECONDS = float(os.getenv("API_TURN_LEASE_SECONDS", "120"))
+TURN_WAIT_SECONDS = float(os.getenv("API_QUEUE_TIMEOUT_SECONDS", "10"))
+TURN_LOCK_POLL_SECONDS = 0.05
+
+
+@st.cache_resource(show_spinner=False)
+def get_turn_locks() -> list:
+    """Striped in-process locks; the store lease covers other processes."""
+    return [threading.Lock() for _ in range(64)]
+
+
+@contextmanager
+def session_turn(session_id: str):
+    """Hold the session's turn for the block; yields False if it stayed busy."""
+    locks = get_turn_locks()
+    lock = locks[hash(session_id) % len(locks)]
+    if not lock.acquire(timeout=TURN_WAIT_SECONDS):
+        yield False
+        return
+    try:
+        owner = uuid.uuid4().hex
+        deadline = time.monotonic() + TURN_WAIT_SECONDS
+        while not store.try_lock_turn(session_id, owner, TURN_LEASE_SECONDS):
+            if time.monotonic() > deadline:
+                yield False
+                return
+            time.sleep(TURN_LOCK_POLL_SECONDS)
+        try:
+            yield True
+        finally:
+            store.unlock_turn(session_id, owner)
+    finally:
+        lock.release()
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_reservations(phone: str, include_past: bool, cursor: str | None) -> dict:
+    """One page of reservations; each page is cached on its own keyset cursor."""
+    args = {"phone": phone, "cursor": cursor, "limit": 20}
+    if include_past:
+        args.update({"include_past": True, "status": "all"})
+    return tool_list_reservations(args)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def load_outlet_load(day: str) -> list[dict]:
+    """Covers per outlet per hour for one day, read from the pre-aggregated table.
+
+    Cached for a short TTL so many staff refreshing the page share one query.
+    """
+    catalog = get_catalog_index()
+    rows = []
+    for agg in get_slot_covers(day):
+        rinfo = catalog.get(agg["restaurant_id"], {})
+        cap = rinfo.get("capacity") or 0
+        rows.append({
+            "Outlet": rinfo.get("name", agg["restaurant_id"]),
+            "Area": rinfo.get("area", ""),
+            "Slot": agg["slot"][11:],
+            "Bookings": agg["bookings"],
+            "Covers": agg["covers"],
+            "Capacity": cap,
+            "Utilization %": round(100 * agg["covers"] / cap) if cap else None,
+        })
+    return rows
+
+
+def invalidate_booking_caches() -> None:
+    load_reservations.clear()
+    load_outlet_load.clear()
+
+
+init_backends()
+
+# Conversation state lives in the session store, keyed by the ?sid= URL
+# parameter, so it survives reruns, restarts and moves between workers.
+store = get_store()
+if "session_id" not in st.session_state:
+    st.session_state.session_id = st.query_params.get("sid") or uuid.uuid4().hex
+    st.query_params["sid"] = st.session_state.session_id
+    st.session_state.chat = store.get(st.session_state.session_id) or new_session_state()
+chat_state = st.session_state.chat
+
+# The occupancy dashboard is for outlet staff only; the public app leaves it out.
+SHOW_STAFF_DASHBOARD = bool(os.getenv("GOODFOODS_STAFF_DASHBOARD"))
+tab_names = ["Chat", "My Reservations"] + (["Outlet Dashboard"] if SHOW_STAFF_DASHBOARD else [])
+tab_chat, tab_reservations, *tab_staff = st.tabs(tab_names)
 
 with tab_chat:
-    for turn in st.session_state.history:
+    for turn in chat_state["history"]:
         with st.chat_message("user"):
             st.write(turn["user"])
         with st.chat_message("assistant"):
@@ -33,47 +155,106 @@ with tab_chat:
     user_input = st.chat_input("Ask me to book a table, modify, or cancel a reservation...")
 
     if user_input:
-        try:
-            result = run_agent(user_input, [
-                {"role": "user", "content": h["user"]}
-                for h in st.session_state.history
-            ] + [
-                {"role": "assistant", "content": h["assistant"]}
-                for h in st.session_state.history
-            ])
-        except RuntimeError as e:
-            msg = str(e)
-            if "rate_limit_exceeded" in msg or "429" in msg:
-                st.error("Our AI service is getting a bit busy right now. Please wait a few seconds and try again.")
+        session_id = st.session_state.session_id
+        rerun = False
+        with session_turn(session_id) as claimed:
+            if not claimed:
+                st.warning("Your previous message is still being handled. Please send this one again in a moment.")
             else:
-                st.error("Something went wrong while talking to the AI service. Please try again in a moment.")
-        else:
-            st.session_state.history.append({
-                "user": user_input,
-                "assistant": result["assistant_message"]
-            })
-
+                # Another tab or the API may have added turns since this page loaded.
+                chat_state = store.get(session_id) or chat_state
+                st.session_state.chat = chat_state
+                try:
+                    result = run_agent(user_input, history_messages(chat_state), session_id)
+                except RuntimeError as e:
+                    msg = str(e)
+                    if "rate_limit_exceeded" in msg or "429" in msg:
+                        st.error("Our AI service is getting a bit busy right now. Please wait a few seconds and try again.")
+                    else:
+                        st.error("Something went wrong while talking to the AI service. Please try again in a moment.")
+                else:
+                    if result.get("tool_used") in WRITE_TOOLS:
+                        invalidate_booking_caches()
+                    append_turn(chat_state, user_input, result["assistant_message"])
+                    update_slots(chat_state, result.get("tool_arguments"))
+                    store.put(session_id, chat_state)
+                    rerun = True
+        # st.rerun() raises to restart the script, so it runs after the lease is released.
+        if rerun:
             st.rerun()
 
 with tab_reservations:
     st.subheader("View your reservations")
     phone = st.text_input("Enter your phone number")
+    include_past = st.checkbox("Include past and cancelled bookings")
     if st.button("Show my reservations") and phone:
-        # Call the reservation tool directly for a clean UI
-        result = tool_list_reservations({"phone": phone})
-        reservations = result.get("reservations", [])
+        st.session_state.reservation_query = (phone, include_past)
+        st.session_state.reservation_pages = 1
+
+    query = st.session_state.get("reservation_query")
+    if query:
+        # Call the reservation tool directly for a clean UI, one cached page at a time
+        reservations, cursor = [], None
+        for _ in range(st.session_state.reservation_pages):
+            page = load_reservations(*query, cursor)
+            reservations += page["reservations"]
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
 
         if not reservations:
             st.info("No reservations found for this phone number.")
         else:
-            # Build a quick lookup from restaurant_id to name/area
-            id_to_restaurant = {r["id"]: r for r in RESTAURANTS}
+            id_to_restaurant = get_catalog_index()
             for res in reservations:
                 rinfo = id_to_restaurant.get(res["restaurant_id"], {})
                 name = rinfo.get("name", res["restaurant_id"])
                 area = rinfo.get("area", "")
+                status = "" if res["status"] == "active" else f" — _{res['status']}_"
                 st.markdown(
                     f"- **{name}** ({area}) — {res['datetime']} — "
-                    f"{res['party_size']} people — Reservation ID: `{res['id']}`"
+                    f"{res['party_size']} people — Reservation ID: `{res['id']}`{status}"
                 )
+            if cursor and st.button("Load more"):
+                st.session_state.reservation_pages += 1
+                st.rerun()
+
+
+if tab_staff:
+    with tab_staff[0]:
+        st.subheader("Outlet occupancy")
+        # Bangalore date, not the server's local date.
+        day = st.date_input("Date", value=local_now().date())
+        rows = load_outlet_load(day.isoformat())
+        if not rows:
+            st.info("No bookings for this date yet.")
+        else:
+            areas = sorted({r["Area"] for r in rows})
+            picked = st.multiselect("Areas", areas)
+            if picked:
+                rows = [r for r in rows if r["Area"] in picked]
+            st.metric("Covers booked", sum(r["Covers"] for r in rows))
+            st.dataframe(rows, hide_index=True)
+
+        # Check-in: seated guests are not flagged as no-shows by the scheduler.
+        st.subheader("Check in guests")
+        start = local_now().replace(hour=0, minute=0, second=0, microsecond=0)
+        arriving = list_active_between(to_canonical(start), to_canonical(start + timedelta(days=1)))
+        if not arriving:
+            st.info("No active bookings left today.")
+        else:
+            catalog = get_catalog_index()
+            labels = {
+                r["id"]: f"{r['datetime'][11:16]} · {catalog.get(r['restaurant_id'], {}).get('name', r['restaurant_id'])}"
+                         f" · {r['name']} ({r['party_size']}) · {r['id']}"
+                for r in arriving
+            }
+            picked_id = st.selectbox("Booking", list(labels), format_func=labels.get)
+            if st.button("Check in"):
+                if mark_seated(picked_id):
+                    st.success(f"Checked in {labels[picked_id]}.")
+                else:
+                    st.warning("That booking is no longer active.")
 
+if os.getenv("GOODFOODS_SHOW_TIMINGS"):
+    st.sidebar.caption(f"Rendered in {(time.perf_counter() - _render_started) * 1000:.1f} ms")
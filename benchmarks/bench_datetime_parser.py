@@ -0,0 +1,42 @@
+"""Parse-throughput benchmark for datetime_parser.
+
+    python benchmarks/bench_datetime_parser.py [--n 200000]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime_parser import normalize_booking_datetime  # noqa: E402
+
+PHRASES = {
+    "canonical": ["2025-12-01T20:00:00+05:30", "2026-01-15T13:30:00+05:30"],
+    "iso-like": ["2025-12-01 20:00", "2025-11-29 8:00PM"],
+    "relative": ["tomorrow 8pm", "tonight at 9", "day after tomorrow 13:00", "in 3 days at noon"],
+    "weekday": ["next friday at 7:30 pm", "saturday 8 p.m."],
+    "explicit": ["Dec 1, 8 PM", "1st December 2025 at 7:30 pm", "01/12/2025 20:00"],
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=200_000, help="parses per category")
+    args = parser.parse_args()
+    now = datetime(2025, 11, 27, 15, 0)
+
+    for category, phrases in PHRASES.items():
+        for phrase in phrases:
+            assert normalize_booking_datetime(phrase, now), phrase
+        started = time.perf_counter()
+        for i in range(args.n):
+            normalize_booking_datetime(phrases[i % len(phrases)], now)
+        elapsed = time.perf_counter() - started
+        print(f"{category:10} {args.n / elapsed:>12,.0f} parses/s  {elapsed / args.n * 1e6:6.2f} us/parse")
+
+
+if __name__ == "__main__":
+    main()
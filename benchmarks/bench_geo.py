@@ -0,0 +1,63 @@
+"""k-nearest latency of geo.GridIndex vs a brute-force scan on synthetic outlets.
+
+    python benchmarks/bench_geo.py [--queries 2000] [--k 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from geo import GridIndex, haversine_km  # noqa: E402
+
+# Rough Bangalore bounding box.
+LAT_RANGE = (12.80, 13.20)
+LON_RANGE = (77.45, 77.80)
+
+
+def _point(rng: random.Random) -> tuple[float, float]:
+    return rng.uniform(*LAT_RANGE), rng.uniform(*LON_RANGE)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+    rng = random.Random(7)
+
+    for size in (60, 1_000, 10_000, 100_000):
+        outlets = []
+        for i in range(size):
+            lat, lon = _point(rng)
+            outlets.append({"id": i, "lat": lat, "lon": lon, "capacity": rng.choice((40, 70, 120, 200))})
+        started = time.perf_counter()
+        index = GridIndex(outlets)
+        build_ms = (time.perf_counter() - started) * 1000
+        queries = [_point(rng) for _ in range(args.queries)]
+        fits = lambda r: r["capacity"] >= 6  # noqa: E731
+
+        started = time.perf_counter()
+        for lat, lon in queries:
+            index.nearest(lat, lon, k=args.k, predicate=fits)
+        grid_us = (time.perf_counter() - started) / len(queries) * 1e6
+
+        sample = queries[: max(1, len(queries) // 20)]
+        started = time.perf_counter()
+        for lat, lon in sample:
+            sorted(
+                (haversine_km(lat, lon, r["lat"], r["lon"]), r["id"]) for r in outlets if fits(r)
+            )[: args.k]
+        scan_us = (time.perf_counter() - started) / len(sample) * 1e6
+
+        print(
+            f"{size:>7} outlets  build {build_ms:7.1f} ms  grid {grid_us:8.1f} us/query"
+            f"  scan {scan_us:10.1f} us/query"
+        )
+
+
+if __name__ == "__main__":
+    main()
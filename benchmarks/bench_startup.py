@@ -0,0 +1,98 @@
+"""Cold-start cost: time from a fresh interpreter to the first agent response.
+
+Each run is a new process that imports `agent`, answers one turn through a
+stub LLM (tool call -> find_nearby -> reply) and exits. "eager" first
+imports the packages the modules used to load at import time (requests,
+python-dotenv, numpy, difflib) to show what lazy loading saves.
+
+    python benchmarks/bench_startup.py [--runs 10]
+    python benchmarks/bench_startup.py --importtime   # top modules by import cost
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIRST_TURN = r"""
+import json, sys, time
+started = time.perf_counter()
+{preload}
+import reservation_db
+reservation_db.DB_PATH = sys.argv[1]
+import agent
+import llm_dispatch
+imported = time.perf_counter()
+
+replies = iter([
+    json.dumps({{"tool_call": {{"name": "find_nearby", "arguments": {{"place": "near Domlur", "party_size": 4}}}}}}),
+    "The closest outlet is GoodFoods Indiranagar #1.",
+])
+llm_dispatch._DISPATCHER = llm_dispatch.LLMDispatcher(call=lambda messages, **kw: next(replies))
+agent.run_agent("tables near Domlur for 4", [], session_id="bench")
+done = time.perf_counter()
+print(json.dumps({{"import_ms": (imported - started) * 1000, "first_response_ms": (done - started) * 1000}}))
+"""
+
+VARIANTS = {
+    "lazy": "",
+    "eager": "import requests, dotenv, numpy, difflib",
+}
+
+
+def _run(code: str, db_path: str) -> dict:
+    started = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-c", code, db_path], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    result["process_ms"] = (time.perf_counter() - started) * 1000
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--importtime", action="store_true")
+    args = parser.parse_args()
+
+    if args.importtime:
+        out = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import agent"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        rows = []
+        for line in out.stderr.splitlines():
+            if not line.startswith("import time:") or "self [us]" in line:
+                continue
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            rows.append((int(cumulative_us), int(self_us), name.strip()))
+        for cumulative_us, self_us, name in sorted(rows, reverse=True)[:20]:
+            print(f"{cumulative_us / 1000:8.1f} ms cumulative {self_us / 1000:7.1f} ms self  {name}")
+        return
+
+    tmp = tempfile.mkdtemp()
+    try:
+        db_path = os.path.join(tmp, "reservations.db")
+        shutil.copy(os.path.join(ROOT, "reservations.db"), db_path)
+        _run(FIRST_TURN.format(preload=""), db_path)  # warm the .pyc cache
+        for name, preload in VARIANTS.items():
+            runs = [_run(FIRST_TURN.format(preload=preload), db_path) for _ in range(args.runs)]
+            print(
+                f"{name:6} import {statistics.median(r['import_ms'] for r in runs):6.1f} ms"
+                f"  first response {statistics.median(r['first_response_ms'] for r in runs):6.1f} ms"
+                f"  whole process {statistics.median(r['process_ms'] for r in runs):6.1f} ms"
+            )
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
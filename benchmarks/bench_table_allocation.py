@@ -0,0 +1,72 @@
+"""Latency and seat waste of the table allocator.
+
+Per outlet size: greedy only vs greedy + bounded exact search (the default
+path of allocate_tables), for random party sizes up to the outlet's
+capacity. Then plan_group over the real catalog for parties too big for a
+single outlet.
+
+    python benchmarks/bench_table_allocation.py [--parties 500]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from restaurant_data import RESTAURANTS  # noqa: E402
+from table_allocation import _cost, _greedy, allocate_tables, default_layout, plan_group  # noqa: E402
+
+
+def _pct(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--parties", type=int, default=500)
+    args = parser.parse_args()
+    rng = random.Random(11)
+
+    for capacity in (40, 120, 200, 400):
+        tables = default_layout({"capacity": capacity, "has_outdoor_seating": True})
+        parties = [rng.randint(2, capacity) for _ in range(args.parties)]
+        greedy_us, solver_us, greedy_waste, solver_waste, methods = [], [], [], [], {}
+        for party in parties:
+            started = time.perf_counter()
+            picked = _greedy(tables, party)
+            greedy_us.append((time.perf_counter() - started) * 1e6)
+            started = time.perf_counter()
+            result = allocate_tables(tables, party)
+            solver_us.append((time.perf_counter() - started) * 1e6)
+            greedy_waste.append(_cost(picked, party)[1])
+            solver_waste.append(result["empty_seats"])
+            methods[result["method"]] = methods.get(result["method"], 0) + 1
+        print(
+            f"{capacity:>4} seats / {len(tables):>3} tables"
+            f"  greedy p50 {statistics.median(greedy_us):6.1f} us"
+            f"  solver p50 {statistics.median(solver_us):7.1f} us p99 {_pct(solver_us, 0.99):8.1f} us"
+            f"  empty seats greedy {statistics.mean(greedy_waste):4.2f} -> {statistics.mean(solver_waste):4.2f}"
+            f"  {methods}"
+        )
+
+    ids = [r["id"] for r in RESTAURANTS]
+    for party in (150, 300, 450):
+        runs = []
+        for _ in range(50):
+            candidates = rng.sample(ids, 10)
+            started = time.perf_counter()
+            plan = plan_group(party, candidates)
+            runs.append((time.perf_counter() - started) * 1000)
+        print(
+            f"plan_group party {party:>3}: p50 {statistics.median(runs):6.2f} ms"
+            f"  p99 {_pct(runs, 0.99):6.2f} ms  outlets {len(plan['outlets']) if plan else None}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Precompiled outlet lookup indexes for fast cold starts.
+
+Workers otherwise rebuild the gazetteer alias table and the geo grid on
+first use. The snapshot is one pickle of just those two indexes (the
+restaurant list itself is a cheap literal import), written offline and
+loaded by `geo` on first use:
+
+    python catalog_snapshot.py        # rebuild after editing restaurant_data.py / geo.py
+
+A snapshot whose recorded source mtimes no longer match is ignored, so a
+stale file can never serve an outdated catalog.
+"""
+
+import os
+import pickle
+from typing import Any, Dict
+
+SNAPSHOT_PATH = os.getenv(
+    "CATALOG_SNAPSHOT_PATH", os.path.join(os.path.dirname(__file__), "catalog.snapshot")
+)
+SNAPSHOT_VERSION = 2
+
+_SOURCES = ("restaurant_data.py", "geo.py")
+
+
+def _source_mtimes() -> Dict[str, int]:
+    here = os.path.dirname(os.path.abspath(__file__))
+    return {name: os.stat(os.path.join(here, name)).st_mtime_ns for name in _SOURCES}
+
+
+def build_snapshot() -> Dict[str, Any]:
+    import geo
+    from restaurant_data import RESTAURANTS
+
+    return {
+        "version": SNAPSHOT_VERSION,
+        "sources": _source_mtimes(),
+        "aliases": geo.build_aliases(),
+        "outlet_index": geo.GridIndex([r for r in RESTAURANTS if "lat" in r]),
+    }
+
+
+def write_snapshot(path: str | None = None) -> str:
+    path = path or SNAPSHOT_PATH
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(build_snapshot(), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+    return path
+
+
+def load_snapshot(path: str | None = None) -> Dict[str, Any] | None:
+    """The snapshot if it exists and matches the current sources, else None."""
+    path = path or SNAPSHOT_PATH
+    try:
+        with open(path, "rb") as f:
+            snapshot = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+    if snapshot.get("version") != SNAPSHOT_VERSION or snapshot.get("sources") != _source_mtimes():
+        return None
+    return snapshot
+
+
+if __name__ == "__main__":
+    written = write_snapshot()
+    print(f"wrote {written} ({os.path.getsize(written)} bytes)")
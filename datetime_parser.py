@@ -0,0 +1,279 @@
+"""Fast local parser for booking date/time phrases (Asia/Kolkata).
+
+Turns whatever the user or model wrote ("tomorrow 8pm", "Dec 1, 8 PM",
+"2025-12-01 20:00", "next friday at 7:30 pm") into one canonical ISO timestamp:
+
+    2025-12-01T20:00:00+05:30
+
+Every stored reservation uses this form, so string order equals time order
+and range queries / indexes over `datetime` are meaningful. IST has no DST,
+so a fixed +05:30 offset is exact and avoids a tz database lookup.
+
+Conventions for ambiguous input:
+- numeric dates are day-first (01/12/2025 is 1 December), as in India;
+- a bare hour 1-10 with no am/pm and no leading zero ("at 8") is read as
+  evening, since that is when people book tables;
+- an hour with minutes reads on the 24-hour clock when it says so ("19:30",
+  "07:30", "12:15"); "7:30" or "10:00" could be either, so unless a word
+  settles it ("tonight", "dinner", "morning") it does not parse and
+  `needs_meridiem` tells the caller to ask for am/pm rather than guess;
+- "H.MM" is a time only when it cannot be a day.month date ("19.30",
+  "20.00"); "1.12" stays 1 December;
+- a date without a year is the next such date on or after today;
+- a time without a date is today if still ahead, otherwise tomorrow.
+"""
+
+import re
+from datetime import date, datetime, time, timedelta, timezone
+
+IST = timezone(timedelta(hours=5, minutes=30))
+
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+_WEEKDAYS = {"mon": 0, "tue": 1, "wed": 2, "thu": 3, "fri": 4, "sat": 5, "sun": 6}
+_MONTH_RE = r"(jan|feb|mar|apr|may|jun|jul|aug|sept?|oct|nov|dec)[a-z]*\.?"
+_WEEKDAY_RE = r"(mon|tues?|wed|thu(?:rs?)?|fri|sat|sun)[a-z]*"
+
+# Canonical / ISO-like input: the common case, handled without the general path.
+_ISO_RE = re.compile(
+    r"^(\d{4})-(\d{1,2})-(\d{1,2})(?:[ t](\d{1,2}):(\d{2})(?::(\d{2}))?(?:\.\d+)?\s*([ap]m)?"
+    r"(z|[+-]\d{2}:?\d{2})?)?$"
+)
+_TIME_12_RE = re.compile(r"\b(\d{1,2})(?:[:.](\d{2}))?\s*([ap])\.?\s*m\b\.?")
+_TIME_24_RE = re.compile(r"\b(\d{1,2}):(\d{2})(?::\d{2})?\b")
+_TIME_DOT_RE = re.compile(r"(?<![\d/\-.])(\d{1,2})\.(\d{2})\b(?![/\-.]\d)")
+_TIME_WORD_RE = re.compile(r"\b(noon|midday|midnight)\b")
+_PM_WORDS_RE = re.compile(r"\b(tonight|evening|night|dinner)\b")
+_MIDDAY_WORDS_RE = re.compile(r"\b(lunch|afternoon)\b")
+_AM_WORDS_RE = re.compile(r"\b(morning|breakfast|brunch)\b")
+_TIME_BARE_RE = re.compile(r"\bat\s+(\d{1,2})\b(?![/\-.]\d)")
+_DATE_YMD_RE = re.compile(r"\b(\d{4})[-/](\d{1,2})[-/](\d{1,2})\b")
+_DATE_DMY_RE = re.compile(r"\b(\d{1,2})[/\-.](\d{1,2})(?:[/\-.](\d{2,4}))?\b")
+_DATE_DAY_MONTH_RE = re.compile(r"\b(\d{1,2})(?:st|nd|rd|th)?\s+(?:of\s+)?" + _MONTH_RE + r",?(?:\s+(\d{4}))?")
+_DATE_MONTH_DAY_RE = re.compile(r"\b" + _MONTH_RE + r"\s+(\d{1,2})(?:st|nd|rd|th)?\b,?(?:\s+(\d{4}))?")
+_IN_DAYS_RE = re.compile(r"\bin\s+(\d{1,2})\s+days?\b")
+_WEEKDAY_PHRASE_RE = re.compile(r"\b(?:(next|this|coming)\s+)?" + _WEEKDAY_RE + r"\b")
+
+
+def local_now() -> datetime:
+    """Current Bangalore wall-clock time as a naive datetime."""
+    return datetime.now(IST).replace(tzinfo=None)
+
+
+def local_from_utc(value: str | None) -> datetime | None:
+    """Bangalore wall-clock time for a stored UTC ISO stamp (created_at etc.)."""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(IST).replace(tzinfo=None)
+
+
+def to_canonical(dt: datetime) -> str:
+    """Canonical stored form: ISO 8601 with seconds and the +05:30 offset."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=IST)
+    return dt.astimezone(IST).isoformat(timespec="seconds")
+
+
+def _evening(hour: int, padded: bool) -> int:
+    return hour + 12 if 1 <= hour <= 10 and not padded else hour
+
+
+def _clock(hour: int, padded: bool) -> str:
+    """How an hour with minutes and no am/pm reads: "24h" or "ambiguous" (1-11)."""
+    return "ambiguous" if 1 <= hour <= 11 and not padded else "24h"
+
+
+def _parse_time(text: str) -> tuple[time | None, str, str]:
+    """Return (time, text with the time removed, clock).
+
+    clock is "explicit" (am/pm, noon), "24h", "evening" (bare hour read as
+    pm) or "ambiguous" (H:MM 1-11 with nothing saying am or pm).
+    """
+    m = _TIME_12_RE.search(text)
+    if m:
+        hour, minute = int(m.group(1)), int(m.group(2) or 0)
+        if not 1 <= hour <= 12 or minute > 59:
+            return None, text, ""
+        hour = hour % 12 + (12 if m.group(3) == "p" else 0)
+        return time(hour, minute), text[:m.start()] + " " + text[m.end():], "explicit"
+    m = _TIME_24_RE.search(text)
+    if m:
+        hour, minute = int(m.group(1)), int(m.group(2))
+        if hour > 23 or minute > 59:
+            return None, text, ""
+        clock = _clock(hour, m.group(1).startswith("0"))
+        return time(hour, minute), text[:m.start()] + " " + text[m.end():], clock
+    m = _TIME_DOT_RE.search(text)
+    if m:
+        hour, minute = int(m.group(1)), int(m.group(2))
+        # "19.30" / "20.00" cannot be a day.month date; "1.12" can and is left to _parse_date.
+        if hour <= 23 and minute <= 59 and (minute > 12 or minute == 0 or hour == 0):
+            clock = _clock(hour, m.group(1).startswith("0"))
+            return time(hour, minute), text[:m.start()] + " " + text[m.end():], clock
+    m = _TIME_WORD_RE.search(text)
+    if m:
+        value = time(0, 0) if m.group(1) == "midnight" else time(12, 0)
+        return value, text[:m.start()] + " " + text[m.end():], "explicit"
+    m = _TIME_BARE_RE.search(text)
+    if m and int(m.group(1)) <= 23:
+        hour = int(m.group(1))
+        padded = m.group(1).startswith("0")
+        clock = "evening" if _evening(hour, padded) != hour else "24h"
+        return time(_evening(hour, padded), 0), text[:m.start()] + " " + text[m.end():], clock
+    return None, text, ""
+
+
+def _apply_day_part(parsed: time, rest: str, clock: str) -> time | None:
+    """Settle am/pm from words like "tonight" or "morning"; None if still ambiguous."""
+    if clock in ("explicit", "24h"):
+        return parsed
+    if _PM_WORDS_RE.search(rest) and parsed.hour < 12:
+        return parsed.replace(hour=parsed.hour + 12)
+    if _MIDDAY_WORDS_RE.search(rest):
+        # Lunch runs from late morning: "lunch at 1:30" is 13:30, "lunch 11:30" stays.
+        return parsed.replace(hour=parsed.hour + 12) if parsed.hour <= 5 else parsed
+    if _AM_WORDS_RE.search(rest):
+        return parsed.replace(hour=parsed.hour - 12) if clock == "evening" else parsed
+    return None if clock == "ambiguous" else parsed
+
+
+def _year(value: str | None) -> int | None:
+    if not value:
+        return None
+    year = int(value)
+    return year + 2000 if year < 100 else year
+
+
+def _next_occurrence(today: date, month: int, day: int, year: int | None) -> date | None:
+    try:
+        if year:
+            return date(year, month, day)
+        candidate = date(today.year, month, day)
+        return candidate if candidate >= today else date(today.year + 1, month, day)
+    except ValueError:
+        return None
+
+
+def _parse_date(text: str, today: date) -> date | None:
+    if "day after tomorrow" in text:
+        return today + timedelta(days=2)
+    if re.search(r"\b(tomorrow|tmrw|tmr|tomorow)\b", text):
+        return today + timedelta(days=1)
+    if re.search(r"\b(today|tonight|this evening|this afternoon)\b", text):
+        return today
+    m = _IN_DAYS_RE.search(text)
+    if m:
+        return today + timedelta(days=int(m.group(1)))
+    m = _DATE_YMD_RE.search(text)
+    if m:
+        return _next_occurrence(today, int(m.group(2)), int(m.group(3)), int(m.group(1)))
+    m = _DATE_DAY_MONTH_RE.search(text)
+    if m:
+        return _next_occurrence(today, _MONTHS[m.group(2)[:3]], int(m.group(1)), _year(m.group(3)))
+    m = _DATE_MONTH_DAY_RE.search(text)
+    if m:
+        return _next_occurrence(today, _MONTHS[m.group(1)[:3]], int(m.group(2)), _year(m.group(3)))
+    m = _DATE_DMY_RE.search(text)
+    if m:
+        return _next_occurrence(today, int(m.group(2)), int(m.group(1)), _year(m.group(3)))
+    m = _WEEKDAY_PHRASE_RE.search(text)
+    if m:
+        target = _WEEKDAYS[m.group(2)[:3]]
+        ahead = (target - today.weekday()) % 7
+        if m.group(1) == "next" and ahead == 0:
+            ahead = 7
+        return today + timedelta(days=ahead)
+    return None
+
+
+def parse_booking_datetime(text: str, now: datetime | None = None) -> datetime | None:
+    """Parse a booking phrase into an aware IST datetime, or None if unparseable.
+
+    `now` (naive Bangalore time) anchors relative phrases; defaults to the
+    current time.
+    """
+    if not text:
+        return None
+    # Canonical / strict ISO values (every migrated row) parse in C.
+    if len(text) >= 16 and text[4] == "-" and text[10] in " T":
+        try:
+            parsed = datetime.fromisoformat(text)
+        except ValueError:
+            pass
+        else:
+            return parsed.replace(tzinfo=IST) if parsed.tzinfo is None else parsed.astimezone(IST)
+    lowered = text.strip().lower()
+
+    m = _ISO_RE.match(lowered)
+    if m:
+        year, month, day, hour, minute, second, meridiem, offset = m.groups()
+        if hour is None:
+            return None
+        try:
+            h = int(hour)
+            if meridiem:
+                h = h % 12 + (12 if meridiem == "pm" else 0)
+            parsed = datetime(int(year), int(month), int(day), h, int(minute or 0), int(second or 0))
+        except ValueError:
+            return None
+        if offset:
+            tz = timezone.utc if offset == "z" else timezone(
+                (1 if offset[0] == "+" else -1)
+                * timedelta(hours=int(offset[1:3]), minutes=int(offset[-2:]))
+            )
+            return parsed.replace(tzinfo=tz).astimezone(IST)
+        return parsed.replace(tzinfo=IST)
+
+    now = now or local_now()
+    text = " " + lowered.replace(",", " , ") + " "
+    parsed_time, rest, clock = _parse_time(text)
+    if parsed_time is None:
+        return None
+    parsed_time = _apply_day_part(parsed_time, rest, clock)
+    if parsed_time is None:
+        return None
+    parsed_date = _parse_date(rest, now.date())
+    if parsed_date is None:
+        if not rest.strip(" ,") or re.fullmatch(r"[\s,]*(at|on|around|by)?[\s,]*", rest):
+            parsed_date = now.date()
+            if datetime.combine(parsed_date, parsed_time) <= now:
+                parsed_date += timedelta(days=1)
+        else:
+            return None
+    return datetime.combine(parsed_date, parsed_time, tzinfo=IST)
+
+
+def needs_meridiem(text: str) -> bool:
+    """Whether a phrase only failed to parse because its time lacks am/pm ("7:30")."""
+    lowered = " " + (text or "").strip().lower().replace(",", " , ") + " "
+    if _ISO_RE.match(lowered.strip()):
+        return False
+    parsed_time, rest, clock = _parse_time(lowered)
+    return parsed_time is not None and _apply_day_part(parsed_time, rest, clock) is None
+
+
+def parse_booking_date(text: str, now: datetime | None = None) -> date | None:
+    """Parse just a date phrase ("tomorrow", "Dec 1", "01/12/2025")."""
+    if not text:
+        return None
+    lowered = text.strip().lower()
+    m = _ISO_RE.match(lowered)
+    if m:
+        try:
+            return date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+        except ValueError:
+            return None
+    now = now or local_now()
+    return _parse_date(" " + lowered.replace(",", " , ") + " ", now.date())
+
+
+def normalize_booking_datetime(text: str, now: datetime | None = None) -> str | None:
+    """Canonical ISO string for a booking phrase, or None if it cannot be parsed."""
+    parsed = parse_booking_datetime(text, now)
+    return to_canonical(parsed) if parsed else None
@@ -0,0 +1,184 @@
+"""Per-outlet demand curves precomputed from reservation history.
+
+An offline job aggregates booked covers in `reservations.db` into a
+(outlet, weekday, hour) utilization table (average covers in that hour on
+that weekday / outlet capacity) and saves it as a small `.npz` file:
+
+    python demand_forecast.py            # rebuild demand_curves.npz
+    python demand_forecast.py --show GF-001
+
+The serving side loads the file once per process (`get_demand_table()`), so
+ranking by expected busyness is plain array indexing with no DB query.
+Without a table file, callers get None and rank as before. numpy is
+imported on first use, so importing this module (tools.py does) stays cheap.
+"""
+
+import argparse
+import os
+import threading
+from datetime import datetime
+from typing import List, Tuple
+
+import reservation_db
+from restaurant_data import RESTAURANTS
+
+DEMAND_TABLE_PATH = os.getenv(
+    "DEMAND_TABLE_PATH", os.path.join(os.path.dirname(__file__), "demand_curves.npz")
+)
+
+# Hours used for an outlet's overall busyness when no time is given.
+SERVICE_HOURS = slice(11, 24)
+
+
+def _booked_rows() -> List[Tuple[str, str, int]]:
+    reservation_db.init_db()
+    conn = reservation_db._get_conn()
+    try:
+        placeholders = ",".join("?" * len(reservation_db.BOOKED_STATUSES))
+        cur = conn.execute(
+            f"SELECT restaurant_id, datetime, party_size FROM reservations "
+            f"WHERE status IN ({placeholders})",
+            reservation_db.BOOKED_STATUSES,
+        )
+        return [tuple(r) for r in cur.fetchall()]
+    finally:
+        conn.close()
+
+
+def build_demand_table(rows: List[Tuple[str, str, int]] | None = None) -> dict:
+    """Aggregate (restaurant_id, datetime, party_size) rows into utilization curves."""
+    import numpy as np
+
+    if rows is None:
+        rows = _booked_rows()
+    outlet_ids = np.array([r["id"] for r in RESTAURANTS])
+    capacity = np.array([r["capacity"] for r in RESTAURANTS], dtype=np.float64)
+    index = {rid: i for i, rid in enumerate(outlet_ids)}
+
+    outlets, days, hours, covers = [], [], [], []
+    for restaurant_id, value, party_size in rows:
+        i = index.get(restaurant_id)
+        if i is None:
+            continue
+        if len(value) >= 13 and value[10] == "T":
+            day, hour = value[:10], int(value[11:13])  # canonical rows: no parsing
+        else:
+            when = reservation_db.parse_reservation_datetime(value)
+            if when is None:
+                continue
+            day, hour = when.strftime("%Y-%m-%d"), when.hour
+        outlets.append(i)
+        days.append(day)
+        hours.append(hour)
+        covers.append(party_size)
+
+    totals = np.zeros((len(outlet_ids), 7, 24), dtype=np.float64)
+    occurrences = np.zeros(7, dtype=np.float64)
+    if outlets:
+        day_numbers = np.array(days, dtype="datetime64[D]").astype(np.int64)
+        # 1970-01-01 was a Thursday; shift so Monday == 0 like datetime.weekday().
+        weekdays = (day_numbers + 3) % 7
+        np.add.at(totals, (np.array(outlets), weekdays, np.array(hours)), np.array(covers, dtype=np.float64))
+        # How many of each weekday the history spans, to turn totals into averages.
+        span = np.arange(day_numbers.min(), day_numbers.max() + 1)
+        occurrences = np.bincount((span + 3) % 7, minlength=7).astype(np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        average = np.where(occurrences[None, :, None] > 0, totals / occurrences[None, :, None], 0.0)
+    utilization = np.clip(average / capacity[:, None, None], 0.0, 1.0)
+    return {
+        "outlet_ids": outlet_ids,
+        "utilization": utilization.astype(np.float16),
+        "outlet_mean": utilization[:, :, SERVICE_HOURS].mean(axis=(1, 2)).astype(np.float16),
+        "rows": np.int64(len(outlets)),
+        "generated_at": np.array(datetime.utcnow().isoformat()),
+    }
+
+
+def save_demand_table(table: dict, path: str | None = None) -> None:
+    import numpy as np
+
+    path = path or DEMAND_TABLE_PATH
+    tmp = path + ".tmp.npz"
+    np.savez_compressed(tmp, **table)
+    os.replace(tmp, path)
+
+
+class DemandTable:
+    """Read-only view over a saved demand table."""
+
+    def __init__(self, data: dict):
+        import numpy as np
+
+        self.utilization = np.asarray(data["utilization"], dtype=np.float32)
+        self.outlet_mean = np.asarray(data["outlet_mean"], dtype=np.float32)
+        self.generated_at = str(data["generated_at"])
+        self._index = {str(rid): i for i, rid in enumerate(data["outlet_ids"])}
+
+    @classmethod
+    def load(cls, path: str | None = None) -> "DemandTable":
+        import numpy as np
+
+        with np.load(path or DEMAND_TABLE_PATH) as data:
+            return cls({k: data[k] for k in data.files})
+
+    def slot_utilization(self, restaurant_id: str, when: datetime) -> float | None:
+        """Expected share of capacity booked at this weekday/hour (0..1)."""
+        i = self._index.get(restaurant_id)
+        return None if i is None else float(self.utilization[i, when.weekday(), when.hour])
+
+    def outlet_utilization(self, restaurant_id: str) -> float | None:
+        """Average expected utilization over service hours, all weekdays."""
+        i = self._index.get(restaurant_id)
+        return None if i is None else float(self.outlet_mean[i])
+
+    def quieter_hours(self, restaurant_id: str, when: datetime, window: int = 2, margin: float = 0.15) -> List[int]:
+        """Nearby hours on the same weekday that are clearly less busy than `when`."""
+        i = self._index.get(restaurant_id)
+        if i is None:
+            return []
+        row = self.utilization[i, when.weekday()]
+        current = row[when.hour]
+        nearby = [
+            h for h in range(max(SERVICE_HOURS.start, when.hour - window), min(24, when.hour + window + 1))
+            if h != when.hour and row[h] <= current - margin
+        ]
+        return sorted(nearby, key=lambda h: (row[h], abs(h - when.hour)))[:2]
+
+
+_TABLE: DemandTable | None = None
+_TABLE_LOADED = False
+_TABLE_LOCK = threading.Lock()
+
+
+def get_demand_table() -> DemandTable | None:
+    """Process-wide demand table, loaded once; None if it has not been built."""
+    global _TABLE, _TABLE_LOADED
+    with _TABLE_LOCK:
+        if not _TABLE_LOADED:
+            _TABLE = DemandTable.load() if os.path.exists(DEMAND_TABLE_PATH) else None
+            _TABLE_LOADED = True
+        return _TABLE
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild per-outlet demand curves")
+    parser.add_argument("--out", default=DEMAND_TABLE_PATH)
+    parser.add_argument("--show", metavar="RESTAURANT_ID", help="print the saved weekday x hour curve")
+    args = parser.parse_args()
+    if args.show:
+        table = DemandTable.load(args.out)
+        i = table._index[args.show]
+        for weekday, name in enumerate(("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")):
+            print(name, " ".join(f"{v:.2f}" for v in table.utilization[i, weekday, SERVICE_HOURS]))
+        return
+    table = build_demand_table()
+    save_demand_table(table, args.out)
+    print(
+        f"wrote {args.out}: {int(table['rows'])} bookings, "
+        f"{table['utilization'].nbytes} bytes of curves"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""Geo lookup for GoodFoods outlets: a Bangalore gazetteer and a grid kNN index.
+
+- `GAZETTEER` maps localities and landmarks ("Domlur", "Manyata Tech Park",
+  "Silk Board") to coordinates; `resolve_place` turns free text such as
+  "near domlur" or "close to manyata" into one of them.
+- `GridIndex` buckets points into square cells sized to hold a couple of
+  points each on average. A k-nearest query walks rings
+  of cells outwards from the query cell and stops as soon as no unvisited
+  cell can hold anything closer, so it touches a handful of cells whatever
+  the catalog size.
+"""
+
+import math
+import re
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+from restaurant_data import RESTAURANTS
+
+EARTH_RADIUS_KM = 6371.0088
+
+# name -> (lat, lon, aliases). Outlet areas are included so every area name
+# resolves too.
+GAZETTEER: Dict[str, Tuple[float, float, Tuple[str, ...]]] = {
+    # Localities
+    "Indiranagar": (12.9719, 77.6412, ("indira nagar", "100 feet road")),
+    "Koramangala": (12.9352, 77.6245, ("kormangala", "forum mall")),
+    "Whitefield": (12.9698, 77.7500, ("white field",)),
+    "HSR Layout": (12.9121, 77.6446, ("hsr",)),
+    "MG Road": (12.9756, 77.6066, ("mahatma gandhi road", "m g road")),
+    "BTM Layout": (12.9166, 77.6101, ("btm",)),
+    "Hebbal": (13.0358, 77.5970, ("hebbal flyover",)),
+    "Yelahanka": (13.1005, 77.5963, ("yelahanka new town",)),
+    "Marathahalli": (12.9569, 77.7011, ("marathalli", "marathahalli bridge")),
+    "Vijayanagar": (12.9719, 77.5373, ("vijaynagar", "vijay nagar")),
+    "Airport Road": (12.9592, 77.6610, ("old airport road", "hal airport road")),
+    "Electronic City": (12.8452, 77.6602, ("e city", "ecity", "electronics city")),
+    "Malleshwaram": (13.0031, 77.5643, ("malleswaram",)),
+    "Richmond Town": (12.9634, 77.6009, ("richmond road",)),
+    "Ulsoor": (12.9817, 77.6200, ("halasuru", "ulsoor lake")),
+    "Domlur": (12.9610, 77.6387, ("domlur layout",)),
+    "Jayanagar": (12.9250, 77.5938, ("jaya nagar",)),
+    "JP Nagar": (12.9063, 77.5857, ("j p nagar", "jp nagar")),
+    "Banashankari": (12.9255, 77.5468, ("bsk",)),
+    "Basavanagudi": (12.9416, 77.5737, ("bull temple road",)),
+    "Rajajinagar": (12.9911, 77.5545, ("rajaji nagar",)),
+    "Yeshwanthpur": (13.0280, 77.5400, ("yeshwantpur", "yesvantpur")),
+    "Sadashivanagar": (13.0068, 77.5813, ("sadashiva nagar",)),
+    "Frazer Town": (12.9980, 77.6150, ("pulikeshi nagar",)),
+    "RT Nagar": (13.0210, 77.5950, ("r t nagar",)),
+    "Hennur": (13.0358, 77.6420, ("hennur road",)),
+    "Kalyan Nagar": (13.0280, 77.6400, ("kalyannagar",)),
+    "Banaswadi": (13.0140, 77.6510, ()),
+    "KR Puram": (13.0077, 77.6950, ("k r puram", "krishnarajapuram")),
+    "Mahadevapura": (12.9917, 77.7000, ()),
+    "Brookefield": (12.9650, 77.7180, ("brookfield",)),
+    "Bellandur": (12.9304, 77.6784, ()),
+    "Sarjapur Road": (12.9100, 77.6850, ("sarjapura road", "sarjapur")),
+    "Bannerghatta Road": (12.8890, 77.5970, ("bannerghatta", "bg road")),
+    "Jalahalli": (13.0450, 77.5480, ()),
+    # Landmarks
+    "Manyata Tech Park": (13.0475, 77.6210, ("manyata", "manyata embassy business park")),
+    "ITPL": (12.9866, 77.7370, ("itpb", "international tech park")),
+    "RMZ Ecospace": (12.9260, 77.6810, ("ecospace", "eco space")),
+    "Embassy Golf Links": (12.9545, 77.6450, ("egl", "golf links")),
+    "Bagmane Tech Park": (12.9807, 77.6637, ("bagmane",)),
+    "Infosys Electronic City": (12.8456, 77.6603, ("infosys",)),
+    "Silk Board": (12.9177, 77.6238, ("silk board junction",)),
+    "Cubbon Park": (12.9763, 77.5929, ()),
+    "Lalbagh": (12.9507, 77.5848, ("lal bagh", "lalbagh botanical garden")),
+    "UB City": (12.9716, 77.5960, ("vittal mallya road",)),
+    "Brigade Road": (12.9719, 77.6074, ()),
+    "Commercial Street": (12.9822, 77.6083, ()),
+    "Bangalore Palace": (12.9987, 77.5921, ("palace grounds",)),
+    "Majestic": (12.9767, 77.5713, ("kempegowda bus station", "city railway station", "ksr bengaluru")),
+    "Kempegowda International Airport": (13.1986, 77.7066, ("airport", "kia", "blr airport", "bangalore airport")),
+    "Chinnaswamy Stadium": (12.9788, 77.5996, ("chinnaswamy", "m chinnaswamy")),
+    "Phoenix Marketcity": (12.9975, 77.6960, ("phoenix mall",)),
+    "Orion Mall": (13.0110, 77.5550, ("brigade gateway",)),
+    "Mantri Square": (12.9916, 77.5707, ("mantri mall",)),
+}
+
+_FILLER_RE = re.compile(r"\b(near|nearby|close to|around|next to|by|in|at|the|area|side)\b")
+
+
+def _normalize(text: str) -> str:
+    text = re.sub(r"[^a-z0-9 ]", " ", text.lower())
+    return re.sub(r"\s+", " ", _FILLER_RE.sub(" ", text)).strip()
+
+
+def build_aliases() -> Dict[str, str]:
+    """Normalized alias -> gazetteer name."""
+    return {
+        _normalize(alias): name
+        for name, (_lat, _lon, aliases) in GAZETTEER.items()
+        for alias in (name, *aliases)
+    }
+
+
+def resolve_place(text: str) -> Dict[str, Any] | None:
+    """Match a locality/landmark phrase to the gazetteer: {"name", "lat", "lon"} or None."""
+    query = _normalize(text or "")
+    if not query:
+        return None
+    aliases = _catalog()["aliases"]
+    name = aliases.get(query)
+    if name is None:
+        # "manyata tech park office" / "ecity phase 1": longest alias contained in the query.
+        contained = [a for a in aliases if len(a) >= 3 and re.search(rf"\b{re.escape(a)}\b", query)]
+        if contained:
+            name = aliases[max(contained, key=len)]
+    if name is None:
+        import difflib
+
+        close = difflib.get_close_matches(query, list(aliases), n=1, cutoff=0.8)
+        if close:
+            name = aliases[close[0]]
+    if name is None:
+        return None
+    lat, lon, _ = GAZETTEER[name]
+    return {"name": name, "lat": lat, "lon": lon}
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+class GridIndex:
+    """Uniform lat/lon grid for k-nearest-neighbour queries over a city.
+
+    Cells are `cell_km` on a side at the reference latitude, which keeps a
+    ring's distance bound simple and tight enough for a city-sized area. By
+    default the cell size is chosen so an average cell holds
+    `points_per_cell` items.
+    """
+
+    def __init__(
+        self,
+        items: Sequence[Dict[str, Any]],
+        cell_km: float | None = None,
+        ref_lat: float = 12.97,
+        points_per_cell: float = 2.0,
+    ):
+        self.items = list(items)
+        if cell_km is None:
+            cell_km = self._auto_cell_km(ref_lat, points_per_cell)
+        self.cell_km = cell_km
+        self._dlat = cell_km / 111.32
+        self._dlon = cell_km / (111.32 * math.cos(math.radians(ref_lat)))
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        for i, item in enumerate(self.items):
+            self._cells.setdefault(self._cell(item["lat"], item["lon"]), []).append(i)
+        keys = list(self._cells) or [(0, 0)]
+        self._bbox = (
+            min(k[0] for k in keys), max(k[0] for k in keys),
+            min(k[1] for k in keys), max(k[1] for k in keys),
+        )
+
+    def _auto_cell_km(self, ref_lat: float, points_per_cell: float) -> float:
+        if len(self.items) < 2:
+            return 1.0
+        lats = [i["lat"] for i in self.items]
+        lons = [i["lon"] for i in self.items]
+        height = (max(lats) - min(lats)) * 111.32
+        width = (max(lons) - min(lons)) * 111.32 * math.cos(math.radians(ref_lat))
+        area = max(height, 0.1) * max(width, 0.1)
+        return max(0.1, math.sqrt(area * points_per_cell / len(self.items)))
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return int(math.floor(lat / self._dlat)), int(math.floor(lon / self._dlon))
+
+    def _ring(self, cx: int, cy: int, r: int) -> Iterable[Tuple[int, int]]:
+        if r == 0:
+            yield cx, cy
+            return
+        for dx in range(-r, r + 1):
+            yield cx + dx, cy - r
+            yield cx + dx, cy + r
+        for dy in range(-r + 1, r):
+            yield cx - r, cy + dy
+            yield cx + r, cy + dy
+
+    def nearest(
+        self,
+        lat: float,
+        lon: float,
+        k: int = 5,
+        predicate: Callable[[Dict[str, Any]], bool] | None = None,
+        max_km: float | None = None,
+    ) -> List[Tuple[float, Dict[str, Any]]]:
+        """Up to k (distance_km, item) pairs nearest to (lat, lon) that pass `predicate`."""
+        cx, cy = self._cell(lat, lon)
+        found: List[Tuple[float, int]] = []
+        # Offset of the query point inside its cell: distance bounds for ring r
+        # are measured from the point, not from the cell corner.
+        inner = min(
+            lat / self._dlat - cx, cx + 1 - lat / self._dlat,
+            lon / self._dlon - cy, cy + 1 - lon / self._dlon,
+        ) * self.cell_km
+        x0, x1, y0, y1 = self._bbox
+        last_ring = max(abs(cx - x0), abs(cx - x1), abs(cy - y0), abs(cy - y1))
+        for r in range(last_ring + 1):
+            # Anything in ring r or beyond is at least this far away.
+            bound = (r - 1) * self.cell_km + inner if r else 0.0
+            if len(found) >= k and found[k - 1][0] <= bound:
+                break
+            if max_km is not None and bound > max_km:
+                break
+            before = len(found)
+            for cell in self._ring(cx, cy, r):
+                for i in self._cells.get(cell, ()):
+                    item = self.items[i]
+                    if predicate is not None and not predicate(item):
+                        continue
+                    d = haversine_km(lat, lon, item["lat"], item["lon"])
+                    if max_km is None or d <= max_km:
+                        found.append((d, i))
+            if len(found) != before:
+                found.sort()
+        return [(round(d, 2), self.items[i]) for d, i in found[:k]]
+
+
+_CATALOG: Dict[str, Any] | None = None
+_CATALOG_LOCK = threading.Lock()
+
+
+def _catalog() -> Dict[str, Any]:
+    """Alias table and outlet grid: from the precompiled snapshot when it is
+    current (see catalog_snapshot.py), otherwise built once per process."""
+    global _CATALOG
+    with _CATALOG_LOCK:
+        if _CATALOG is None:
+            from catalog_snapshot import load_snapshot
+
+            snapshot = load_snapshot()
+            if snapshot is not None:
+                _CATALOG = {"aliases": snapshot["aliases"], "outlet_index": snapshot["outlet_index"]}
+            else:
+                _CATALOG = {
+                    "aliases": build_aliases(),
+                    "outlet_index": GridIndex([r for r in RESTAURANTS if "lat" in r]),
+                }
+        return _CATALOG
+
+
+def get_outlet_index() -> GridIndex:
+    """Grid index over every outlet with coordinates, built (or loaded) once per process."""
+    return _catalog()["outlet_index"]
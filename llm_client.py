@@ -1,12 +1,104 @@
 # llm_client.py
-from dotenv import load_dotenv
+import json
 import os
-import requests
+import threading
+import time
+from typing import TYPE_CHECKING
 
-load_dotenv()
+if TYPE_CHECKING:
+    import requests
+
+
+def _load_dotenv() -> None:
+    # Same lookup as dotenv.find_dotenv() (this file's directory, then its
+    # parents), but python-dotenv is only imported when there is a file to read.
+    folder = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        path = os.path.join(folder, ".env")
+        if os.path.isfile(path):
+            from dotenv import load_dotenv
+            load_dotenv(path)
+            return
+        parent = os.path.dirname(folder)
+        if parent == folder:
+            return
+        folder = parent
+
+
+_load_dotenv()
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 GROQ_MODEL = os.getenv("GROQ_MODEL", "llama-3.1-8b-instant")
+GROQ_LARGE_MODEL = os.getenv("GROQ_LARGE_MODEL", "llama-3.3-70b-versatile")
+
+# Optional local OpenAI-compatible server (e.g. llama.cpp `llama-server`),
+# used first for the cheap tool-selection step when configured.
+LOCAL_LLM_URL = os.getenv("LOCAL_LLM_URL")  # e.g. http://127.0.0.1:8080/v1
+LOCAL_LLM_MODEL = os.getenv("LOCAL_LLM_MODEL", "local")
+
+# How long a provider is skipped after a connection error / 5xx / 429.
+PROVIDER_COOLDOWN_SECONDS = float(os.getenv("LLM_PROVIDER_COOLDOWN_SECONDS", "30"))
+
+# name -> OpenAI-compatible endpoint config. Extra providers can be added with
+# LLM_PROVIDERS_JSON='{"name": {"base_url": ..., "model": ..., "api_key": ...}}'.
+PROVIDERS = {
+    "groq": {
+        "base_url": "https://api.groq.com/openai/v1",
+        "api_key": GROQ_API_KEY,
+        "model": GROQ_MODEL,
+        "timeout": 60,
+    },
+    "groq_large": {
+        "base_url": "https://api.groq.com/openai/v1",
+        "api_key": GROQ_API_KEY,
+        "model": GROQ_LARGE_MODEL,
+        "timeout": 60,
+    },
+}
+if LOCAL_LLM_URL:
+    PROVIDERS["local"] = {
+        "base_url": LOCAL_LLM_URL.rstrip("/"),
+        "api_key": os.getenv("LOCAL_LLM_API_KEY"),
+        "model": LOCAL_LLM_MODEL,
+        "timeout": 30,
+        "requires_key": False,
+    }
+PROVIDERS.update(json.loads(os.getenv("LLM_PROVIDERS_JSON") or "{}"))
+
+# task -> providers to try in order. Override with LLM_ROUTE_<TASK>="a,b".
+# - tool_call: first turn step that only has to emit tool-call JSON
+# - reply: follow-up that phrases a tool result for the user
+# - escalate: retry with a larger model when the small one got it wrong
+ROUTES = {
+    "tool_call": ["local", "groq"],
+    "reply": ["groq", "local"],
+    "escalate": ["groq_large", "groq"],
+}
+for _task in ROUTES:
+    _override = os.getenv(f"LLM_ROUTE_{_task.upper()}")
+    if _override:
+        ROUTES[_task] = [p.strip() for p in _override.split(",") if p.strip()]
+
+_SESSION: "requests.Session | None" = None
+
+_health_lock = threading.Lock()
+_unhealthy_until: dict[str, float] = {}
+_provider_stats: dict[str, dict] = {}
+
+
+def get_http_session() -> "requests.Session":
+    """Shared HTTP session so repeated LLM calls reuse the TLS connection.
+
+    `requests` (~60 ms with urllib3/certifi) is imported here, on first use,
+    rather than when the module is imported.
+    """
+    global _SESSION
+    if _SESSION is None:
+        import requests
+
+        _SESSION = requests.Session()
+    return _SESSION
+
 
 SYSTEM_PROMPT = """
 You are GoodFoods AI, a conversational assistant that helps users
@@ -58,6 +150,7 @@ When a user asks for help with going out / hanging out / dinner / lunch:
 
 2. Recommendation behavior:
    - Use tools to find suitable restaurants.
+   - If the user names a locality or landmark rather than an outlet area ("near Domlur", "close to Manyata Tech Park"), find the nearest outlets with space for their party (find_nearby) and mention the distance.
    - Present 2–5 options with:
      - name
      - area
@@ -84,6 +177,8 @@ When a user asks for help with going out / hanging out / dinner / lunch:
      - booking/reference ID (the reservation id returned by the tool)
      - any special notes
    - Ask if the user wants a reminder or needs to modify anything.
+   - If the outlet is fully booked for that time, offer another time or outlet, or to join the waitlist (join_waitlist). Waitlisted parties are booked automatically, and told, when a table frees up; they can leave with their waitlist id (leave_waitlist).
+   - For large groups or corporate bookings, plan the seating first (plan_group_booking). If the plan splits the party across outlets, tell the user how many guests go where, and on confirmation book each outlet for its share.
 
 4. Modification and cancellation:
    - If the user wants to change or cancel a reservation, ask for:
@@ -126,35 +221,112 @@ When you do NOT need a tool (e.g. greeting, high-level explanation), respond as:
 The JSON must be valid and contain no comments or extra text outside the JSON object.
 """
 
-def call_llm(messages):
-    if not GROQ_API_KEY:
-        raise RuntimeError("GROQ_API_KEY is not set in .env")
+class ProviderError(RuntimeError):
+    """A provider failed in a way that another provider might not (retryable)."""
 
-    url = "https://api.groq.com/openai/v1/chat/completions"
 
-    headers = {
-        "Authorization": f"Bearer {GROQ_API_KEY}",
-        "Content-Type": "application/json"
-    }
+def _provider_usable(name: str) -> bool:
+    cfg = PROVIDERS.get(name)
+    if not cfg:
+        return False
+    if cfg.get("requires_key", True) and not cfg.get("api_key"):
+        return False
+    with _health_lock:
+        return _unhealthy_until.get(name, 0.0) <= time.monotonic()
+
+
+def _mark_unhealthy(name: str, seconds: float) -> None:
+    with _health_lock:
+        _unhealthy_until[name] = time.monotonic() + seconds
+
+
+def _record(name: str, ok: bool, elapsed: float) -> None:
+    with _health_lock:
+        stats = _provider_stats.setdefault(name, {"calls": 0, "failures": 0, "total_ms": 0.0})
+        stats["calls"] += 1
+        stats["failures"] += 0 if ok else 1
+        stats["total_ms"] += elapsed * 1000
+
+
+def provider_stats() -> dict:
+    """Per-provider call counts, failures and average latency."""
+    with _health_lock:
+        return {
+            name: {
+                "calls": s["calls"],
+                "failures": s["failures"],
+                "avg_ms": round(s["total_ms"] / s["calls"], 1) if s["calls"] else 0.0,
+            }
+            for name, s in _provider_stats.items()
+        }
+
+
+def _call_provider(name: str, messages) -> str:
+    cfg = PROVIDERS[name]
+    url = f"{cfg['base_url']}/chat/completions"
+
+    headers = {"Content-Type": "application/json"}
+    if cfg.get("api_key"):
+        headers["Authorization"] = f"Bearer {cfg['api_key']}"
 
     payload = {
-        "model": GROQ_MODEL,
+        "model": cfg["model"],
         "messages": messages,
         "temperature": 0.3,
         "max_tokens": 700
     }
 
-    resp = requests.post(url, json=payload, headers=headers, timeout=60)
+    import requests
+
+    started = time.perf_counter()
     try:
-        resp.raise_for_status()
-    except requests.HTTPError as e:
-        # improved debugging info
-        raise RuntimeError(f"Groq request failed: {resp.status_code} → {resp.text}")
+        resp = get_http_session().post(url, json=payload, headers=headers, timeout=cfg.get("timeout", 60))
+    except requests.RequestException as e:
+        _record(name, False, time.perf_counter() - started)
+        _mark_unhealthy(name, PROVIDER_COOLDOWN_SECONDS)
+        raise ProviderError(f"{name} request failed: {e}")
+
+    ok = resp.status_code < 400
+    _record(name, ok, time.perf_counter() - started)
+    if resp.status_code == 429 or resp.status_code >= 500:
+        retry_after = resp.headers.get("Retry-After")
+        cooldown = float(retry_after) if retry_after and retry_after.isdigit() else PROVIDER_COOLDOWN_SECONDS
+        _mark_unhealthy(name, cooldown)
+        raise ProviderError(f"{name} request failed: {resp.status_code} → {resp.text}")
+    if not ok:
+        # improved debugging info; bad requests would fail on any provider
+        raise RuntimeError(f"{name} request failed: {resp.status_code} → {resp.text}")
 
     data = resp.json()
 
     # Standard OpenAI/Groq message format
     return data["choices"][0]["message"]["content"]
 
+def call_llm(messages, task: str = "reply"):
+    """Send a chat completion using the providers routed for `task`, with failover.
+
+    Providers in cooldown or without credentials are skipped; if every provider
+    fails, the last error is raised (429 text preserved for rate-limit handling).
+    """
+    route = ROUTES.get(task) or ROUTES["reply"]
+    candidates = [name for name in route if _provider_usable(name)]
+    if not candidates:
+        # Everything is cooling down: try the configured providers anyway
+        # rather than failing a booking outright.
+        candidates = [
+            name for name in route
+            if name in PROVIDERS and (PROVIDERS[name].get("api_key") or not PROVIDERS[name].get("requires_key", True))
+        ]
+    if not candidates:
+        raise RuntimeError("No LLM provider configured: GROQ_API_KEY is not set in .env")
+
+    last_error: Exception | None = None
+    for name in candidates:
+        try:
+            return _call_provider(name, messages)
+        except ProviderError as e:
+            last_error = e
+    raise last_error
+
 def call_llama(messages):
     return call_llm(messages)
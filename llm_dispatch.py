@@ -0,0 +1,218 @@
+"""Shared dispatch layer in front of the LLM provider.
+
+Every LLM request from the app and the API goes through one LLMDispatcher per
+process, which:
+
+- caps concurrent provider calls (adaptive: halves on a 429, creeps back up
+  on success, so we hover at the provider's limit instead of hammering it),
+- queues waiting callers fairly, round-robin across sessions, so one chatty
+  session cannot starve the others,
+- coalesces identical in-flight requests (single-flight), e.g. a user
+  double-submitting the same turn,
+- retries rate-limited calls with exponential backoff,
+- keeps queue-depth / wait-time metrics.
+"""
+
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List
+
+from llm_client import call_llm
+
+MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+BACKOFF_SECONDS = float(os.getenv("LLM_BACKOFF_SECONDS", "1.0"))
+
+
+def is_rate_limited(error: Exception) -> bool:
+    msg = str(error)
+    return "rate_limit_exceeded" in msg or "429" in msg
+
+
+def _request_key(messages: List[Dict[str, Any]], kwargs: Dict[str, Any]) -> str:
+    body = json.dumps([messages, kwargs], sort_keys=True)
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+class _Ticket:
+    __slots__ = ("granted", "enqueued_at")
+
+    def __init__(self):
+        self.granted = False
+        self.enqueued_at = time.monotonic()
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Exception | None = None
+
+
+class LLMDispatcher:
+    def __init__(
+        self,
+        call: Callable[..., str] = call_llm,
+        max_concurrency: int = MAX_CONCURRENCY,
+        max_retries: int = MAX_RETRIES,
+        backoff_seconds: float = BACKOFF_SECONDS,
+    ):
+        self._call = call
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+
+        self._cond = threading.Condition()
+        self._limit = float(max_concurrency)
+        self._active = 0
+        self._queues: Dict[str, Deque[_Ticket]] = {}
+        self._ring: Deque[str] = deque()  # sessions with waiting callers, in turn order
+        self._waiting = 0
+
+        self._flights: Dict[str, _Flight] = {}
+        self._flights_lock = threading.Lock()
+
+        self._stats = {
+            "calls": 0,
+            "coalesced": 0,
+            "rate_limited": 0,
+            "errors": 0,
+            "max_queue_depth": 0,
+        }
+        self._waits: Deque[float] = deque(maxlen=1000)
+
+    # -- fair admission -------------------------------------------------
+
+    def _acquire(self, session_id: str) -> None:
+        with self._cond:
+            if self._active < int(self._limit) and not self._waiting:
+                self._active += 1
+                self._waits.append(0.0)
+                return
+            ticket = _Ticket()
+            queue = self._queues.get(session_id)
+            if queue is None:
+                queue = self._queues[session_id] = deque()
+                self._ring.append(session_id)
+            queue.append(ticket)
+            self._waiting += 1
+            self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], self._waiting)
+            while not ticket.granted:
+                self._cond.wait()
+            self._waits.append(time.monotonic() - ticket.enqueued_at)
+
+    def _grant_waiting(self) -> None:
+        # Caller holds self._cond. Hand free slots out one session at a time.
+        granted = False
+        while self._ring and self._active < int(self._limit):
+            session_id = self._ring.popleft()
+            queue = self._queues[session_id]
+            queue.popleft().granted = True
+            self._waiting -= 1
+            self._active += 1
+            granted = True
+            if queue:
+                self._ring.append(session_id)
+            else:
+                del self._queues[session_id]
+        if granted:
+            self._cond.notify_all()
+
+    def _release(self, rate_limited: bool = False) -> None:
+        with self._cond:
+            self._active -= 1
+            if rate_limited:
+                self._limit = max(1.0, self._limit / 2)
+            else:
+                self._limit = min(float(self.max_concurrency), self._limit + 1.0 / self._limit)
+            self._grant_waiting()
+
+    def _count(self, name: str) -> None:
+        with self._cond:
+            self._stats[name] += 1
+
+    # -- calls ----------------------------------------------------------
+
+    def _call_with_limit(self, messages: List[Dict[str, Any]], session_id: str, **kwargs) -> str:
+        attempt = 0
+        while True:
+            self._acquire(session_id)
+            rate_limited = False
+            try:
+                self._count("calls")
+                return self._call(messages, **kwargs)
+            except RuntimeError as e:
+                if not is_rate_limited(e):
+                    self._count("errors")
+                    raise
+                rate_limited = True
+                self._count("rate_limited")
+                if attempt >= self.max_retries:
+                    raise
+            finally:
+                self._release(rate_limited)
+            delay = self.backoff_seconds * (2 ** attempt)
+            time.sleep(delay + random.uniform(0, delay / 2))
+            attempt += 1
+
+    def dispatch(self, messages: List[Dict[str, Any]], session_id: str | None = None, **kwargs) -> str:
+        """Send a chat completion through the shared queue and return its content."""
+        key = _request_key(messages, kwargs)
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            self._count("coalesced")
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = self._call_with_limit(messages, session_id or "anonymous", **kwargs)
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._flights_lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._cond:
+            waits = sorted(self._waits)
+            return {
+                **self._stats,
+                "in_flight": self._active,
+                "queue_depth": self._waiting,
+                "concurrency_limit": int(self._limit),
+                "avg_wait_ms": round(1000 * sum(waits) / len(waits), 1) if waits else 0.0,
+                "p95_wait_ms": round(1000 * waits[int(0.95 * (len(waits) - 1))], 1) if waits else 0.0,
+            }
+
+
+_DISPATCHER: LLMDispatcher | None = None
+_DISPATCHER_LOCK = threading.Lock()
+
+
+def get_dispatcher() -> LLMDispatcher:
+    """Process-wide dispatcher shared by every session."""
+    global _DISPATCHER
+    with _DISPATCHER_LOCK:
+        if _DISPATCHER is None:
+            _DISPATCHER = LLMDispatcher()
+        return _DISPATCHER
+
+
+def dispatch_llm(messages: List[Dict[str, Any]], session_id: str | None = None, **kwargs) -> str:
+    return get_dispatcher().dispatch(messages, session_id=session_id, **kwargs)
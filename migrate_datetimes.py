@@ -0,0 +1,63 @@
+"""One-off migration: rewrite stored reservation datetimes to canonical ISO form.
+
+Older rows hold whatever string the model produced ("2025-11-29 8:00PM",
+"tomorrow 8pm", ...). Relative phrases are resolved against the row's
+`created_at` (UTC, converted to Bangalore time), i.e. the moment the booking
+was made. Rows that still cannot be parsed are left untouched and reported.
+
+    python migrate_datetimes.py            # migrate reservations.db
+    python migrate_datetimes.py --dry-run  # only report what would change
+"""
+
+import argparse
+from datetime import datetime
+
+import reservation_db
+from datetime_parser import local_from_utc, normalize_booking_datetime
+
+
+def migrate(dry_run: bool = False) -> dict:
+    """Normalize every reservation's datetime. Returns counts and unparsed ids."""
+    reservation_db.init_db()
+    conn = reservation_db._get_conn()
+    updated, unchanged, failed = 0, 0, []
+    try:
+        rows = conn.execute("SELECT * FROM reservations").fetchall()
+        migrated_at = datetime.utcnow().isoformat()
+        for row in rows:
+            canonical = normalize_booking_datetime(row["datetime"], now=local_from_utc(row["created_at"]))
+            if canonical is None:
+                failed.append(row["id"])
+            elif canonical == row["datetime"]:
+                unchanged += 1
+            else:
+                updated += 1
+                if not dry_run:
+                    conn.execute(
+                        "UPDATE reservations SET datetime = ? WHERE id = ?", (canonical, row["id"])
+                    )
+                    reservation_db._append_change_event(
+                        conn, dict(row), {**dict(row), "datetime": canonical}, migrated_at
+                    )
+        if not dry_run:
+            # Slot aggregates are keyed on the parsed time; rebuild them once.
+            reservation_db._rebuild_slot_covers(conn)
+            conn.commit()
+    finally:
+        conn.close()
+    return {"updated": updated, "unchanged": unchanged, "failed": failed}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    report = migrate(dry_run=args.dry_run)
+    print(
+        f"updated={report['updated']} unchanged={report['unchanged']} "
+        f"unparsed={len(report['failed'])} {report['failed'] or ''}".rstrip()
+    )
+
+
+if __name__ == "__main__":
+    main()
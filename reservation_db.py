@@ -3,12 +3,59 @@
 This module is intentionally small and framework-free.
 """
 
+import hashlib
+import heapq
+import json
 import os
+import re
 import sqlite3
-from typing import Dict, Any
+import time
+from datetime import datetime
+from typing import Dict, Any, Iterator, Tuple
+
+from datetime_parser import parse_booking_datetime
+from restaurant_data import RESTAURANTS_BY_ID
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "reservations.db")
 
+# DB files already initialised by this process; init_db() is a no-op after the
+# first call so hot paths don't re-run DDL on every query.
+_INITIALIZED_PATHS: set[str] = set()
+
+# Statuses that count as a booking in demand history.
+BOOKED_STATUSES = ("active", "seated", "no_show")
+# Statuses whose covers hold seats in an outlet's slot; a no-show's table is released.
+HOLDING_STATUSES = ("active", "seated")
+
+
+class SlotFullError(Exception):
+    """The outlet has no room left for this party in the requested hourly slot."""
+
+    def __init__(self, restaurant_id: str, slot: str, free_covers: int):
+        super().__init__(f"{restaurant_id} has {free_covers} covers left at {slot}")
+        self.restaurant_id = restaurant_id
+        self.slot = slot
+        self.free_covers = free_covers
+
+
+def parse_reservation_datetime(value: str) -> datetime | None:
+    """Parse a stored reservation datetime into a naive Bangalore-local datetime."""
+    parsed = parse_booking_datetime(value)
+    return parsed.replace(tzinfo=None) if parsed else None
+
+
+def slot_key(value: str) -> str | None:
+    """Hourly slot ("YYYY-MM-DD HH:00") a reservation datetime falls into."""
+    when = parse_reservation_datetime(value)
+    return when.strftime("%Y-%m-%d %H:00") if when else None
+
+
+def booking_key(phone: str, restaurant_id: str, when: str) -> str:
+    """Idempotency key for "this phone, this outlet, this time" (canonical datetime)."""
+    digits = re.sub(r"\D", "", str(phone))[-10:]
+    raw = f"{digits}|{str(restaurant_id).strip().upper()}|{when}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
 
 def _get_conn() -> sqlite3.Connection:
     conn = sqlite3.connect(DB_PATH)
@@ -17,7 +64,9 @@ def _get_conn() -> sqlite3.Connection:
 
 
 def init_db() -> None:
-    """Create the reservations table if it does not exist."""
+    """Create the reservations tables and indexes if they do not exist."""
+    if DB_PATH in _INITIALIZED_PATHS:
+        return
     conn = _get_conn()
     try:
         conn.execute(
@@ -32,55 +81,444 @@ def init_db() -> None:
                 special_requests TEXT,
                 status TEXT NOT NULL,
                 created_at TEXT NOT NULL,
-                cancelled_at TEXT
+                cancelled_at TEXT,
+                idempotency_key TEXT
+            )
+            """
+        )
+        columns = {r["name"] for r in conn.execute("PRAGMA table_info(reservations)")}
+        if "idempotency_key" not in columns:
+            conn.execute("ALTER TABLE reservations ADD COLUMN idempotency_key TEXT")
+        # At most one *active* booking per key: a retried "book it" finds the
+        # existing row instead of inserting a second one, while a cancelled
+        # booking does not block booking the same slot again.
+        conn.execute(
+            """
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_reservations_idempotency_key
+            ON reservations (idempotency_key)
+            WHERE idempotency_key IS NOT NULL AND status = 'active'
+            """
+        )
+        # Time-ordered index so schedulers can read an upcoming window of
+        # active bookings without scanning the whole table.
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_reservations_status_datetime
+            ON reservations (status, datetime)
+            """
+        )
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_reservations_phone_datetime
+            ON reservations (phone, datetime, id)
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS reservation_notifications (
+                reservation_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                sent_at TEXT NOT NULL,
+                PRIMARY KEY (reservation_id, kind)
             )
             """
         )
+        # Covers per outlet per hourly slot, maintained incrementally on every
+        # write so dashboards never re-scan the reservations table.
+        has_covers = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'outlet_slot_covers'"
+        ).fetchone()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS outlet_slot_covers (
+                restaurant_id TEXT NOT NULL,
+                slot TEXT NOT NULL,
+                covers INTEGER NOT NULL DEFAULT 0,
+                bookings INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (slot, restaurant_id)
+            )
+            """
+        )
+        if not has_covers:
+            _rebuild_slot_covers(conn)
+        # Parties waiting for a full outlet/slot. Promotion reads only the
+        # waiting rows of one slot, via idx_waitlist_slot.
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS waitlist (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                restaurant_id TEXT NOT NULL,
+                slot TEXT NOT NULL,
+                datetime TEXT NOT NULL,
+                name TEXT NOT NULL,
+                phone TEXT NOT NULL,
+                party_size INTEGER NOT NULL,
+                special_requests TEXT,
+                status TEXT NOT NULL,
+                joined_at TEXT NOT NULL,
+                reservation_id TEXT,
+                notified_at TEXT
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_waitlist_slot
+            ON waitlist (restaurant_id, slot, status)
+            """
+        )
+        # One waiting entry per phone per outlet/slot, so re-joining is a no-op.
+        conn.execute(
+            """
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_waitlist_waiting_phone
+            ON waitlist (restaurant_id, slot, phone) WHERE status = 'waiting'
+            """
+        )
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_waitlist_unnotified
+            ON waitlist (id) WHERE status = 'promoted' AND notified_at IS NULL
+            """
+        )
+        # Append-only change log. `seq` only ever grows and, since SQLite has a
+        # single writer, commits in seq order, so "everything after N" is a
+        # complete, gap-free cursor for consumers.
+        has_events = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'reservation_events'"
+        ).fetchone()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS reservation_events (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                reservation_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                at TEXT NOT NULL,
+                data TEXT NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_reservation_events_reservation
+            ON reservation_events (reservation_id, seq)
+            """
+        )
+        for action in ("UPDATE", "DELETE"):
+            conn.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS reservation_events_no_{action.lower()}
+                BEFORE {action} ON reservation_events
+                BEGIN SELECT RAISE(ABORT, 'reservation_events is append-only'); END
+                """
+            )
+        if not has_events:
+            # Seed the log with the current rows so a consumer starting at 0
+            # sees every reservation.
+            now = datetime.utcnow().isoformat()
+            for row in conn.execute("SELECT * FROM reservations ORDER BY created_at, id").fetchall():
+                _append_event(conn, row["id"], "created", now, {"reservation": dict(row), "backfill": True})
         conn.commit()
     finally:
         conn.close()
+    _INITIALIZED_PATHS.add(DB_PATH)
 
 
-def list_reservations_by_phone(phone: str) -> list[dict]:
-    """Return all reservations (active or cancelled) for a given phone number."""
+def list_reservations_by_phone(
+    phone: str,
+    status: str | None = None,
+    date_from: str | None = None,
+    date_to: str | None = None,
+    after: Tuple[str, str] | None = None,
+    limit: int | None = None,
+) -> list[dict]:
+    """Return reservations for a phone number ordered by (datetime, id).
+
+    - status: only rows with this status (default: any).
+    - date_from / date_to: inclusive "YYYY-MM-DD" bounds on the reservation date.
+    - after: keyset cursor, the (datetime, id) of the last row already seen.
+    - limit: page size (default: no limit).
+    """
     init_db()
+    sql = "SELECT * FROM reservations WHERE phone = ?"
+    params: list = [phone]
+    if status:
+        sql += " AND status = ?"
+        params.append(status)
+    if date_from:
+        sql += " AND datetime >= ?"
+        params.append(date_from)
+    if date_to:
+        sql += " AND datetime < ?"
+        params.append(date_to + "~")
+    if after:
+        sql += " AND (datetime, id) > (?, ?)"
+        params.extend(after)
+    sql += " ORDER BY datetime, id"
+    if limit:
+        sql += " LIMIT ?"
+        params.append(limit)
     conn = _get_conn()
     try:
-        cur = conn.execute(
-            "SELECT * FROM reservations WHERE phone = ? ORDER BY datetime",
-            (phone,),
-        )
-        rows = cur.fetchall()
+        rows = conn.execute(sql, params).fetchall()
         return [dict(r) for r in rows]
     finally:
         conn.close()
 
 
-def save_reservation(rec: Dict[str, Any]) -> None:
-    """Insert or replace a reservation row based on its id."""
+def _apply_covers(conn: sqlite3.Connection, row: Dict[str, Any], sign: int) -> None:
+    """Add (sign=1) or remove (sign=-1) a reservation's covers from the aggregates."""
+    if row["status"] not in HOLDING_STATUSES:
+        return
+    slot = slot_key(row["datetime"])
+    if slot is None:
+        return
+    conn.execute(
+        """
+        INSERT INTO outlet_slot_covers (restaurant_id, slot, covers, bookings)
+        VALUES (:restaurant_id, :slot, :covers, :bookings)
+        ON CONFLICT (slot, restaurant_id) DO UPDATE SET
+            covers = covers + excluded.covers,
+            bookings = bookings + excluded.bookings
+        """,
+        {
+            "restaurant_id": row["restaurant_id"],
+            "slot": slot,
+            "covers": sign * int(row["party_size"]),
+            "bookings": sign,
+        },
+    )
+
+
+def _rebuild_slot_covers(conn: sqlite3.Connection) -> None:
+    conn.execute("DELETE FROM outlet_slot_covers")
+    for row in conn.execute("SELECT * FROM reservations").fetchall():
+        _apply_covers(conn, dict(row), 1)
+
+
+def rebuild_slot_covers() -> None:
+    """Recompute the per-slot aggregates from scratch (backfill / repair)."""
     init_db()
     conn = _get_conn()
     try:
-        conn.execute(
+        _rebuild_slot_covers(conn)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def get_slot_covers(date: str) -> list[dict]:
+    """Return booked covers per outlet per hourly slot for a "YYYY-MM-DD" date."""
+    init_db()
+    conn = _get_conn()
+    try:
+        cur = conn.execute(
             """
-            INSERT OR REPLACE INTO reservations (
-                id, restaurant_id, name, phone, party_size, datetime,
-                special_requests, status, created_at, cancelled_at
-            ) VALUES (:id, :restaurant_id, :name, :phone, :party_size, :datetime,
-                     :special_requests, :status, :created_at, :cancelled_at)
+            SELECT restaurant_id, slot, covers, bookings
+            FROM outlet_slot_covers
+            WHERE slot >= ? AND slot < ? AND bookings > 0
+            ORDER BY slot, restaurant_id
             """,
-            rec,
+            (date, date + "~"),
         )
+        return [dict(r) for r in cur.fetchall()]
+    finally:
+        conn.close()
+
+
+# -- event log ----------------------------------------------------------------
+
+# Status changes that get their own event kind; any other change is "modified".
+_STATUS_EVENTS = {"cancelled": "cancelled", "seated": "seated", "no_show": "no_show"}
+
+
+def _append_event(
+    conn: sqlite3.Connection, reservation_id: str, kind: str, at: str, data: Dict[str, Any]
+) -> int:
+    """Append one event (caller commits, so it lands with the change it describes)."""
+    cur = conn.execute(
+        "INSERT INTO reservation_events (reservation_id, kind, at, data) VALUES (?, ?, ?, ?)",
+        (reservation_id, kind, at, json.dumps(data, separators=(",", ":"), default=str)),
+    )
+    return cur.lastrowid
+
+
+def _append_change_event(
+    conn: sqlite3.Connection, old: Dict[str, Any] | None, new: Dict[str, Any], at: str
+) -> int | None:
+    """Log the difference between two versions of a row; None if nothing changed."""
+    if old is None:
+        return _append_event(conn, new["id"], "created", at, {"reservation": new})
+    changes = {k: [old[k], new[k]] for k in new if k in old and old[k] != new[k]}
+    if not changes:
+        return None
+    kind = "modified"
+    if "status" in changes:
+        kind = _STATUS_EVENTS.get(new["status"], kind)
+    return _append_event(conn, new["id"], kind, at, {"reservation": new, "changes": changes})
+
+
+def _decode_event(row: sqlite3.Row) -> Dict[str, Any]:
+    return {
+        "seq": row["seq"],
+        "reservation_id": row["reservation_id"],
+        "kind": row["kind"],
+        "at": row["at"],
+        **json.loads(row["data"]),
+    }
+
+
+def read_events(since: int = 0, limit: int = 100, reservation_id: str | None = None) -> list[dict]:
+    """Events with seq > since, oldest first.
+
+    Consumers keep the last seq they processed and pass it back as `since`;
+    an empty list means they are caught up. Each event carries the full
+    reservation row after the change and, for updates, a `changes` map of
+    field -> [old, new].
+    """
+    init_db()
+    conn = _get_conn()
+    try:
+        if reservation_id is None:
+            cur = conn.execute(
+                "SELECT * FROM reservation_events WHERE seq > ? ORDER BY seq LIMIT ?",
+                (since, limit),
+            )
+        else:
+            cur = conn.execute(
+                """
+                SELECT * FROM reservation_events
+                WHERE reservation_id = ? AND seq > ? ORDER BY seq LIMIT ?
+                """,
+                (reservation_id, since, limit),
+            )
+        return [_decode_event(r) for r in cur.fetchall()]
+    finally:
+        conn.close()
+
+
+def latest_event_seq() -> int:
+    """Seq of the newest event (0 if none): where a consumer that only wants new events starts."""
+    init_db()
+    conn = _get_conn()
+    try:
+        return conn.execute("SELECT COALESCE(MAX(seq), 0) FROM reservation_events").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def tail_events(
+    since: int = 0, poll_interval: float = 1.0, batch_size: int = 100
+) -> Iterator[Dict[str, Any]]:
+    """Yield events after `since` forever, polling when caught up (like `tail -f`)."""
+    while True:
+        batch = read_events(since, batch_size)
+        for event in batch:
+            since = event["seq"]
+            yield event
+        if len(batch) < batch_size:
+            time.sleep(poll_interval)
+
+
+_INSERT_COLUMNS = (
+    "id, restaurant_id, name, phone, party_size, datetime,"
+    " special_requests, status, created_at, cancelled_at, idempotency_key"
+)
+_INSERT_VALUES = (
+    ":id, :restaurant_id, :name, :phone, :party_size, :datetime,"
+    " :special_requests, :status, :created_at, :cancelled_at, :idempotency_key"
+)
+
+
+def _next_reservation_id(conn: sqlite3.Connection) -> str:
+    # IDs are zero-padded, so the lexicographically largest is the latest.
+    row = conn.execute(
+        "SELECT id FROM reservations WHERE id LIKE 'RES-%' ORDER BY id DESC LIMIT 1"
+    ).fetchone()
+    last = int(row["id"][4:]) if row and row["id"][4:].isdigit() else 0
+    return f"RES-{last + 1:06d}"
+
+
+def _free_covers(conn: sqlite3.Connection, restaurant_id: str, slot: str) -> int:
+    restaurant = RESTAURANTS_BY_ID.get(restaurant_id)
+    if restaurant is None:
+        return 0
+    row = conn.execute(
+        "SELECT covers FROM outlet_slot_covers WHERE slot = ? AND restaurant_id = ?",
+        (slot, restaurant_id),
+    ).fetchone()
+    return restaurant["capacity"] - (row["covers"] if row else 0)
+
+
+def _insert_reservation(
+    conn: sqlite3.Connection, rec: Dict[str, Any], event: Dict[str, Any] | None = None
+) -> Dict[str, Any]:
+    """Allocate an id if needed, insert the row, add its covers and log a
+    "created" event with any extra `event` data (caller commits)."""
+    if not rec.get("id"):
+        rec["id"] = _next_reservation_id(conn)
+    conn.execute(
+        f"INSERT INTO reservations ({_INSERT_COLUMNS}) VALUES ({_INSERT_VALUES})", rec
+    )
+    _apply_covers(conn, rec, 1)
+    _append_event(conn, rec["id"], "created", rec["created_at"], {"reservation": rec, **(event or {})})
+    return rec
+
+
+def create_reservation(rec: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+    """Insert a new booking unless an active one with the same idempotency key exists.
+
+    Returns (row, created). When `rec` has no "id", the next RES-NNNNNN id is
+    allocated inside the same write transaction. A replayed request returns
+    the existing row with created=False and does not touch the slot covers.
+    Raises SlotFullError if a known outlet has no room for the party in that
+    hourly slot, and ValueError for a party size below 1.
+    """
+    init_db()
+    rec = {"status": "active", "cancelled_at": None, "idempotency_key": None, **rec}
+    # Covers are summed per slot; a non-positive party would free capacity.
+    if int(rec["party_size"]) < 1:
+        raise ValueError(f"party_size must be at least 1, got {rec['party_size']!r}")
+    conn = _get_conn()
+    try:
+        # Take the write lock up front so the duplicate check, capacity check,
+        # id allocation and insert are atomic across processes.
+        conn.execute("BEGIN IMMEDIATE")
+        if rec["idempotency_key"]:
+            existing = conn.execute(
+                "SELECT * FROM reservations WHERE idempotency_key = ? AND status = 'active'",
+                (rec["idempotency_key"],),
+            ).fetchone()
+            if existing:
+                conn.rollback()
+                return dict(existing), False
+        slot = slot_key(rec["datetime"])
+        if slot and rec["restaurant_id"] in RESTAURANTS_BY_ID:
+            free = _free_covers(conn, rec["restaurant_id"], slot)
+            if int(rec["party_size"]) > free:
+                conn.rollback()
+                raise SlotFullError(rec["restaurant_id"], slot, max(free, 0))
+        _insert_reservation(conn, rec)
         conn.commit()
+        return rec, True
     finally:
         conn.close()
 
 
-def mark_cancelled(res_id: str, cancelled_at: str) -> None:
-    """Mark an existing reservation as cancelled in the database."""
+def mark_cancelled(res_id: str, cancelled_at: str) -> list[dict]:
+    """Mark an existing reservation as cancelled in the database.
+
+    The freed covers are offered to the outlet/slot waitlist in the same
+    transaction; returns the waitlist entries that were promoted to bookings.
+    """
     init_db()
     conn = _get_conn()
     try:
+        conn.execute("BEGIN IMMEDIATE")
+        old = conn.execute("SELECT * FROM reservations WHERE id = ?", (res_id,)).fetchone()
+        if old is None or old["status"] == "cancelled":
+            # A concurrent cancel won; freeing the covers twice would overbook.
+            conn.rollback()
+            return []
         conn.execute(
             """
             UPDATE reservations
@@ -89,6 +527,284 @@ def mark_cancelled(res_id: str, cancelled_at: str) -> None:
             """,
             {"id": res_id, "cancelled_at": cancelled_at},
         )
+        _apply_covers(conn, dict(old), -1)
+        _append_change_event(
+            conn, dict(old), {**dict(old), "status": "cancelled", "cancelled_at": cancelled_at}, cancelled_at
+        )
+        promoted = []
+        slot = slot_key(old["datetime"])
+        if old["status"] in HOLDING_STATUSES and slot:
+            promoted = _promote_waitlist(conn, old["restaurant_id"], slot, cancelled_at)
+        conn.commit()
+        return promoted
+    finally:
+        conn.close()
+
+
+# -- waitlist ----------------------------------------------------------------
+
+def _promote_waitlist(
+    conn: sqlite3.Connection, restaurant_id: str, slot: str, now: str
+) -> list[dict]:
+    """Turn waiting parties into bookings while the slot has room (caller commits).
+
+    Best fit first: the largest party that still fits, earliest join time
+    breaking ties, so freed covers go to as many diners as possible without
+    letting later arrivals overtake equal-sized parties.
+    """
+    free = _free_covers(conn, restaurant_id, slot)
+    if free <= 0:
+        return []
+    rows = conn.execute(
+        """
+        SELECT * FROM waitlist
+        WHERE restaurant_id = ? AND slot = ? AND status = 'waiting' AND party_size <= ?
+        """,
+        (restaurant_id, slot, free),
+    ).fetchall()
+    heap = [(-r["party_size"], r["joined_at"], r["id"], dict(r)) for r in rows]
+    heapq.heapify(heap)
+    promoted = []
+    while heap and free > 0:
+        entry = heapq.heappop(heap)[3]
+        if entry["party_size"] > free:
+            continue
+        key = booking_key(entry["phone"], restaurant_id, entry["datetime"])
+        existing = conn.execute(
+            "SELECT * FROM reservations WHERE idempotency_key = ? AND status = 'active'", (key,)
+        ).fetchone()
+        if existing:
+            # Already booked this slot some other way; just close the entry.
+            reservation = dict(existing)
+        else:
+            reservation = _insert_reservation(conn, {
+                "restaurant_id": restaurant_id,
+                "name": entry["name"],
+                "phone": entry["phone"],
+                "party_size": entry["party_size"],
+                "datetime": entry["datetime"],
+                "special_requests": entry["special_requests"],
+                "status": "active",
+                "created_at": now,
+                "cancelled_at": None,
+                "idempotency_key": key,
+            }, event={"waitlist_id": entry["id"]})
+            free -= entry["party_size"]
+        conn.execute(
+            "UPDATE waitlist SET status = 'promoted', reservation_id = ? WHERE id = ?",
+            (reservation["id"], entry["id"]),
+        )
+        promoted.append({**entry, "status": "promoted", "reservation_id": reservation["id"]})
+    return promoted
+
+
+def _waitlist_position(conn: sqlite3.Connection, entry: sqlite3.Row) -> int:
+    return conn.execute(
+        """
+        SELECT COUNT(*) FROM waitlist
+        WHERE restaurant_id = ? AND slot = ? AND status = 'waiting' AND id <= ?
+        """,
+        (entry["restaurant_id"], entry["slot"], entry["id"]),
+    ).fetchone()[0]
+
+
+def join_waitlist(entry: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+    """Add a party to the waitlist of an outlet/slot.
+
+    `entry` needs restaurant_id, name, phone, party_size, datetime (canonical)
+    and joined_at. Returns (row, created); the row carries its 1-based
+    "position" among waiting entries. Joining twice returns the existing entry.
+    """
+    init_db()
+    slot = slot_key(entry["datetime"])
+    if slot is None:
+        raise ValueError(f"Unparseable reservation datetime: {entry['datetime']!r}")
+    conn = _get_conn()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        existing = conn.execute(
+            """
+            SELECT * FROM waitlist
+            WHERE restaurant_id = ? AND slot = ? AND phone = ? AND status = 'waiting'
+            """,
+            (entry["restaurant_id"], slot, entry["phone"]),
+        ).fetchone()
+        created = existing is None
+        if created:
+            cur = conn.execute(
+                """
+                INSERT INTO waitlist (
+                    restaurant_id, slot, datetime, name, phone, party_size,
+                    special_requests, status, joined_at
+                ) VALUES (:restaurant_id, :slot, :datetime, :name, :phone, :party_size,
+                         :special_requests, 'waiting', :joined_at)
+                """,
+                {"special_requests": "", **entry, "slot": slot},
+            )
+            existing = conn.execute("SELECT * FROM waitlist WHERE id = ?", (cur.lastrowid,)).fetchone()
+        row = {**dict(existing), "position": _waitlist_position(conn, existing)}
+        conn.commit()
+        return row, created
+    finally:
+        conn.close()
+
+
+def leave_waitlist(waitlist_id: int, phone: str) -> bool:
+    """Withdraw a waiting entry. Returns False if there was no such waiting entry."""
+    init_db()
+    conn = _get_conn()
+    try:
+        cur = conn.execute(
+            "UPDATE waitlist SET status = 'left' WHERE id = ? AND phone = ? AND status = 'waiting'",
+            (waitlist_id, phone),
+        )
+        conn.commit()
+        return cur.rowcount > 0
+    finally:
+        conn.close()
+
+
+def slot_free_covers(restaurant_id: str, when: str) -> int | None:
+    """Covers still free at an outlet in the hourly slot of `when` (None if unknown)."""
+    init_db()
+    slot = slot_key(when)
+    if slot is None or restaurant_id not in RESTAURANTS_BY_ID:
+        return None
+    conn = _get_conn()
+    try:
+        return _free_covers(conn, restaurant_id, slot)
+    finally:
+        conn.close()
+
+
+def list_unnotified_promotions() -> list[dict]:
+    """Promoted waitlist entries whose guests have not been told yet."""
+    init_db()
+    conn = _get_conn()
+    try:
+        cur = conn.execute(
+            "SELECT * FROM waitlist WHERE status = 'promoted' AND notified_at IS NULL ORDER BY id"
+        )
+        return [dict(r) for r in cur.fetchall()]
+    finally:
+        conn.close()
+
+
+def mark_promotion_notified(waitlist_id: int, notified_at: str) -> None:
+    init_db()
+    conn = _get_conn()
+    try:
+        conn.execute(
+            "UPDATE waitlist SET notified_at = ? WHERE id = ? AND notified_at IS NULL",
+            (notified_at, waitlist_id),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def get_reservation(res_id: str) -> dict | None:
+    """Return a single reservation row by id, or None if it does not exist."""
+    init_db()
+    conn = _get_conn()
+    try:
+        row = conn.execute(
+            "SELECT * FROM reservations WHERE id = ?", (res_id,)
+        ).fetchone()
+        return dict(row) if row else None
+    finally:
+        conn.close()
+
+
+def list_active_between(start: str, end: str) -> list[dict]:
+    """Return active reservations with start <= datetime < end, oldest first.
+
+    Bounds are compared as strings, so callers should pass date-prefixed
+    values (e.g. "2025-11-29"). Each row carries a "notified" list with the
+    notification kinds already recorded for it.
+    """
+    init_db()
+    conn = _get_conn()
+    try:
+        cur = conn.execute(
+            """
+            SELECT r.*, GROUP_CONCAT(n.kind) AS notified
+            FROM reservations AS r
+            LEFT JOIN reservation_notifications AS n ON n.reservation_id = r.id
+            WHERE r.status = 'active' AND r.datetime >= ? AND r.datetime < ?
+            GROUP BY r.id
+            ORDER BY r.datetime
+            """,
+            (start, end),
+        )
+        rows = []
+        for r in cur.fetchall():
+            row = dict(r)
+            row["notified"] = row["notified"].split(",") if row["notified"] else []
+            rows.append(row)
+        return rows
+    finally:
+        conn.close()
+
+
+def record_notification(res_id: str, kind: str, sent_at: str) -> None:
+    """Remember that a notification of the given kind went out for a reservation."""
+    init_db()
+    conn = _get_conn()
+    try:
+        conn.execute(
+            """
+            INSERT OR IGNORE INTO reservation_notifications (reservation_id, kind, sent_at)
+            VALUES (?, ?, ?)
+            """,
+            (res_id, kind, sent_at),
+        )
         conn.commit()
     finally:
         conn.close()
+
+
+def _set_status_from_active(res_id: str, status: str) -> list[dict] | None:
+    """Move an active reservation to `status`; None if it was not active.
+
+    Statuses that stop holding seats (no_show) free the covers and offer them
+    to the slot's waitlist, as a cancellation does; returns the promotions.
+    """
+    init_db()
+    conn = _get_conn()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        old = conn.execute(
+            "SELECT * FROM reservations WHERE id = ? AND status = 'active'", (res_id,)
+        ).fetchone()
+        if old is None:
+            conn.rollback()
+            return None
+        conn.execute("UPDATE reservations SET status = ? WHERE id = ?", (status, res_id))
+        old = dict(old)
+        now = datetime.utcnow().isoformat()
+        _append_change_event(conn, old, {**old, "status": status}, now)
+        promoted = []
+        if status not in HOLDING_STATUSES:
+            _apply_covers(conn, old, -1)
+            slot = slot_key(old["datetime"])
+            if slot:
+                promoted = _promote_waitlist(conn, old["restaurant_id"], slot, now)
+        conn.commit()
+        return promoted
+    finally:
+        conn.close()
+
+
+def mark_seated(res_id: str) -> bool:
+    """Check a guest in. Returns False if the reservation was not active."""
+    return _set_status_from_active(res_id, "seated") is not None
+
+
+def mark_no_show(res_id: str) -> list[dict] | None:
+    """Flag an active reservation as a no-show and release its covers.
+
+    Returns the waitlist entries promoted into the freed seats, or None if
+    the reservation was not active.
+    """
+    return _set_status_from_active(res_id, "no_show")
@@ -28,6 +28,8 @@ RESTAURANTS: List[Dict] = [
         "name": "GoodFoods Indiranagar #1",
         "area": "Indiranagar",
         "city": "Bangalore",
+        "lat": 12.9719,
+        "lon": 77.6412,
         "capacity": 120,
         "cuisine": ["Italian"],
         "avg_cost_per_person": 850,
@@ -40,6 +42,8 @@ RESTAURANTS: List[Dict] = [
         "name": "GoodFoods Koramangala #1",
         "area": "Koramangala",
         "city": "Bangalore",
+        "lat": 12.9352,
+        "lon": 77.6245,
         "capacity": 80,
         "cuisine": ["Italian", "Continental"],
         "avg_cost_per_person": 700,
@@ -52,6 +56,8 @@ RESTAURANTS: List[Dict] = [
         "name": "GoodFoods Whitefield #2",
         "area": "Whitefield",
         "city": "Bangalore",
+        "lat": 12.9698,
+        "lon": 77.75,
         "capacity": 70,
         "cuisine": ["Italian"],
         "avg_cost_per_person": 800,
@@ -64,6 +70,8 @@ RESTAURANTS: List[Dict] = [
         "name": "GoodFoods HSR Layout #2",
         "area": "HSR Layout",
         "city": "Bangalore",
+        "lat": 12.9121,
+        "lon": 77.6446,
         "capacity": 150,
         "cuisine": ["Italian"],
         "avg_cost_per_person": 950,
@@ -76,6 +84,8 @@ RESTAURANTS: List[Dict] = [
         "name": "GoodFoods MG Road #2",
         "area": "MG Road",
         "city": "Bangalore",
+        "lat": 12.9756,
+        "lon": 77.6066,
         "capacity": 70,
         "cuisine": ["Italian"],
         "avg_cost_per_person": 900,
@@ -88,6 +98,8 @@ RESTAURANTS: List[Dict] = [
         "name": "GoodFoods BTM Layout #3",
         "area": "BTM Layout",
         "city": "Bangalore",
+        "lat": 12.9166,
+        "lon": 77.6101,
         "capacity": 60,
         "cuisine": ["Italian"],
         "avg_cost_per_person": 650,
@@ -100,6 +112,8 @@ RESTAURANTS: List[Dict] = [
         "name": "GoodFoods Hebbal #1",
         "area": "Hebbal",
         "city": "Bangalore",
+        "lat": 13.0358,
+        "lon": 77.597,
         "capacity": 110,
         "cuisine": ["Italian"],
         "avg_cost_per_person": 900,
@@ -112,6 +126,8 @@ RESTAURANTS: List[Dict] = [
         "name": "GoodFoods Yelahanka #1",
         "area": "Yelahanka",
         "city": "Bangalore",
+        "lat": 13.1005,
+        "lon": 77.5963,
         "capacity": 130,
         "cuisine": ["Italian"],
         "avg_cost_per_person": 850,
@@ -124,6 +140,8 @@ RESTAURANTS: List[Dict] = [
         "name": "GoodFoods Marathahalli #1",
         "area": "Marathahalli",
         "city": "Bangalore",
+        "lat": 12.9569,
+        "lon": 77.7011,
         "capacity": 140,
         "cuisine": ["Italian"],
         "avg_cost_per_person": 950,
@@ -136,6 +154,8 @@ RESTAURANTS: List[Dict] = [
         "name": "GoodFoods Vijayanagar #1",
         "area": "Vijayanagar",
         "city": "Bangalore",
+        "lat": 12.9719,
+        "lon": 77.5373,
         "capacity": 100,
         "cuisine": ["Italian"],
         "avg_cost_per_person": 850,
@@ -144,74 +164,76 @@ RESTAURANTS: List[Dict] = [
         "tags": ["premium", "family"],
     },
     # Extra outlets to reach ~60 locations
-    {"id": "GF-011", "name": "GoodFoods Indiranagar #2", "area": "Indiranagar", "city": "Bangalore", "capacity": 90,  "cuisine": ["Italian", "Continental"], "avg_cost_per_person": 800, "has_outdoor_seating": False, "is_veg_only": False, "tags": ["date-night"]},
-    {"id": "GF-012", "name": "GoodFoods Indiranagar #3", "area": "Indiranagar", "city": "Bangalore", "capacity": 60,  "cuisine": ["North Indian"],          "avg_cost_per_person": 600, "has_outdoor_seating": False, "is_veg_only": False, "tags": ["family"]},
-    {"id": "GF-013", "name": "GoodFoods Indiranagar #4", "area": "Indiranagar", "city": "Bangalore", "capacity": 140, "cuisine": ["Pan-Asian"],             "avg_cost_per_person": 950, "has_outdoor_seating": True,  "is_veg_only": False, "tags": ["premium", "groups"]},
+    {"id": "GF-011", "name": "GoodFoods Indiranagar #2", "area": "Indiranagar", "city": "Bangalore", "lat": 12.9764, "lon": 77.6377, "capacity": 90,  "cuisine": ["Italian", "Continental"], "avg_cost_per_person": 800, "has_outdoor_seating": False, "is_veg_only": False, "tags": ["date-night"]},
+    {"id": "GF-012", "name": "GoodFoods Indiranagar #3", "area": "Indiranagar", "city": "Bangalore", "lat": 12.9679, "lon": 77.6462, "capacity": 60,  "cuisine": ["North Indian"],          "avg_cost_per_person": 600, "has_outdoor_seating": False, "is_veg_only": False, "tags": ["family"]},
+    {"id": "GF-013", "name": "GoodFoods Indiranagar #4", "area": "Indiranagar", "city": "Bangalore", "lat": 12.9779, "lon": 77.6472, "capacity": 140, "cuisine": ["Pan-Asian"],             "avg_cost_per_person": 950, "has_outdoor_seating": True,  "is_veg_only": False, "tags": ["premium", "groups"]},
 
-    {"id": "GF-014", "name": "GoodFoods Koramangala #2", "area": "Koramangala", "city": "Bangalore", "capacity": 120, "cuisine": ["Italian"],               "avg_cost_per_person": 800, "has_outdoor_seating": True,  "is_veg_only": False, "tags": ["groups"]},
-    {"id": "GF-015", "name": "GoodFoods Koramangala #3", "area": "Koramangala", "city": "Bangalore", "capacity": 70,  "cuisine": ["South Indian"],         "avg_cost_per_person": 350, "has_outdoor_seating": False, "is_veg_only": True,  "tags": ["veg", "budget"]},
-    {"id": "GF-016", "name": "GoodFoods Koramangala #4", "area": "Koramangala", "city": "Bangalore", "capacity": 150, "cuisine": ["North Indian"],        "avg_cost_per_person": 700, "has_outdoor_seating": True,  "is_veg_only": False, "tags": ["family", "groups"]},
+    {"id": "GF-014", "name": "GoodFoods Koramangala #2", "area": "Koramangala", "city": "Bangalore", "lat": 12.9397, "lon": 77.621, "capacity": 120, "cuisine": ["Italian"],               "avg_cost_per_person": 800, "has_outdoor_seating": True,  "is_veg_only": False, "tags": ["groups"]},
+    {"id": "GF-015", "name": "GoodFoods Koramangala #3", "area": "Koramangala", "city": "Bangalore", "lat": 12.9312, "lon": 77.6295, "capacity": 70,  "cuisine": ["South Indian"],         "avg_cost_per_person": 350, "has_outdoor_seating": False, "is_veg_only": True,  "tags": ["veg", "budget"]},
+    {"id": "GF-016", "name": "GoodFoods Koramangala #4", "area": "Koramangala", "city": "Bangalore", "lat": 12.9412, "lon": 77.6305, "capacity": 150, "cuisine": ["North Indian"],        "avg_cost_per_person": 700, "has_outdoor_seating": True,  "is_veg_only": False, "tags": ["family", "groups"]},
 
-    {"id": "GF-017", "name": "GoodFoods Whitefield #3",  "area": "Whitefield",  "city": "Bangalore", "capacity": 90,  "cuisine": ["Italian"],             "avg_cost_per_person": 750, "has_outdoor_seating": False, "is_veg_only": False, "tags": ["date-night"]},
-    {"id": "GF-018", "name": "GoodFoods Whitefield #4",  "area": "Whitefield",  "city": "Bangalore", "capacity": 160, "cuisine": ["North Indian"],        "avg_cost_per_person": 650, "has_outdoor_seating": True,  "is_veg_only": False, "tags": ["groups", "corporate"]},
-    {"id": "GF-019", "name": "GoodFoods Whitefield #5",  "area": "Whitefield",  "city": "Bangalore", "capacity": 65,  "cuisine": ["South Indian"],        "avg_cost_per_person": 320, "has_outdoor_seating": False, "is_veg_only": True,  "tags": ["veg"]},
+    {"id": "GF-017", "name": "GoodFoods Whitefield #3",  "area": "Whitefield",  "city": "Bangalore", "lat": 12.9743, "lon": 77.7465, "capacity": 90,  "cuisine": ["Italian"],             "avg_cost_per_person": 750, "has_outdoor_seating": False, "is_veg_only": False, "tags": ["date-night"]},
+    {"id": "GF-018", "name": "GoodFoods Whitefield #4",  "area": "Whitefield",  "city": "Bangalore", "lat": 12.9658, "lon": 77.755, "capacity": 160, "cuisine": ["North Indian"],        "avg_cost_per_person": 650, "has_outdoor_seating": True,  "is_veg_only": False, "tags": ["groups", "corporate"]},
+    {"id": "GF-019", "name": "GoodFoods Whitefield #5",  "area": "Whitefield",  "city": "Bangalore", "lat": 12.9758, "lon": 77.756, "capacity": 65,  "cuisine": ["South Indian"],        "avg_cost_per_person": 320, "has_outdoor_seating": False, "is_veg_only": True,  "tags": ["veg"]},
 
-    {"id": "GF-020", "name": "GoodFoods HSR Layout #3",  "area": "HSR Layout",  "city": "Bangalore", "capacity": 80,  "cuisine": ["Italian"],             "avg_cost_per_person": 700, "has_outdoor_seating": False, "is_veg_only": False, "tags": ["family"]},
-    {"id": "GF-021", "name": "GoodFoods HSR Layout #4",  "area": "HSR Layout",  "city": "Bangalore", "capacity": 180, "cuisine": ["North Indian"],        "avg_cost_per_person": 750, "has_outdoor_seating": True,  "is_veg_only": False, "tags": ["groups", "corporate"]},
-    {"id": "GF-022", "name": "GoodFoods HSR Layout #5",  "area": "HSR Layout",  "city": "Bangalore", "capacity": 60,  "cuisine": ["South Indian"],        "avg_cost_per_person": 280, "has_outdoor_seating": False, "is_veg_only": True,  "tags": ["veg", "budget"]},
+    {"id": "GF-020", "name": "GoodFoods HSR Layout #3",  "area": "HSR Layout",  "city": "Bangalore", "lat": 12.9166, "lon": 77.6411, "capacity": 80,  "cuisine": ["Italian"],             "avg_cost_per_person": 700, "has_outdoor_seating": False, "is_veg_only": False, "tags": ["family"]},
+    {"id": "GF-021", "name": "GoodFoods HSR Layout #4",  "area": "HSR Layout",  "city": "Bangalore", "lat": 12.9081, "lon": 77.6496, "capacity": 180, "cuisine": ["North Indian"],        "avg_cost_per_person": 750, "has_outdoor_seating": True,  "is_veg_only": False, "tags": ["groups", "corporate"]},
+    {"id": "GF-022", "name": "GoodFoods HSR Layout #5",  "area": "HSR Layout",  "city": "Bangalore", "lat": 12.9181, "lon": 77.6506, "capacity": 60,  "cuisine": ["South Indian"],        "avg_cost_per_person": 280, "has_outdoor_seating": False, "is_veg_only": True,  "tags": ["veg", "budget"]},
 
-    {"id": "GF-023", "name": "GoodFoods MG Road #3",     "area": "MG Road",    "city": "Bangalore", "capacity": 90,  "cuisine": ["Italian", "Continental"], "avg_cost_per_person": 1000, "has_outdoor_seating": True,  "is_veg_only": False, "tags": ["premium", "date-night"]},
-    {"id": "GF-024", "name": "GoodFoods MG Road #4",     "area": "MG Road",    "city": "Bangalore", "capacity": 60,  "cuisine": ["Mexican"],              "avg_cost_per_person": 800,  "has_outdoor_seating": False, "is_veg_only": False, "tags": ["groups"]},
-    {"id": "GF-025", "name": "GoodFoods MG Road #5",     "area": "MG Road",    "city": "Bangalore", "capacity": 140, "cuisine": ["Pan-Asian"],            "avg_cost_per_person": 1100, "has_outdoor_seating": True,  "is_veg_only": False, "tags": ["corporate"]},
+    {"id": "GF-023", "name": "GoodFoods MG Road #3",     "area": "MG Road",    "city": "Bangalore", "lat": 12.9801, "lon": 77.6031, "capacity": 90,  "cuisine": ["Italian", "Continental"], "avg_cost_per_person": 1000, "has_outdoor_seating": True,  "is_veg_only": False, "tags": ["premium", "date-night"]},
+    {"id": "GF-024", "name": "GoodFoods MG Road #4",     "area": "MG Road",    "city": "Bangalore", "lat": 12.9716, "lon": 77.6116, "capacity": 60,  "cuisine": ["Mexican"],              "avg_cost_per_person": 800,  "has_outdoor_seating": False, "is_veg_only": False, "tags": ["groups"]},
+    {"id": "GF-025", "name": "GoodFoods MG Road #5",     "area": "MG Road",    "city": "Bangalore", "lat": 12.9816, "lon": 77.6126, "capacity": 140, "cuisine": ["Pan-Asian"],            "avg_cost_per_person": 1100, "has_outdoor_seating": True,  "is_veg_only": False, "tags": ["corporate"]},
 
-    {"id": "GF-026", "name": "GoodFoods BTM Layout #4",  "area": "BTM Layout",  "city": "Bangalore", "capacity": 80,  "cuisine": ["North Indian"],        "avg_cost_per_person": 550, "has_outdoor_seating": False, "is_veg_only": False, "tags": ["budget", "family"]},
-    {"id": "GF-027", "name": "GoodFoods BTM Layout #5",  "area": "BTM Layout",  "city": "Bangalore", "capacity": 140, "cuisine": ["Italian"],             "avg_cost_per_person": 750, "has_outdoor_seating": True,  "is_veg_only": False, "tags": ["groups"]},
-    {"id": "GF-028", "name": "GoodFoods BTM Layout #6",  "area": "BTM Layout",  "city": "Bangalore", "capacity": 60,  "cuisine": ["South Indian"],        "avg_cost_per_person": 260, "has_outdoor_seating": False, "is_veg_only": True,  "tags": ["veg"]},
+    {"id": "GF-026", "name": "GoodFoods BTM Layout #4",  "area": "BTM Layout",  "city": "Bangalore", "lat": 12.9211, "lon": 77.6066, "capacity": 80,  "cuisine": ["North Indian"],        "avg_cost_per_person": 550, "has_outdoor_seating": False, "is_veg_only": False, "tags": ["budget", "family"]},
+    {"id": "GF-027", "name": "GoodFoods BTM Layout #5",  "area": "BTM Layout",  "city": "Bangalore", "lat": 12.9126, "lon": 77.6151, "capacity": 140, "cuisine": ["Italian"],             "avg_cost_per_person": 750, "has_outdoor_seating": True,  "is_veg_only": False, "tags": ["groups"]},
+    {"id": "GF-028", "name": "GoodFoods BTM Layout #6",  "area": "BTM Layout",  "city": "Bangalore", "lat": 12.9226, "lon": 77.6161, "capacity": 60,  "cuisine": ["South Indian"],        "avg_cost_per_person": 260, "has_outdoor_seating": False, "is_veg_only": True,  "tags": ["veg"]},
 
-    {"id": "GF-029", "name": "GoodFoods Hebbal #2",      "area": "Hebbal",     "city": "Bangalore", "capacity": 90,  "cuisine": ["Italian"],             "avg_cost_per_person": 850, "has_outdoor_seating": False, "is_veg_only": False, "tags": ["date-night"]},
-    {"id": "GF-030", "name": "GoodFoods Hebbal #3",      "area": "Hebbal",     "city": "Bangalore", "capacity": 160, "cuisine": ["North Indian"],        "avg_cost_per_person": 700, "has_outdoor_seating": True,  "is_veg_only": False, "tags": ["groups", "corporate"]},
-    {"id": "GF-031", "name": "GoodFoods Hebbal #4",      "area": "Hebbal",     "city": "Bangalore", "capacity": 70,  "cuisine": ["South Indian"],        "avg_cost_per_person": 320, "has_outdoor_seating": False, "is_veg_only": True,  "tags": ["veg"]},
+    {"id": "GF-029", "name": "GoodFoods Hebbal #2",      "area": "Hebbal",     "city": "Bangalore", "lat": 13.0403, "lon": 77.5935, "capacity": 90,  "cuisine": ["Italian"],             "avg_cost_per_person": 850, "has_outdoor_seating": False, "is_veg_only": False, "tags": ["date-night"]},
+    {"id": "GF-030", "name": "GoodFoods Hebbal #3",      "area": "Hebbal",     "city": "Bangalore", "lat": 13.0318, "lon": 77.602, "capacity": 160, "cuisine": ["North Indian"],        "avg_cost_per_person": 700, "has_outdoor_seating": True,  "is_veg_only": False, "tags": ["groups", "corporate"]},
+    {"id": "GF-031", "name": "GoodFoods Hebbal #4",      "area": "Hebbal",     "city": "Bangalore", "lat": 13.0418, "lon": 77.603, "capacity": 70,  "cuisine": ["South Indian"],        "avg_cost_per_person": 320, "has_outdoor_seating": False, "is_veg_only": True,  "tags": ["veg"]},
 
-    {"id": "GF-032", "name": "GoodFoods Yelahanka #2",   "area": "Yelahanka",  "city": "Bangalore", "capacity": 110, "cuisine": ["Italian"],             "avg_cost_per_person": 800, "has_outdoor_seating": True,  "is_veg_only": False, "tags": ["family"]},
-    {"id": "GF-033", "name": "GoodFoods Yelahanka #3",   "area": "Yelahanka",  "city": "Bangalore", "capacity": 70,  "cuisine": ["North Indian"],        "avg_cost_per_person": 550, "has_outdoor_seating": False, "is_veg_only": False, "tags": ["budget"]},
-    {"id": "GF-034", "name": "GoodFoods Yelahanka #4",   "area": "Yelahanka",  "city": "Bangalore", "capacity": 150, "cuisine": ["Pan-Asian"],            "avg_cost_per_person": 900, "has_outdoor_seating": True,  "is_veg_only": False, "tags": ["groups"]},
+    {"id": "GF-032", "name": "GoodFoods Yelahanka #2",   "area": "Yelahanka",  "city": "Bangalore", "lat": 13.105, "lon": 77.5928, "capacity": 110, "cuisine": ["Italian"],             "avg_cost_per_person": 800, "has_outdoor_seating": True,  "is_veg_only": False, "tags": ["family"]},
+    {"id": "GF-033", "name": "GoodFoods Yelahanka #3",   "area": "Yelahanka",  "city": "Bangalore", "lat": 13.0965, "lon": 77.6013, "capacity": 70,  "cuisine": ["North Indian"],        "avg_cost_per_person": 550, "has_outdoor_seating": False, "is_veg_only": False, "tags": ["budget"]},
+    {"id": "GF-034", "name": "GoodFoods Yelahanka #4",   "area": "Yelahanka",  "city": "Bangalore", "lat": 13.1065, "lon": 77.6023, "capacity": 150, "cuisine": ["Pan-Asian"],            "avg_cost_per_person": 900, "has_outdoor_seating": True,  "is_veg_only": False, "tags": ["groups"]},
 
-    {"id": "GF-035", "name": "GoodFoods Marathahalli #4", "area": "Marathahalli", "city": "Bangalore", "capacity": 90,  "cuisine": ["Italian"],         "avg_cost_per_person": 800, "has_outdoor_seating": False, "is_veg_only": False, "tags": ["date-night"]},
-    {"id": "GF-036", "name": "GoodFoods Marathahalli #5", "area": "Marathahalli", "city": "Bangalore", "capacity": 170, "cuisine": ["North Indian"],    "avg_cost_per_person": 720, "has_outdoor_seating": True,  "is_veg_only": False, "tags": ["groups", "corporate"]},
-    {"id": "GF-037", "name": "GoodFoods Marathahalli #6", "area": "Marathahalli", "city": "Bangalore", "capacity": 65,  "cuisine": ["South Indian"],    "avg_cost_per_person": 310, "has_outdoor_seating": False, "is_veg_only": True,  "tags": ["veg", "budget"]},
+    {"id": "GF-035", "name": "GoodFoods Marathahalli #4", "area": "Marathahalli", "city": "Bangalore", "lat": 12.9614, "lon": 77.6976, "capacity": 90,  "cuisine": ["Italian"],         "avg_cost_per_person": 800, "has_outdoor_seating": False, "is_veg_only": False, "tags": ["date-night"]},
+    {"id": "GF-036", "name": "GoodFoods Marathahalli #5", "area": "Marathahalli", "city": "Bangalore", "lat": 12.9529, "lon": 77.7061, "capacity": 170, "cuisine": ["North Indian"],    "avg_cost_per_person": 720, "has_outdoor_seating": True,  "is_veg_only": False, "tags": ["groups", "corporate"]},
+    {"id": "GF-037", "name": "GoodFoods Marathahalli #6", "area": "Marathahalli", "city": "Bangalore", "lat": 12.9629, "lon": 77.7071, "capacity": 65,  "cuisine": ["South Indian"],    "avg_cost_per_person": 310, "has_outdoor_seating": False, "is_veg_only": True,  "tags": ["veg", "budget"]},
 
-    {"id": "GF-038", "name": "GoodFoods Vijayanagar #4", "area": "Vijayanagar", "city": "Bangalore", "capacity": 120, "cuisine": ["North Indian"],        "avg_cost_per_person": 600, "has_outdoor_seating": True,  "is_veg_only": False, "tags": ["family"]},
-    {"id": "GF-039", "name": "GoodFoods Vijayanagar #5", "area": "Vijayanagar", "city": "Bangalore", "capacity": 75,  "cuisine": ["South Indian"],        "avg_cost_per_person": 320, "has_outdoor_seating": False, "is_veg_only": True,  "tags": ["veg"]},
+    {"id": "GF-038", "name": "GoodFoods Vijayanagar #4", "area": "Vijayanagar", "city": "Bangalore", "lat": 12.9764, "lon": 77.5338, "capacity": 120, "cuisine": ["North Indian"],        "avg_cost_per_person": 600, "has_outdoor_seating": True,  "is_veg_only": False, "tags": ["family"]},
+    {"id": "GF-039", "name": "GoodFoods Vijayanagar #5", "area": "Vijayanagar", "city": "Bangalore", "lat": 12.9679, "lon": 77.5423, "capacity": 75,  "cuisine": ["South Indian"],        "avg_cost_per_person": 320, "has_outdoor_seating": False, "is_veg_only": True,  "tags": ["veg"]},
 
-    {"id":"GF-040","name":"GoodFoods Electronic City #1","area":"Electronic City","city":"Bangalore","capacity":150,"cuisine":["North Indian","Chinese"],"avg_cost_per_person":550,"has_outdoor_seating":True,"is_veg_only":False,"tags":["corporate"]},
-    {"id":"GF-041","name":"GoodFoods Electronic City #2","area":"Electronic City","city":"Bangalore","capacity":100,"cuisine":["Italian"],"avg_cost_per_person":850,"has_outdoor_seating":False,"is_veg_only":False,"tags":["date-night"]},
-    {"id":"GF-042","name":"GoodFoods Electronic City #3","area":"Electronic City","city":"Bangalore","capacity":70,"cuisine":["South Indian"],"avg_cost_per_person":300,"has_outdoor_seating":False,"is_veg_only":True,"tags":["veg"]},
+    {"id":"GF-040","name":"GoodFoods Electronic City #1","area":"Electronic City","city":"Bangalore","lat":12.8452,"lon":77.6602,"capacity":150,"cuisine":["North Indian","Chinese"],"avg_cost_per_person":550,"has_outdoor_seating":True,"is_veg_only":False,"tags":["corporate"]},
+    {"id":"GF-041","name":"GoodFoods Electronic City #2","area":"Electronic City","city":"Bangalore","lat":12.8497,"lon":77.6567,"capacity":100,"cuisine":["Italian"],"avg_cost_per_person":850,"has_outdoor_seating":False,"is_veg_only":False,"tags":["date-night"]},
+    {"id":"GF-042","name":"GoodFoods Electronic City #3","area":"Electronic City","city":"Bangalore","lat":12.8412,"lon":77.6652,"capacity":70,"cuisine":["South Indian"],"avg_cost_per_person":300,"has_outdoor_seating":False,"is_veg_only":True,"tags":["veg"]},
 
-    {"id":"GF-043","name":"GoodFoods Airport Road #1","area":"Airport Road","city":"Bangalore","capacity":200,"cuisine":["Continental"],"avg_cost_per_person":1200,"has_outdoor_seating":True,"is_veg_only":False,"tags":["premium"]},
-    {"id":"GF-044","name":"GoodFoods Airport Road #2","area":"Airport Road","city":"Bangalore","capacity":95,"cuisine":["North Indian"],"avg_cost_per_person":700,"has_outdoor_seating":False,"is_veg_only":False,"tags":["family"]},
-    {"id":"GF-045","name":"GoodFoods Airport Road #3","area":"Airport Road","city":"Bangalore","capacity":80,"cuisine":["Chinese"],"avg_cost_per_person":600,"has_outdoor_seating":True,"is_veg_only":False,"tags":["groups"]},
+    {"id":"GF-043","name":"GoodFoods Airport Road #1","area":"Airport Road","city":"Bangalore","lat":12.9592,"lon":77.661,"capacity":200,"cuisine":["Continental"],"avg_cost_per_person":1200,"has_outdoor_seating":True,"is_veg_only":False,"tags":["premium"]},
+    {"id":"GF-044","name":"GoodFoods Airport Road #2","area":"Airport Road","city":"Bangalore","lat":12.9637,"lon":77.6575,"capacity":95,"cuisine":["North Indian"],"avg_cost_per_person":700,"has_outdoor_seating":False,"is_veg_only":False,"tags":["family"]},
+    {"id":"GF-045","name":"GoodFoods Airport Road #3","area":"Airport Road","city":"Bangalore","lat":12.9552,"lon":77.666,"capacity":80,"cuisine":["Chinese"],"avg_cost_per_person":600,"has_outdoor_seating":True,"is_veg_only":False,"tags":["groups"]},
 
-    {"id":"GF-046","name":"GoodFoods Marathahalli #1","area":"Marathahalli","city":"Bangalore","capacity":140,"cuisine":["Italian"],"avg_cost_per_person":950,"has_outdoor_seating":True,"is_veg_only":False,"tags":["date-night"]},
-    {"id":"GF-047","name":"GoodFoods Marathahalli #2","area":"Marathahalli","city":"Bangalore","capacity":70,"cuisine":["South Indian"],"avg_cost_per_person":300,"has_outdoor_seating":False,"is_veg_only":True,"tags":["veg"]},
-    {"id":"GF-048","name":"GoodFoods Marathahalli #3","area":"Marathahalli","city":"Bangalore","capacity":160,"cuisine":["North Indian"],"avg_cost_per_person":750,"has_outdoor_seating":True,"is_veg_only":False,"tags":["groups"]},
+    {"id":"GF-046","name":"GoodFoods Marathahalli #1","area":"Marathahalli","city":"Bangalore","lat":12.9504,"lon":77.6966,"capacity":140,"cuisine":["Italian"],"avg_cost_per_person":950,"has_outdoor_seating":True,"is_veg_only":False,"tags":["date-night"]},
+    {"id":"GF-047","name":"GoodFoods Marathahalli #2","area":"Marathahalli","city":"Bangalore","lat":12.9589,"lon":77.7091,"capacity":70,"cuisine":["South Indian"],"avg_cost_per_person":300,"has_outdoor_seating":False,"is_veg_only":True,"tags":["veg"]},
+    {"id":"GF-048","name":"GoodFoods Marathahalli #3","area":"Marathahalli","city":"Bangalore","lat":12.9499,"lon":77.7031,"capacity":160,"cuisine":["North Indian"],"avg_cost_per_person":750,"has_outdoor_seating":True,"is_veg_only":False,"tags":["groups"]},
 
-    {"id":"GF-049","name":"GoodFoods Vijayanagar #1","area":"Vijayanagar","city":"Bangalore","capacity":100,"cuisine":["Italian"],"avg_cost_per_person":850,"has_outdoor_seating":True,"is_veg_only":False,"tags":["premium"]},
-    {"id":"GF-050","name":"GoodFoods Vijayanagar #2","area":"Vijayanagar","city":"Bangalore","capacity":60,"cuisine":["North Indian"],"avg_cost_per_person":500,"has_outdoor_seating":False,"is_veg_only":False,"tags":["budget"]},
-    {"id":"GF-051","name":"GoodFoods Vijayanagar #3","area":"Vijayanagar","city":"Bangalore","capacity":140,"cuisine":["South Indian"],"avg_cost_per_person":350,"has_outdoor_seating":False,"is_veg_only":True,"tags":["veg"]},
+    {"id":"GF-049","name":"GoodFoods Vijayanagar #1","area":"Vijayanagar","city":"Bangalore","lat":12.9779,"lon":77.5433,"capacity":100,"cuisine":["Italian"],"avg_cost_per_person":850,"has_outdoor_seating":True,"is_veg_only":False,"tags":["premium"]},
+    {"id":"GF-050","name":"GoodFoods Vijayanagar #2","area":"Vijayanagar","city":"Bangalore","lat":12.9654,"lon":77.5328,"capacity":60,"cuisine":["North Indian"],"avg_cost_per_person":500,"has_outdoor_seating":False,"is_veg_only":False,"tags":["budget"]},
+    {"id":"GF-051","name":"GoodFoods Vijayanagar #3","area":"Vijayanagar","city":"Bangalore","lat":12.9739,"lon":77.5453,"capacity":140,"cuisine":["South Indian"],"avg_cost_per_person":350,"has_outdoor_seating":False,"is_veg_only":True,"tags":["veg"]},
 
-    {"id":"GF-052","name":"GoodFoods Malleshwaram #1","area":"Malleshwaram","city":"Bangalore","capacity":135,"cuisine":["North Indian"],"avg_cost_per_person":700,"has_outdoor_seating":True,"is_veg_only":False,"tags":["groups"]},
-    {"id":"GF-053","name":"GoodFoods Malleshwaram #2","area":"Malleshwaram","city":"Bangalore","capacity":85,"cuisine":["Pan-Asian"],"avg_cost_per_person":650,"has_outdoor_seating":False,"is_veg_only":False,"tags":["date-night"]},
-    {"id":"GF-054","name":"GoodFoods Malleshwaram #3","area":"Malleshwaram","city":"Bangalore","capacity":60,"cuisine":["South Indian"],"avg_cost_per_person":300,"has_outdoor_seating":False,"is_veg_only":True,"tags":["veg"]},
+    {"id":"GF-052","name":"GoodFoods Malleshwaram #1","area":"Malleshwaram","city":"Bangalore","lat":13.0031,"lon":77.5643,"capacity":135,"cuisine":["North Indian"],"avg_cost_per_person":700,"has_outdoor_seating":True,"is_veg_only":False,"tags":["groups"]},
+    {"id":"GF-053","name":"GoodFoods Malleshwaram #2","area":"Malleshwaram","city":"Bangalore","lat":13.0076,"lon":77.5608,"capacity":85,"cuisine":["Pan-Asian"],"avg_cost_per_person":650,"has_outdoor_seating":False,"is_veg_only":False,"tags":["date-night"]},
+    {"id":"GF-054","name":"GoodFoods Malleshwaram #3","area":"Malleshwaram","city":"Bangalore","lat":12.9991,"lon":77.5693,"capacity":60,"cuisine":["South Indian"],"avg_cost_per_person":300,"has_outdoor_seating":False,"is_veg_only":True,"tags":["veg"]},
 
-    {"id":"GF-055","name":"GoodFoods Ulsoor #1","area":"Ulsoor","city":"Bangalore","capacity":150,"cuisine":["Continental"],"avg_cost_per_person":950,"has_outdoor_seating":True,"is_veg_only":False,"tags":["premium"]},
-    {"id":"GF-056","name":"GoodFoods Ulsoor #2","area":"Ulsoor","city":"Bangalore","capacity":70,"cuisine":["Mexican"],"avg_cost_per_person":700,"has_outdoor_seating":False,"is_veg_only":False,"tags":["groups"]},
-    {"id":"GF-057","name":"GoodFoods Ulsoor #3","area":"Ulsoor","city":"Bangalore","capacity":120,"cuisine":["North Indian"],"avg_cost_per_person":600,"has_outdoor_seating":True,"is_veg_only":False,"tags":["family"]},
+    {"id":"GF-055","name":"GoodFoods Ulsoor #1","area":"Ulsoor","city":"Bangalore","lat":12.9817,"lon":77.62,"capacity":150,"cuisine":["Continental"],"avg_cost_per_person":950,"has_outdoor_seating":True,"is_veg_only":False,"tags":["premium"]},
+    {"id":"GF-056","name":"GoodFoods Ulsoor #2","area":"Ulsoor","city":"Bangalore","lat":12.9862,"lon":77.6165,"capacity":70,"cuisine":["Mexican"],"avg_cost_per_person":700,"has_outdoor_seating":False,"is_veg_only":False,"tags":["groups"]},
+    {"id":"GF-057","name":"GoodFoods Ulsoor #3","area":"Ulsoor","city":"Bangalore","lat":12.9777,"lon":77.625,"capacity":120,"cuisine":["North Indian"],"avg_cost_per_person":600,"has_outdoor_seating":True,"is_veg_only":False,"tags":["family"]},
 
-    {"id":"GF-058","name":"GoodFoods Richmond Town #1","area":"Richmond Town","city":"Bangalore","capacity":160,"cuisine":["Italian"],"avg_cost_per_person":1200,"has_outdoor_seating":True,"is_veg_only":False,"tags":["premium","date-night"]},
-    {"id":"GF-059","name":"GoodFoods Richmond Town #2","area":"Richmond Town","city":"Bangalore","capacity":100,"cuisine":["South Indian"],"avg_cost_per_person":350,"has_outdoor_seating":False,"is_veg_only":True,"tags":["veg"]},
-    {"id":"GF-060","name":"GoodFoods Richmond Town #3","area":"Richmond Town","city":"Bangalore","capacity":140,"cuisine":["Pan-Asian"],"avg_cost_per_person":800,"has_outdoor_seating":True,"is_veg_only":False,"tags":["corporate"]}
+    {"id":"GF-058","name":"GoodFoods Richmond Town #1","area":"Richmond Town","city":"Bangalore","lat":12.9634,"lon":77.6009,"capacity":160,"cuisine":["Italian"],"avg_cost_per_person":1200,"has_outdoor_seating":True,"is_veg_only":False,"tags":["premium","date-night"]},
+    {"id":"GF-059","name":"GoodFoods Richmond Town #2","area":"Richmond Town","city":"Bangalore","lat":12.9679,"lon":77.5974,"capacity":100,"cuisine":["South Indian"],"avg_cost_per_person":350,"has_outdoor_seating":False,"is_veg_only":True,"tags":["veg"]},
+    {"id":"GF-060","name":"GoodFoods Richmond Town #3","area":"Richmond Town","city":"Bangalore","lat":12.9594,"lon":77.6059,"capacity":140,"cuisine":["Pan-Asian"],"avg_cost_per_person":800,"has_outdoor_seating":True,"is_veg_only":False,"tags":["corporate"]}
 ]
 
+RESTAURANTS_BY_ID: Dict[str, Dict] = {r["id"]: r for r in RESTAURANTS}
+
 def search_restaurants(
     area: str | None = None,
     cuisine: str | None = None,
@@ -0,0 +1,164 @@
+"""Compact tool results before they are embedded in the follow-up LLM prompt.
+
+Tool functions return full Python objects (the UI and tests rely on them);
+the model only needs a small projection. This module:
+
+- projects restaurant dicts to the fields used in replies,
+- replaces repeated restaurants with an id reference,
+- drops empty values,
+- trims the longest lists until the payload fits a token budget,
+
+and reports how many prompt tokens were saved.
+"""
+
+import json
+import os
+from typing import Any, Callable, Dict, Tuple
+
+TOKEN_BUDGET = int(os.getenv("TOOL_RESULT_TOKEN_BUDGET", "600"))
+
+# `city` is always Bangalore and `is_veg_only` duplicates the "veg" tag.
+RESTAURANT_FIELDS = (
+    "id", "name", "area", "cuisine", "avg_cost_per_person", "capacity", "tags",
+    "expected_busy_pct", "quieter_times", "distance_km",
+)
+
+# Per-tool cap on list lengths before budget trimming kicks in.
+MAX_LIST_ITEMS = 5
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English/JSON)."""
+    return (len(text) + 3) // 4
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def _is_restaurant(value: Dict[str, Any]) -> bool:
+    return "id" in value and "area" in value and "avg_cost_per_person" in value
+
+
+def _compact_restaurant(r: Dict[str, Any], seen: set) -> Dict[str, Any]:
+    if r["id"] in seen:
+        return {"id": r["id"]}
+    seen.add(r["id"])
+    out = {k: r[k] for k in RESTAURANT_FIELDS if r.get(k) not in (None, "", [])}
+    if r.get("has_outdoor_seating"):
+        out["outdoor"] = True
+    return out
+
+
+def _compact_value(value: Any, seen: set) -> Any:
+    if isinstance(value, dict):
+        if _is_restaurant(value):
+            return _compact_restaurant(value, seen)
+        return {
+            k: _compact_value(v, seen)
+            for k, v in value.items()
+            if v not in (None, "", [], {})
+        }
+    if isinstance(value, list):
+        return [_compact_value(v, seen) for v in value[:MAX_LIST_ITEMS]] + (
+            [{"more": len(value) - MAX_LIST_ITEMS}] if len(value) > MAX_LIST_ITEMS else []
+        )
+    return value
+
+
+def _compact_smart_book(result: Dict[str, Any], seen: set) -> Dict[str, Any]:
+    # The chosen outlet is always one of the candidates; emit it once and
+    # leave it out of the candidate list.
+    result = dict(result)
+    chosen = result.pop("chosen_restaurant", None)
+    out: Dict[str, Any] = {}
+    if chosen:
+        out["chosen_restaurant"] = _compact_restaurant(chosen, seen)
+        result["candidates"] = [c for c in result.get("candidates", []) if c["id"] != chosen["id"]]
+    out.update(_compact_value(result, seen))
+    return out
+
+
+# Tool name -> compactor. Tools not listed use the generic walk.
+COMPACTORS: Dict[str, Callable[[Dict[str, Any], set], Dict[str, Any]]] = {
+    "smart_book": _compact_smart_book,
+}
+
+
+def _is_marker(value: Any) -> bool:
+    return isinstance(value, dict) and len(value) == 1 and ("more" in value or "omitted" in value)
+
+
+def _longest_list(value: Any, path: Tuple = ()) -> Tuple[Tuple, int]:
+    """Path to the list with the most real (non-marker) items, and that count."""
+    best: Tuple[Tuple, int] = ((), 0)
+    if isinstance(value, dict):
+        items = value.items()
+    elif isinstance(value, list):
+        best = (path, sum(1 for v in value if not _is_marker(v)))
+        items = enumerate(value)
+    else:
+        return best
+    for k, v in items:
+        candidate = _longest_list(v, path + (k,))
+        if candidate[1] > best[1]:
+            best = candidate
+    return best
+
+
+def _fit_budget(value: Any, budget: int) -> Any:
+    """Halve the longest list until the payload fits, marking what was dropped."""
+    while estimate_tokens(_dumps(value)) > budget:
+        path, length = _longest_list(value)
+        if length <= 1:
+            break
+        items = value
+        for key in path:
+            items = items[key]
+        real = [v for v in items if not _is_marker(v)]
+        dropped = len(real) - length // 2 + sum(
+            m.get("more", 0) + m.get("omitted", 0) for m in items if _is_marker(m)
+        )
+        items[:] = real[: length // 2] + [{"omitted": dropped}]
+    return value
+
+
+# Paginated tools: tool name -> (list key, cursor of a row). When compaction
+# cuts the page short, next_cursor is moved back to the last row actually
+# sent so the rows that were dropped come back on the next page.
+PAGINATED: Dict[str, Tuple[str, Callable[[Dict[str, Any]], str]]] = {
+    "list_reservations": ("reservations", lambda row: f"{row['datetime']}|{row['id']}"),
+}
+
+
+def _repage(tool_name: str, compact: Any) -> Any:
+    key, cursor_of = PAGINATED.get(tool_name, (None, None))
+    if key is None or not isinstance(compact, dict) or not isinstance(compact.get(key), list):
+        return compact
+    rows = [v for v in compact[key] if not _is_marker(v)]
+    if len(rows) < len(compact[key]) and rows:
+        compact[key] = rows
+        compact["next_cursor"] = cursor_of(rows[-1])
+    return compact
+
+
+def compact_result(tool_name: str, result: Any, budget: int = TOKEN_BUDGET) -> Tuple[str, Dict[str, int]]:
+    """Return (compact JSON text, stats) for a tool result.
+
+    stats has raw_tokens, compact_tokens and tokens_saved.
+    """
+    raw_tokens = estimate_tokens(json.dumps(result))
+    seen: set = set()
+    if isinstance(result, dict):
+        compactor = COMPACTORS.get(tool_name)
+        compact = compactor(result, seen) if compactor else _compact_value(result, seen)
+    else:
+        compact = _compact_value(result, seen)
+    compact = _repage(tool_name, _fit_budget(compact, budget))
+    text = _dumps(compact)
+    compact_tokens = estimate_tokens(text)
+    return text, {
+        "raw_tokens": raw_tokens,
+        "compact_tokens": compact_tokens,
+        "tokens_saved": max(0, raw_tokens - compact_tokens),
+    }
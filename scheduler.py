@@ -0,0 +1,250 @@
+"""Background reminder, no-show and waitlist-promotion worker for GoodFoods reservations.
+
+The scheduler never scans the full reservations table. On every refill it
+reads only the active bookings inside a short look-ahead window (via the
+(status, datetime) index) and pushes their due events onto a heap, so a
+single worker stays cheap even with a very large backlog of future bookings.
+Guests promoted off a waitlist (on a cancellation or a no-show) are told on
+the next tick.
+
+No-show marking is off unless enabled (`--mark-no-shows`): it relies on staff
+checking guests in from the outlet dashboard, otherwise every guest who
+came would be told they were missed. A no-show releases the booking's covers
+to the slot's waitlist, as a cancellation does.
+"""
+
+import argparse
+import heapq
+import json
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+from datetime_parser import local_from_utc, local_now, to_canonical
+from reservation_db import (
+    get_reservation,
+    list_active_between,
+    list_unnotified_promotions,
+    mark_no_show,
+    mark_promotion_notified,
+    parse_reservation_datetime,
+    record_notification,
+)
+from restaurant_data import RESTAURANTS
+
+
+class Notifier(ABC):
+    """Delivery channel for reminder / no-show notifications."""
+
+    @abstractmethod
+    def send(self, kind: str, reservation: Dict[str, Any], message: str) -> None:
+        """Deliver one notification for a reservation."""
+
+
+class FileNotifier(Notifier):
+    """Append notifications as JSON lines to a local file (SMS/WhatsApp stand-in)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def send(self, kind: str, reservation: Dict[str, Any], message: str) -> None:
+        line = json.dumps({
+            "kind": kind,
+            "reservation_id": reservation["id"],
+            "phone": reservation["phone"],
+            "message": message,
+            "sent_at": datetime.utcnow().isoformat(),
+        })
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+class MemoryNotifier(Notifier):
+    """Keep notifications in a list; handy for tests and local runs."""
+
+    def __init__(self):
+        self.sent: List[Dict[str, Any]] = []
+
+    def send(self, kind: str, reservation: Dict[str, Any], message: str) -> None:
+        self.sent.append({"kind": kind, "reservation_id": reservation["id"], "message": message})
+
+
+def _format_message(kind: str, reservation: Dict[str, Any], when: datetime) -> str:
+    restaurant = next((r for r in RESTAURANTS if r["id"] == reservation["restaurant_id"]), {})
+    outlet = restaurant.get("name", reservation["restaurant_id"])
+    if kind == "reminder":
+        return (
+            f"Hi {reservation['name']}, a reminder of your table for "
+            f"{reservation['party_size']} at {outlet} on {when:%d %b, %I:%M %p}. "
+            f"Reservation ID: {reservation['id']}."
+        )
+    if kind == "waitlist_promoted":
+        return (
+            f"Good news {reservation['name']}! A table for {reservation['party_size']} "
+            f"opened up at {outlet} on {when:%d %b, %I:%M %p} and is now booked for you. "
+            f"Reservation ID: {reservation['id']}."
+        )
+    return (
+        f"Hi {reservation['name']}, we missed you at {outlet} on {when:%d %b, %I:%M %p}. "
+        f"Reservation {reservation['id']} has been released."
+    )
+
+
+class ReminderScheduler:
+    """Heap-driven scheduler for reminders and no-show marking.
+
+    - A reminder goes out ``reminder_lead`` before the reservation time.
+    - With ``mark_no_shows``, a reservation still active ``no_show_grace``
+      after its time (or after it was booked, for late waitlist promotions)
+      is marked as a no-show. Guests who arrived are checked in via
+      ``mark_seated`` from the staff dashboard.
+    """
+
+    def __init__(
+        self,
+        notifier: Notifier,
+        reminder_lead: timedelta = timedelta(hours=2),
+        no_show_grace: timedelta = timedelta(minutes=30),
+        horizon: timedelta = timedelta(hours=1),
+        clock: Callable[[], datetime] = local_now,
+        mark_no_shows: bool = False,
+    ):
+        self.notifier = notifier
+        self.mark_no_shows = mark_no_shows
+        self.reminder_lead = reminder_lead
+        self.no_show_grace = no_show_grace
+        self.horizon = horizon
+        self.clock = clock
+        self._heap: List[Tuple[datetime, int, str, str]] = []
+        self._scheduled: Set[Tuple[str, str]] = set()
+        self._seq = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _push(self, due: datetime, kind: str, res_id: str) -> None:
+        key = (res_id, kind)
+        if key in self._scheduled:
+            return
+        self._scheduled.add(key)
+        self._seq += 1
+        heapq.heappush(self._heap, (due, self._seq, kind, res_id))
+
+    def refill(self, now: datetime | None = None) -> int:
+        """Load due events for bookings inside the current look-ahead window."""
+        now = now or self.clock()
+        window_start = now - self.no_show_grace
+        window_end = now + self.horizon + self.reminder_lead
+        # Stored datetimes are canonical (fixed +05:30 offset), so string
+        # bounds in the same form select exactly the window off the index.
+        rows = list_active_between(to_canonical(window_start), to_canonical(window_end))
+        pushed = 0
+        for row in rows:
+            when = parse_reservation_datetime(row["datetime"])
+            if when is None:
+                continue
+            before = len(self._heap)
+            if "reminder" not in row["notified"] and when > now:
+                self._push(max(when - self.reminder_lead, now), "reminder", row["id"])
+            if self.mark_no_shows and "no_show" not in row["notified"]:
+                # A booking promoted off the waitlist after its start time gets
+                # the full grace from the moment it was made.
+                booked_at = local_from_utc(row["created_at"]) or when
+                self._push(max(when, booked_at) + self.no_show_grace, "no_show", row["id"])
+            pushed += len(self._heap) - before
+        return pushed
+
+    def run_due(self, now: datetime | None = None) -> int:
+        """Dispatch every event whose due time has passed. Returns the count handled."""
+        now = now or self.clock()
+        handled = 0
+        while self._heap and self._heap[0][0] <= now:
+            _, _, kind, res_id = heapq.heappop(self._heap)
+            self._scheduled.discard((res_id, kind))
+            if self._dispatch(kind, res_id):
+                handled += 1
+        return handled
+
+    def _dispatch(self, kind: str, res_id: str) -> bool:
+        # Re-read the row: it may have been cancelled or checked in since loading.
+        reservation = get_reservation(res_id)
+        if not reservation or reservation["status"] != "active":
+            return False
+        when = parse_reservation_datetime(reservation["datetime"])
+        if when is None:
+            return False
+        if kind == "no_show" and mark_no_show(res_id) is None:
+            return False
+        self.notifier.send(kind, reservation, _format_message(kind, reservation, when))
+        record_notification(res_id, kind, datetime.utcnow().isoformat())
+        return True
+
+    def notify_promotions(self) -> int:
+        """Tell guests whose waitlist entry became a booking. Returns the count sent."""
+        sent = 0
+        for entry in list_unnotified_promotions():
+            reservation = get_reservation(entry["reservation_id"])
+            when = parse_reservation_datetime(reservation["datetime"]) if reservation else None
+            if when is not None and reservation["status"] == "active":
+                message = _format_message("waitlist_promoted", reservation, when)
+                self.notifier.send("waitlist_promoted", reservation, message)
+                record_notification(reservation["id"], "waitlist_promoted", datetime.utcnow().isoformat())
+                sent += 1
+            mark_promotion_notified(entry["id"], datetime.utcnow().isoformat())
+        return sent
+
+    def tick(self, now: datetime | None = None) -> int:
+        now = now or self.clock()
+        self.notify_promotions()
+        self.refill(now)
+        return self.run_due(now)
+
+    def run_forever(self, poll_interval: float = 30.0) -> None:
+        while not self._stop.is_set():
+            self.tick()
+            self._stop.wait(poll_interval)
+
+    def start(self, poll_interval: float = 30.0) -> None:
+        """Run the scheduler on a daemon thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self.run_forever, args=(poll_interval,), name="reminder-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="GoodFoods reminder and no-show worker")
+    parser.add_argument("--notify-file", default="notifications.jsonl",
+                        help="JSONL file notifications are appended to")
+    parser.add_argument("--reminder-lead-minutes", type=int, default=120)
+    parser.add_argument("--no-show-grace-minutes", type=int, default=30)
+    parser.add_argument("--poll-seconds", type=float, default=30.0)
+    parser.add_argument("--mark-no-shows", action="store_true",
+                        help="release bookings not checked in after the grace period "
+                             "(only when staff check guests in on the dashboard)")
+    args = parser.parse_args()
+
+    scheduler = ReminderScheduler(
+        FileNotifier(args.notify_file),
+        reminder_lead=timedelta(minutes=args.reminder_lead_minutes),
+        no_show_grace=timedelta(minutes=args.no_show_grace_minutes),
+        mark_no_shows=args.mark_no_shows,
+    )
+    try:
+        scheduler.run_forever(args.poll_seconds)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""Server-side conversation state shared by the Streamlit app and the HTTP API.
+
+A session state is a small dict:
+
+    {"history": [{"user": ..., "assistant": ...}, ...],   # last MAX_TURNS turns
+     "slots": {"area": ..., "party_size": ..., ...}}      # booking details seen so far
+
+History is compacted to the most recent turns; the slots keep details from
+older turns available to the model. Two stores are provided:
+
+- InMemorySessionStore: LRU + idle TTL, for a single worker.
+- SQLiteSessionStore: file-backed, shared by workers on the same host and
+  surviving restarts.
+
+Turns within one session must not interleave. Callers take a turn lease with
+`try_lock_turn` / `unlock_turn`; the SQLite store keeps leases in the
+database so they hold across worker processes.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List
+
+MAX_TURNS = int(os.getenv("SESSION_MAX_TURNS", "10"))
+SESSION_TTL_SECONDS = float(os.getenv("SESSION_TTL_SECONDS", "1800"))
+SESSION_DB_PATH = os.getenv(
+    "SESSION_DB_PATH", os.path.join(os.path.dirname(__file__), "sessions.db")
+)
+
+# Tool arguments worth remembering across turns.
+SLOT_FIELDS = (
+    "restaurant_id", "restaurant_name", "area", "cuisine", "party_size",
+    "date", "time", "datetime", "name", "phone", "special_requests",
+)
+
+
+def new_session_state() -> Dict[str, Any]:
+    return {"history": [], "slots": {}}
+
+
+def append_turn(state: Dict[str, Any], user: str, assistant: str) -> None:
+    """Add a turn and drop the oldest ones beyond MAX_TURNS."""
+    state["history"].append({"user": user, "assistant": assistant})
+    del state["history"][:-MAX_TURNS]
+
+
+def update_slots(state: Dict[str, Any], tool_args: Dict[str, Any] | None) -> None:
+    """Merge booking details from a tool call's arguments into the session."""
+    for key in SLOT_FIELDS:
+        value = (tool_args or {}).get(key)
+        if value not in (None, ""):
+            state["slots"][key] = value
+
+
+def history_messages(state: Dict[str, Any]) -> List[Dict[str, str]]:
+    """Chat messages for run_agent: known slots first, then the compacted turns."""
+    messages = []
+    if state["slots"]:
+        messages.append({
+            "role": "system",
+            "content": "Booking details collected so far: " + json.dumps(state["slots"]),
+        })
+    for turn in state["history"]:
+        messages.append({"role": "user", "content": turn["user"]})
+        messages.append({"role": "assistant", "content": turn["assistant"]})
+    return messages
+
+
+class SessionStore(ABC):
+    """Interface for session persistence. Lookups are O(1) by session id."""
+
+    @abstractmethod
+    def get(self, session_id: str) -> Dict[str, Any] | None:
+        """State of a live session, or None if unknown or expired."""
+
+    @abstractmethod
+    def put(self, session_id: str, state: Dict[str, Any]) -> None:
+        """Store a session's state and mark it as active now."""
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        """Forget a session."""
+
+    @abstractmethod
+    def evict_idle(self) -> int:
+        """Drop sessions idle for longer than the TTL. Returns how many were removed."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of stored sessions."""
+
+    def try_lock_turn(self, session_id: str, owner: str, lease_seconds: float) -> bool:
+        """Claim the session for one turn. False if another owner holds a live lease.
+
+        The default suits stores private to one process, where the caller's
+        in-process lock already serializes turns.
+        """
+        return True
+
+    def unlock_turn(self, session_id: str, owner: str) -> None:
+        """Release a lease taken with try_lock_turn (no-op if it already expired)."""
+
+
+class InMemorySessionStore(SessionStore):
+    """LRU dict with an idle TTL and a hard cap on the number of sessions."""
+
+    def __init__(self, max_sessions: int = 10_000, ttl_seconds: float = SESSION_TTL_SECONDS):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> Dict[str, Any] | None:
+        with self._lock:
+            entry = self._data.get(session_id)
+            if entry is None:
+                return None
+            touched, state = entry
+            if time.monotonic() - touched > self.ttl_seconds:
+                del self._data[session_id]
+                return None
+            self._data[session_id] = (time.monotonic(), state)
+            self._data.move_to_end(session_id)
+            return state
+
+    def put(self, session_id: str, state: Dict[str, Any]) -> None:
+        with self._lock:
+            self._data[session_id] = (time.monotonic(), state)
+            self._data.move_to_end(session_id)
+            while len(self._data) > self.max_sessions:
+                self._data.popitem(last=False)
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._data.pop(session_id, None)
+
+    def evict_idle(self) -> int:
+        # Entries are kept in last-access order, so expired ones sit at the front.
+        cutoff = time.monotonic() - self.ttl_seconds
+        removed = 0
+        with self._lock:
+            while self._data:
+                session_id, (touched, _) = next(iter(self._data.items()))
+                if touched > cutoff:
+                    break
+                del self._data[session_id]
+                removed += 1
+        return removed
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteSessionStore(SessionStore):
+    """Sessions as JSON rows keyed by id, with an index on last activity."""
+
+    def __init__(self, path: str = SESSION_DB_PATH, ttl_seconds: float = SESSION_TTL_SECONDS):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        conn = self._get_conn()
+        try:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS sessions (
+                    id TEXT PRIMARY KEY,
+                    state TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_sessions_updated_at ON sessions (updated_at)"
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS session_turn_locks (
+                    id TEXT PRIMARY KEY,
+                    owner TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+                """
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _get_conn(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def get(self, session_id: str) -> Dict[str, Any] | None:
+        conn = self._get_conn()
+        try:
+            row = conn.execute(
+                "SELECT state, updated_at FROM sessions WHERE id = ?", (session_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None or time.time() - row[1] > self.ttl_seconds:
+            return None
+        return json.loads(row[0])
+
+    def put(self, session_id: str, state: Dict[str, Any]) -> None:
+        conn = self._get_conn()
+        try:
+            conn.execute(
+                """
+                INSERT INTO sessions (id, state, updated_at) VALUES (?, ?, ?)
+                ON CONFLICT (id) DO UPDATE SET state = excluded.state, updated_at = excluded.updated_at
+                """,
+                (session_id, json.dumps(state), time.time()),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def delete(self, session_id: str) -> None:
+        conn = self._get_conn()
+        try:
+            conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def evict_idle(self) -> int:
+        conn = self._get_conn()
+        try:
+            cur = conn.execute(
+                "DELETE FROM sessions WHERE updated_at < ?", (time.time() - self.ttl_seconds,)
+            )
+            conn.execute("DELETE FROM session_turn_locks WHERE expires_at < ?", (time.time(),))
+            conn.commit()
+            return cur.rowcount
+        finally:
+            conn.close()
+
+    def try_lock_turn(self, session_id: str, owner: str, lease_seconds: float) -> bool:
+        # One upsert: inserts a free lease or takes over an expired one; a live
+        # lease held by someone else leaves the row untouched (rowcount 0).
+        now = time.time()
+        conn = self._get_conn()
+        try:
+            cur = conn.execute(
+                """
+                INSERT INTO session_turn_locks (id, owner, expires_at) VALUES (?, ?, ?)
+                ON CONFLICT (id) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at
+                WHERE session_turn_locks.expires_at < ?
+                """,
+                (session_id, owner, now + lease_seconds, now),
+            )
+            conn.commit()
+            return cur.rowcount == 1
+        finally:
+            conn.close()
+
+    def unlock_turn(self, session_id: str, owner: str) -> None:
+        conn = self._get_conn()
+        try:
+            conn.execute(
+                "DELETE FROM session_turn_locks WHERE id = ? AND owner = ?", (session_id, owner)
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def __len__(self) -> int:
+        conn = self._get_conn()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+        finally:
+            conn.close()
+
+
+def get_session_store() -> SessionStore:
+    """Store selected by SESSION_STORE ("memory" or "sqlite", default "memory")."""
+    if os.getenv("SESSION_STORE", "memory").lower() == "sqlite":
+        return SQLiteSessionStore()
+    return InMemorySessionStore()
@@ -0,0 +1,263 @@
+"""Tolerant parsing of the model's tool-call JSON and schema-based argument coercion.
+
+Small models often wrap the protocol JSON in code fences, add a sentence
+before/after it, leave trailing commas or emit Python literals (None/True,
+single-quoted dicts). Repairing that
+locally is far cheaper than another LLM round trip, so the agent only asks
+the model again when `extract_json` gives up.
+
+Tool arguments are checked against the JSON schema already declared in
+`TOOLS`, compiled once into plain Python closures. Values that can be coerced
+are ("4" -> 4, "4 people" -> 4, "yes" -> True, "veg" -> ["veg"]); values that
+cannot, or that fall below a declared "minimum", are dropped and reported,
+so the tool's own missing-field handling asks the user for them.
+"""
+
+import ast
+import json
+import re
+from typing import Any, Callable, Dict, List, Tuple
+
+from datetime_parser import parse_booking_date
+
+_FENCE_RE = re.compile(r"```(?:json|JSON)?\s*(.*?)```", re.DOTALL)
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+_INT_RE = re.compile(r"-?\d+")
+_NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?")
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+_PY_LITERALS = {"None": "null", "True": "true", "False": "false"}
+
+Validator = Callable[[Dict[str, Any]], Tuple[Dict[str, Any], List[str]]]
+
+
+def _balanced_object(text: str) -> str | None:
+    """Return the first {...} block, closing any brackets left open at the end."""
+    start = text.find("{")
+    if start == -1:
+        return None
+    stack: List[str] = []
+    in_string = escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+        elif ch in "}]":
+            if stack:
+                stack.pop()
+            if not stack:
+                return text[start:i + 1]
+    # Truncated output: close what is still open.
+    return text[start:] + ('"' if in_string else "") + "".join(reversed(stack))
+
+
+def _replace_outside_strings(text: str) -> str:
+    """Swap Python literals for JSON ones, leaving string contents alone."""
+    out = []
+    in_string = escaped = False
+    i = 0
+    while i < len(text):
+        ch = text[i]
+        if in_string:
+            out.append(ch)
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            i += 1
+            continue
+        if ch == '"':
+            in_string = True
+            out.append(ch)
+            i += 1
+            continue
+        for py, js in _PY_LITERALS.items():
+            if text.startswith(py, i) and not (i and (text[i - 1].isalnum() or text[i - 1] == "_")):
+                out.append(js)
+                i += len(py)
+                break
+        else:
+            out.append(ch)
+            i += 1
+    return "".join(out)
+
+
+def extract_json(raw: str) -> Dict[str, Any] | None:
+    """Best-effort parse of a JSON object out of a model reply. None if hopeless."""
+    if not raw:
+        return None
+    try:
+        value = json.loads(raw)
+        return value if isinstance(value, dict) else None
+    except json.JSONDecodeError:
+        pass
+
+    text = raw.translate(_SMART_QUOTES)
+    fenced = _FENCE_RE.search(text)
+    if fenced:
+        text = fenced.group(1)
+    block = _balanced_object(text)
+    if block is None:
+        return None
+    for candidate in (block, _TRAILING_COMMA_RE.sub(r"\1", _replace_outside_strings(block))):
+        try:
+            value = json.loads(candidate)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(value, dict):
+            return value
+    # A Python dict repr ({'tool_call': ...}) is not JSON but is a valid literal.
+    try:
+        value = ast.literal_eval(block)
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        return None
+    return value if isinstance(value, dict) else None
+
+
+def looks_like_tool_call(raw: str) -> bool:
+    """Whether an unparseable reply was trying to follow the JSON protocol."""
+    return "tool_call" in (raw or "") or (raw or "").lstrip().startswith(("{", "```"))
+
+
+def normalize_date(value: str) -> str:
+    """Normalize date phrases ("tomorrow", "Dec 1", "01/12/2025") to YYYY-MM-DD; leave others as-is."""
+    parsed = parse_booking_date(value)
+    return parsed.isoformat() if parsed else value.strip()
+
+
+# -- schema compilation ------------------------------------------------------
+
+class _Invalid(Exception):
+    pass
+
+
+def _coerce_string(value: Any) -> str:
+    if isinstance(value, (dict, list)):
+        raise _Invalid("expected string")
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _coerce_integer(value: Any) -> int:
+    if isinstance(value, bool):
+        raise _Invalid("expected integer")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        match = _INT_RE.search(value.replace(",", ""))
+        if match:
+            return int(match.group())
+    raise _Invalid("expected integer")
+
+
+def _coerce_number(value: Any) -> float:
+    if isinstance(value, bool):
+        raise _Invalid("expected number")
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        match = _NUMBER_RE.search(value.replace(",", ""))
+        if match:
+            return float(match.group())
+    raise _Invalid("expected number")
+
+
+def _coerce_boolean(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return bool(value)
+    if isinstance(value, str) and value.strip().lower() in ("true", "yes", "y", "1"):
+        return True
+    if isinstance(value, str) and value.strip().lower() in ("false", "no", "n", "0"):
+        return False
+    raise _Invalid("expected boolean")
+
+
+def _compile(schema: Dict[str, Any], name: str = "") -> Callable[[Any], Any]:
+    kind = schema.get("type")
+    if kind == "string":
+        enum = schema.get("enum")
+        is_date = name == "date" or schema.get("format") == "date"
+
+        def check(value):
+            text = _coerce_string(value)
+            if is_date:
+                text = normalize_date(text)
+            if enum and text not in enum:
+                lowered = {e.lower(): e for e in enum}
+                if text.lower() not in lowered:
+                    raise _Invalid(f"expected one of {enum}")
+                text = lowered[text.lower()]
+            return text
+        return check
+    if kind in ("integer", "number"):
+        coerce = _coerce_integer if kind == "integer" else _coerce_number
+        minimum = schema.get("minimum")
+        if minimum is None:
+            return coerce
+
+        def check(value):
+            number = coerce(value)
+            if number < minimum:
+                raise _Invalid(f"must be at least {minimum}")
+            return number
+        return check
+    if kind == "boolean":
+        return _coerce_boolean
+    if kind == "array":
+        item = _compile(schema.get("items", {}))
+
+        def check(value):
+            if isinstance(value, str):
+                value = [v for v in (p.strip() for p in value.split(",")) if v]
+            if not isinstance(value, list):
+                value = [value]
+            return [item(v) for v in value]
+        return check
+    if kind == "object":
+        nested = compile_validator(schema)
+        return lambda value: nested(value)[0]
+    return lambda value: value
+
+
+def compile_validator(schema: Dict[str, Any]) -> Validator:
+    """Compile an object schema into fn(args) -> (coerced_args, errors)."""
+    fields = {
+        key: _compile(prop, key) for key, prop in (schema.get("properties") or {}).items()
+    }
+
+    def validate(args: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+        if not isinstance(args, dict):
+            return {}, ["arguments must be an object"]
+        out: Dict[str, Any] = {}
+        errors: List[str] = []
+        for key, value in args.items():
+            check = fields.get(key)
+            if check is None or value is None:
+                out[key] = value
+                continue
+            try:
+                out[key] = check(value)
+            except _Invalid as e:
+                errors.append(f"{key}: {e}")
+        return out, errors
+
+    return validate
+
+
+def compile_tool_validators(tools: Dict[str, Dict[str, Any]]) -> Dict[str, Validator]:
+    return {name: compile_validator(tool.get("schema") or {}) for name, tool in tools.items()}
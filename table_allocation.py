@@ -0,0 +1,342 @@
+"""Table inventory per outlet and a solver that seats large parties.
+
+Outlets only publish a total capacity, so each one gets a default floor plan
+derived from it: sections ("main", "terrace" for outdoor seating, "private"
+for big venues) filled with 2/4/6/8-tops. Tables in the same section are
+adjacent and can be pushed together; a party spread over several sections
+is seated apart.
+
+`allocate_tables` picks tables for one party, preferring (in order) fewer
+sections, fewer empty seats and fewer tables:
+
+- a greedy pass (largest tables first, then shrink the last pick) answers
+  most requests directly;
+- otherwise a branch-and-bound search over (section, table size) groups
+  improves on it, capped at `EXACT_NODE_BUDGET` nodes so latency stays
+  bounded. The result says whether it was proven optimal.
+
+`plan_group` places a party at one outlet or, when no single outlet has
+room, splits it across the nearest neighbouring outlets.
+"""
+
+import math
+import os
+import threading
+from bisect import bisect_left
+from collections import Counter
+from itertools import accumulate
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from restaurant_data import RESTAURANTS_BY_ID
+
+EXACT_NODE_BUDGET = int(os.getenv("TABLE_SOLVER_NODE_BUDGET", "1500"))
+# Outlets this close to each other count as "adjacent" for split bookings.
+SPLIT_RADIUS_KM = float(os.getenv("GROUP_SPLIT_RADIUS_KM", "2.5"))
+
+# Repeating mix of table sizes used to fill a section.
+_TABLE_PATTERN = (4, 2, 4, 6, 2, 4, 8)
+
+Cost = Tuple[int, int, int]  # (sections used, empty seats, tables used)
+
+
+def default_layout(restaurant: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Derive a plausible floor plan from an outlet's capacity."""
+    capacity = restaurant["capacity"]
+    shares = []
+    if restaurant.get("has_outdoor_seating"):
+        shares.append(("terrace", 0.25))
+    if capacity >= 120:
+        shares.append(("private", 0.15))
+    main = capacity - sum(int(capacity * share) for _, share in shares)
+    sections = [("main", main)] + [(name, int(capacity * share)) for name, share in shares]
+
+    tables = []
+    for section, seats in sections:
+        prefix = section[0].upper()
+        sizes: List[int] = []
+        i = 0
+        while seats > 1 or (seats == 1 and not sizes):
+            size = _TABLE_PATTERN[i % len(_TABLE_PATTERN)] if section != "private" else 8
+            sizes.append(min(size, seats))
+            seats -= sizes[-1]
+            i += 1
+        if seats == 1:
+            sizes[-1] += 1  # no single-seat tables: the last one takes an extra chair
+        tables.extend(
+            {"id": f"{prefix}{n}", "section": section, "seats": size}
+            for n, size in enumerate(sizes, start=1)
+        )
+    return tables
+
+
+_LAYOUTS: Dict[str, List[Dict[str, Any]]] = {}
+_LAYOUTS_LOCK = threading.Lock()
+
+
+def get_layout(restaurant_id: str) -> List[Dict[str, Any]]:
+    with _LAYOUTS_LOCK:
+        layout = _LAYOUTS.get(restaurant_id)
+        if layout is None:
+            restaurant = RESTAURANTS_BY_ID.get(restaurant_id)
+            layout = _LAYOUTS[restaurant_id] = default_layout(restaurant) if restaurant else []
+        return layout
+
+
+def free_tables(restaurant_id: str, booked_covers: int = 0) -> List[Dict[str, Any]]:
+    """Tables still free in a slot with `booked_covers` already booked.
+
+    Bookings are not assigned to tables yet, so existing covers are assumed
+    to fill the smallest tables first, which leaves the big tables for groups.
+    """
+    tables = get_layout(restaurant_id)
+    if booked_covers <= 0:
+        return list(tables)
+    taken = set()
+    for table in sorted(tables, key=lambda t: (t["seats"], t["id"])):
+        if booked_covers <= 0:
+            break
+        taken.add(table["id"])
+        booked_covers -= table["seats"]
+    return [t for t in tables if t["id"] not in taken]
+
+
+def _cost(tables: Sequence[Dict[str, Any]], party_size: int) -> Cost:
+    return (
+        len({t["section"] for t in tables}),
+        sum(t["seats"] for t in tables) - party_size,
+        len(tables),
+    )
+
+
+def _greedy(tables: Sequence[Dict[str, Any]], party_size: int) -> List[Dict[str, Any]] | None:
+    """Best single-section greedy fill, else fill whole sections largest-first."""
+    by_section: Dict[str, List[Dict[str, Any]]] = {}
+    for t in tables:
+        by_section.setdefault(t["section"], []).append(t)
+
+    def fill(pool: List[Dict[str, Any]], need: int) -> List[Dict[str, Any]] | None:
+        pool = sorted(pool, key=lambda t: -t["seats"])
+        picked, seats = [], 0
+        for t in pool:
+            if seats >= need:
+                break
+            picked.append(t)
+            seats += t["seats"]
+        if seats < need:
+            return None
+        # Swap the last table for the smallest unused one that still covers.
+        short = need - (seats - picked[-1]["seats"])
+        unused = [t for t in pool if t not in picked and short <= t["seats"] < picked[-1]["seats"]]
+        if unused:
+            picked[-1] = min(unused, key=lambda t: t["seats"])
+        return picked
+
+    best = None
+    for pool in by_section.values():
+        picked = fill(pool, party_size)
+        if picked and (best is None or _cost(picked, party_size) < _cost(best, party_size)):
+            best = picked
+    if best is not None:
+        return best
+
+    picked, need = [], party_size
+    for pool in sorted(by_section.values(), key=lambda p: -sum(t["seats"] for t in p)):
+        part = fill(pool, need)
+        if part is not None:
+            return picked + part
+        picked += pool
+        need -= sum(t["seats"] for t in pool)
+    return None
+
+
+def _exact(
+    tables: Sequence[Dict[str, Any]], party_size: int, incumbent: List[Dict[str, Any]] | None, max_nodes: int
+) -> Tuple[List[Dict[str, Any]] | None, bool]:
+    """Branch and bound over (section, size) groups. Returns (best, proven_optimal)."""
+    groups: Dict[Tuple[str, int], List[Dict[str, Any]]] = {}
+    for t in tables:
+        groups.setdefault((t["section"], t["seats"]), []).append(t)
+    keys = sorted(groups, key=lambda k: (k[0], -k[1]))
+    # From group i onwards: seats still available, the largest table size and
+    # the gcd of the sizes (empty seats are at least the gap to its next multiple).
+    n = len(keys)
+    suffix, suffix_max, suffix_gcd = [0] * (n + 1), [0] * (n + 1), [0] * (n + 1)
+    for i in range(n - 1, -1, -1):
+        size = keys[i][1]
+        suffix[i] = suffix[i + 1] + size * len(groups[keys[i]])
+        suffix_max[i] = max(suffix_max[i + 1], size)
+        suffix_gcd[i] = math.gcd(suffix_gcd[i + 1], size)
+    # Running seat totals of the remaining tables taken largest first: the
+    # fewest tables that can still reach `need` is a bisect away.
+    reach_from = [
+        list(accumulate(sorted((t["seats"] for key in keys[i:] for t in groups[key]), reverse=True)))
+        for i in range(n)
+    ]
+
+    best_cost: Cost | None = _cost(incumbent, party_size) if incumbent else None
+    best_counts: List[int] | None = None
+    counts = [0] * len(keys)
+    nodes = 0
+    exhausted = True
+
+    def search(i: int, seats: int, sections: frozenset, n_tables: int) -> None:
+        nonlocal best_cost, best_counts, nodes, exhausted
+        nodes += 1
+        if nodes > max_nodes:
+            exhausted = False
+            return
+        if seats >= party_size:
+            cost = (len(sections), seats - party_size, n_tables)
+            if best_cost is None or cost < best_cost:
+                best_cost, best_counts = cost, counts[:]
+            return
+        if i == n or seats + suffix[i] < party_size:
+            return
+        if best_cost is not None:
+            need = party_size - seats
+            bound = (
+                max(len(sections), 1),
+                -need % suffix_gcd[i],
+                n_tables + bisect_left(reach_from[i], need) + 1,
+            )
+            if bound >= best_cost:
+                return
+        section, size = keys[i]
+        available = len(groups[keys[i]])
+        most = min(available, -(-(party_size - seats) // size))
+        for take in range(most, -1, -1):
+            counts[i] = take
+            used = sections | {section} if take else sections
+            if best_cost is not None and len(used) > best_cost[0]:
+                continue
+            search(i + 1, seats + take * size, used, n_tables + take)
+            if nodes > max_nodes:
+                break
+        counts[i] = 0
+
+    search(0, 0, frozenset(), 0)
+    if best_counts is None:
+        return incumbent, exhausted
+    picked = [t for key, take in zip(keys, best_counts) for t in groups[key][:take]]
+    return picked, exhausted
+
+
+def allocate_tables(
+    tables: Sequence[Dict[str, Any]], party_size: int, max_nodes: int = EXACT_NODE_BUDGET
+) -> Dict[str, Any] | None:
+    """Choose tables for a party, or None if the tables cannot seat it."""
+    if party_size <= 0 or sum(t["seats"] for t in tables) < party_size:
+        return None
+    picked = _greedy(tables, party_size)
+    method = "greedy"
+    # A single-section greedy fill with no empty seats cannot be beaten.
+    if picked is None or _cost(picked, party_size)[:2] != (1, 0):
+        improved, proven = _exact(tables, party_size, picked, max_nodes)
+        if improved is not None and (picked is None or _cost(improved, party_size) < _cost(picked, party_size)):
+            picked = improved
+            method = "exact" if proven else "bounded"
+        elif proven:
+            method = "exact"
+    if picked is None:
+        return None
+    sections, empty, _ = _cost(picked, party_size)
+    return {
+        "tables": sorted(picked, key=lambda t: (t["section"], -t["seats"], t["id"])),
+        "seats": party_size + empty,
+        "empty_seats": empty,
+        "sections": sections,
+        "method": method,
+    }
+
+
+def _by_section(tables: Iterable[Dict[str, Any]]) -> Dict[str, Dict[int, int]]:
+    """section -> {table size: count}"""
+    counts: Dict[str, Counter] = {}
+    for t in tables:
+        counts.setdefault(t["section"], Counter())[t["seats"]] += 1
+    return {section: dict(sorted(c.items())) for section, c in counts.items()}
+
+
+def _summary(restaurant_id: str, allocation: Dict[str, Any], party: int) -> Dict[str, Any]:
+    restaurant = RESTAURANTS_BY_ID[restaurant_id]
+    return {
+        "restaurant_id": restaurant_id,
+        "name": restaurant["name"],
+        "area": restaurant["area"],
+        "party": party,
+        "seats": allocation["seats"],
+        # "main: 2x8, 1x6" per section; the ids are for the floor staff.
+        "tables": [
+            f"{section}: " + ", ".join(f"{count}x{size}" for size, count in sorted(counts.items(), reverse=True))
+            for section, counts in _by_section(allocation["tables"]).items()
+        ],
+        "table_ids": [t["id"] for t in allocation["tables"]],
+        "method": allocation["method"],
+    }
+
+
+def plan_group(
+    party_size: int,
+    candidates: Iterable[str],
+    booked: Dict[str, int] | None = None,
+    max_outlets: int = 3,
+) -> Dict[str, Any] | None:
+    """Seat a party at the first candidate outlet that fits, else split it.
+
+    `candidates` are outlet ids in order of preference; `booked` maps outlet
+    id -> covers already booked in the slot. A split anchors on a candidate
+    and adds its nearest outlets within SPLIT_RADIUS_KM, largest free
+    capacity first, until the party is seated. None when no plan seats the
+    party (or it is not a positive size).
+    """
+    if party_size <= 0:
+        return None
+    booked = booked or {}
+    candidates = [c for c in candidates if c in RESTAURANTS_BY_ID]
+    for rid in candidates:
+        allocation = allocate_tables(free_tables(rid, booked.get(rid, 0)), party_size)
+        if allocation:
+            return {"split": False, "outlets": [_summary(rid, allocation, party_size)]}
+    if max_outlets < 2:
+        return None
+
+    from geo import get_outlet_index
+
+    index = get_outlet_index()
+    for anchor in candidates:
+        restaurant = RESTAURANTS_BY_ID[anchor]
+        if "lat" not in restaurant:
+            continue
+        nearby = [
+            r["id"] for _, r in index.nearest(
+                restaurant["lat"], restaurant["lon"], k=max_outlets * 3, max_km=SPLIT_RADIUS_KM
+            )
+            if r["id"] != anchor
+        ]
+        free = {rid: free_tables(rid, booked.get(rid, 0)) for rid in [anchor] + nearby}
+        seats = {rid: sum(t["seats"] for t in tables) for rid, tables in free.items()}
+        order = [anchor] + sorted(nearby, key=lambda rid: -seats[rid])
+        chosen = order[:max_outlets]
+        if sum(seats[rid] for rid in chosen) < party_size:
+            continue
+        outlets, remaining = [], party_size
+        for n, rid in enumerate(chosen):
+            if remaining <= 0:
+                break
+            last = n == len(chosen) - 1 or sum(seats[r] for r in chosen[n + 1:]) == 0
+            # Fill this outlet completely unless the rest fits here.
+            share = remaining if seats[rid] >= remaining or last else seats[rid]
+            allocation = allocate_tables(free[rid], share)
+            if allocation is None:
+                break
+            outlets.append(_summary(rid, allocation, share))
+            remaining -= share
+        if remaining <= 0:
+            return {"split": True, "outlets": outlets}
+    return None
+
+
+def describe_layout(restaurant_id: str) -> Dict[str, Dict[int, int]]:
+    """Table counts by size per section (for the UI / debugging)."""
+    return _by_section(get_layout(restaurant_id))
+
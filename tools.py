@@ -1,14 +1,52 @@
 # tools.py
 from typing import Dict, Any, List
 from datetime import datetime
-import difflib
-from restaurant_data import search_restaurants, RESTAURANTS, AREAS
-from reservation_db import save_reservation, mark_cancelled, list_reservations_by_phone
-
-RESERVATIONS: Dict[str, Dict] = {}  # key = reservation_id
+from restaurant_data import search_restaurants, RESTAURANTS, RESTAURANTS_BY_ID, AREAS
+from reservation_db import (
+    SlotFullError,
+    booking_key,
+    create_reservation,
+    get_reservation,
+    get_slot_covers,
+    join_waitlist,
+    leave_waitlist,
+    list_reservations_by_phone,
+    mark_cancelled,
+    slot_free_covers,
+    slot_key,
+)
+from datetime_parser import (
+    local_now,
+    needs_meridiem,
+    normalize_booking_datetime,
+    parse_booking_datetime,
+    to_canonical,
+)
+from demand_forecast import get_demand_table
+from geo import get_outlet_index, resolve_place
+from table_allocation import plan_group
+
+RESERVATIONS: Dict[str, Dict] = {}  # key = reservation_id; cache of this process's bookings, the DB is authoritative
+
+# Set only from the HTTP Idempotency-Key header (scoped per phone by
+# api_server), never from model- or body-supplied arguments.
+IDEMPOTENCY_ARG = "idempotency_key"
+
+# Tools that create or cancel bookings; callers use this to invalidate caches.
+WRITE_TOOLS = {
+    "create_reservation",
+    "cancel_reservation",
+    "smart_book",
+    "book_restaurant",
+    "book_table",
+    "make_reservation",
+    "cancel_booking",
+    "join_waitlist",
+    "leave_waitlist",
+}
 
-def generate_reservation_id() -> str:
-    return f"RES-{len(RESERVATIONS) + 1:06d}"
+# Every area an outlet is in (AREAS lists only the original ten).
+AREAS_ALL = sorted({r["area"] for r in RESTAURANTS})
 
 def tool_search_restaurants(args: Dict[str, Any]) -> Dict[str, Any]:
     results = search_restaurants(
@@ -17,83 +55,351 @@ def tool_search_restaurants(args: Dict[str, Any]) -> Dict[str, Any]:
         min_capacity=args.get("min_capacity"),
         max_cost=args.get("max_cost"),
     )
+    area = args.get("area")
+    if not results and area and area.lower() not in {a.lower() for a in AREAS_ALL}:
+        # Not an outlet area ("near Domlur", "Manyata Tech Park"): try it as a place.
+        nearby = tool_find_nearby({
+            "place": area,
+            "cuisine": args.get("cuisine"),
+            "party_size": args.get("min_capacity"),
+            "max_cost": args.get("max_cost"),
+        })
+        if "restaurants" in nearby:
+            return nearby
     return {"restaurants": results}
 
-def tool_create_reservation(args: Dict[str, Any]) -> Dict[str, Any]:
-    # In real system, would check slot availability per time.
+DEFAULT_NEARBY = 5
+MAX_NEARBY = 20
+
+def _booked_covers(when: str | None) -> Dict[str, int]:
+    """Outlet id -> covers already booked in the hourly slot of `when` (empty without a time)."""
+    if not when:
+        return {}
+    slot = slot_key(when)
+    return {row["restaurant_id"]: row["covers"] for row in get_slot_covers(slot[:10]) if row["slot"] == slot}
+
+def _datetime_error(value: Any) -> Dict[str, Any]:
+    """invalid_fields reply for a date/time that did not parse."""
+    if needs_meridiem(str(value)):
+        # "7:30" could be breakfast or dinner; asking beats booking 7:30 AM.
+        return {"error": "Is that time AM or PM? Please confirm, e.g. '7:30 PM'.", "invalid_fields": ["datetime"]}
+    return {
+        "error": "Could not understand the date/time. Please give a date and a time, e.g. 'Dec 1, 8 PM'.",
+        "invalid_fields": ["datetime"],
+    }
+
+def tool_find_nearby(args: Dict[str, Any]) -> Dict[str, Any]:
+    """Nearest outlets to a locality/landmark (or lat/lon) that can seat the party.
+
+    With a datetime, "space" means free covers in that hourly slot; otherwise
+    the outlet's total capacity.
+    """
+    place = None
+    if args.get("lat") is not None and args.get("lon") is not None:
+        place = {"name": "your location", "lat": float(args["lat"]), "lon": float(args["lon"])}
+    elif args.get("place"):
+        place = resolve_place(str(args["place"]))
+        if place is None:
+            return {
+                "error": f"Could not find '{args['place']}' in Bangalore. Ask for a nearby area or landmark.",
+                "invalid_fields": ["place"],
+            }
+    else:
+        return {"error": "Need a place (area or landmark) to search near.", "missing_fields": ["place"]}
+
+    party_size = int(args.get("party_size") or 0)
+    cuisine = (args.get("cuisine") or "").lower()
+    max_cost = args.get("max_cost")
+    limit = max(1, min(int(args.get("limit") or DEFAULT_NEARBY), MAX_NEARBY))
+
+    when = None
+    if args.get("datetime"):
+        when = normalize_booking_datetime(str(args["datetime"]))
+        if when is None:
+            # Ranking by total capacity would look like availability for that slot.
+            return _datetime_error(args["datetime"])
+    booked = _booked_covers(when)
+
+    def fits(r: Dict[str, Any]) -> bool:
+        if cuisine and cuisine not in (c.lower() for c in r["cuisine"]):
+            return False
+        if max_cost and r["avg_cost_per_person"] > max_cost:
+            return False
+        return r["capacity"] - booked.get(r["id"], 0) >= party_size
+
+    hits = get_outlet_index().nearest(
+        place["lat"], place["lon"], k=limit, predicate=fits, max_km=args.get("max_km")
+    )
+    return {
+        "near": place["name"],
+        "restaurants": [{**r, "distance_km": d} for d, r in hits],
+    }
+
+GROUP_CANDIDATES = 10
+
+def tool_plan_group_booking(args: Dict[str, Any]) -> Dict[str, Any]:
+    """Pick tables for a large party at one outlet, or split it across nearby outlets.
+
+    Only plans: each outlet in the plan is then booked with create_reservation
+    for its share of the party.
+    """
+    if args.get("party_size") in (None, ""):
+        return {"error": "Need the party size.", "missing_fields": ["party_size"]}
+    party_size = _party_size(args["party_size"])
+    if party_size is None:
+        return {"error": "Party size must be a whole number of at least 1.", "invalid_fields": ["party_size"]}
+    when = None
+    if args.get("datetime"):
+        when = normalize_booking_datetime(str(args["datetime"]))
+        if when is None:
+            return _datetime_error(args["datetime"])
+
+    cuisine = (args.get("cuisine") or "").lower()
+    matches = lambda r: not cuisine or cuisine in (c.lower() for c in r["cuisine"])  # noqa: E731
+    place = args.get("place") or args.get("area")
+    if args.get("restaurant_id"):
+        if args["restaurant_id"] not in RESTAURANTS_BY_ID:
+            return {"error": f"Restaurant with id {args['restaurant_id']} not found"}
+        candidates = [args["restaurant_id"]]
+    elif place:
+        near = resolve_place(str(place))
+        if near is None:
+            return {
+                "error": f"Could not find '{place}' in Bangalore. Ask for a nearby area or landmark.",
+                "invalid_fields": ["place"],
+            }
+        hits = get_outlet_index().nearest(near["lat"], near["lon"], k=GROUP_CANDIDATES, predicate=matches)
+        candidates = [r["id"] for _, r in hits]
+    else:
+        candidates = [r["id"] for r in sorted(RESTAURANTS, key=lambda r: -r["capacity"]) if matches(r)]
+
+    max_outlets = max(1, min(int(args.get("max_outlets") or 3), 5))
+    plan = plan_group(party_size, candidates, booked=_booked_covers(when), max_outlets=max_outlets)
+    if plan is None:
+        return {
+            "error": f"No outlet (or group of up to {max_outlets} neighbouring outlets) has tables for {party_size} at that time.",
+            "party_size": party_size,
+        }
+    return {"party_size": party_size, "datetime": when, **plan}
+
+# Fields returned to the caller for a created (or replayed) reservation.
+_RESERVATION_RECORD_FIELDS = (
+    "id", "restaurant_id", "name", "phone", "party_size", "datetime",
+    "special_requests", "created_at",
+)
+
+def _party_size(value: Any) -> int | None:
+    """Party size as a positive int, or None if it is not one."""
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return None
+    return size if size >= 1 else None
+
+def _booking_args(args: Dict[str, Any], what: str) -> tuple[Dict[str, Any] | None, int, str]:
+    """Check the fields shared by bookings and waitlist entries.
+
+    Returns (error, party_size, canonical datetime); error is None when the
+    request is usable.
+    """
     required = ["restaurant_id", "name", "phone", "party_size", "datetime"]
     missing = [k for k in required if k not in args or args[k] in (None, "")]
     if missing:
+        return {"error": f"Missing required fields for {what}.", "missing_fields": missing}, 0, ""
+    party_size = _party_size(args["party_size"])
+    if party_size is None:
+        return {"error": "Party size must be a whole number of at least 1.", "invalid_fields": ["party_size"]}, 0, ""
+    if args["restaurant_id"] not in RESTAURANTS_BY_ID:
         return {
-            "error": "Missing required fields for reservation.",
-            "missing_fields": missing,
+            "error": f"Restaurant with id {args['restaurant_id']} not found",
+            "invalid_fields": ["restaurant_id"],
+        }, 0, ""
+    # Store one canonical ISO timestamp regardless of how the time was phrased.
+    when = normalize_booking_datetime(str(args["datetime"]))
+    if when is None:
+        return _datetime_error(args["datetime"]), 0, ""
+    # Canonical values share one offset, so string order is time order.
+    if when <= to_canonical(local_now()):
+        return {"error": "That date/time has already passed. Ask for a time in the future.",
+                "invalid_fields": ["datetime"]}, 0, ""
+    return None, party_size, when
+
+def tool_create_reservation(args: Dict[str, Any]) -> Dict[str, Any]:
+    error, party_size, when = _booking_args(args, "reservation")
+    if error:
+        return error
+
+    # Retries of the same booking (a resent "book it", a Streamlit rerun, an
+    # API client retry) carry the same key and get the existing reservation
+    # back instead of a second one. API clients may send their own key.
+    key = args.get(IDEMPOTENCY_ARG) or booking_key(args["phone"], args["restaurant_id"], when)
+    try:
+        row, created = create_reservation({
+            "restaurant_id": args["restaurant_id"],
+            "name": args["name"],
+            "phone": args["phone"],
+            "party_size": party_size,
+            "datetime": when,
+            "special_requests": args.get("special_requests", ""),
+            "created_at": datetime.utcnow().isoformat(),
+            "idempotency_key": key,
+        })
+    except SlotFullError as e:
+        return {
+            "error": "This outlet is fully booked for that time. Offer another time or outlet, or the waitlist.",
+            "slot_full": True,
+            "free_covers": e.free_covers,
+            "restaurant_id": args["restaurant_id"],
+            "datetime": when,
         }
+    record = {k: row[k] for k in _RESERVATION_RECORD_FIELDS}
+
+    # In-memory store for fast access
+    RESERVATIONS[record["id"]] = {**record}
+    if not created:
+        return {**record, "already_booked": True}
+    return RESERVATIONS[record["id"]]
 
-    reservation_id = generate_reservation_id()
-    record = {
-        "id": reservation_id,
+def tool_cancel_reservation(args: Dict[str, Any]) -> Dict[str, Any]:
+    rid = args.get("reservation_id")
+    # Look the booking up in SQLite: waitlist promotions, other workers and
+    # earlier runs create bookings this process never cached.
+    row = get_reservation(rid) if rid else None
+    if row is None:
+        return {"success": False, "error": "Reservation ID not found"}
+    if row["status"] != "active":
+        RESERVATIONS.pop(rid, None)
+        return {"success": False, "error": f"Reservation is already {row['status'].replace('_', ' ')}."}
+
+    cancelled_at = datetime.utcnow().isoformat()
+    # Freed covers go to the slot's waitlist.
+    promoted = mark_cancelled(rid, cancelled_at)
+    RESERVATIONS.pop(rid, None)
+
+    res = {k: row[k] for k in _RESERVATION_RECORD_FIELDS}
+    res["status"] = "cancelled"
+    res["cancelled_at"] = cancelled_at
+    result = {"success": True, "reservation": res}
+    if promoted:
+        # Only counts: the other parties' details are not this user's business.
+        result["waitlist_promoted"] = len(promoted)
+    return result
+
+def tool_join_waitlist(args: Dict[str, Any]) -> Dict[str, Any]:
+    """Queue a party for a fully booked outlet/time; promoted automatically on a cancellation."""
+    error, party_size, when = _booking_args(args, "the waitlist")
+    if error:
+        return error
+    free = slot_free_covers(args["restaurant_id"], when)
+    if free is not None and free >= party_size:
+        return {
+            "error": "That time still has space, so no waitlist is needed. Book it directly.",
+            "slot_available": True,
+            "free_covers": free,
+        }
+    entry, created = join_waitlist({
         "restaurant_id": args["restaurant_id"],
         "name": args["name"],
         "phone": args["phone"],
-        "party_size": args["party_size"],
-        "datetime": args["datetime"],
+        "party_size": party_size,
+        "datetime": when,
         "special_requests": args.get("special_requests", ""),
-        "created_at": datetime.utcnow().isoformat(),
-    }
-
-    # In-memory store for fast access
-    RESERVATIONS[reservation_id] = {**record}
-
-    # Persist to SQLite
-    save_reservation({
-        **record,
-        "status": "active",
-        "cancelled_at": None,
+        "joined_at": datetime.utcnow().isoformat(),
     })
+    return {
+        "waitlist_id": entry["id"],
+        "restaurant_id": entry["restaurant_id"],
+        "datetime": entry["datetime"],
+        "party_size": entry["party_size"],
+        "position": entry["position"],
+        "already_waiting": not created,
+    }
 
-    return RESERVATIONS[reservation_id]
-
-def tool_cancel_reservation(args: Dict[str, Any]) -> Dict[str, Any]:
-    rid = args.get("reservation_id")
-    if rid in RESERVATIONS:
-        res = RESERVATIONS.pop(rid)
-        res["status"] = "cancelled"
-
-        cancelled_at = datetime.utcnow().isoformat()
-        # Update DB record if present
-        mark_cancelled(rid, cancelled_at)
-
-        res["cancelled_at"] = cancelled_at
-        return {"success": True, "reservation": res}
-
-    return {"success": False, "error": "Reservation ID not found"}
+def tool_leave_waitlist(args: Dict[str, Any]) -> Dict[str, Any]:
+    waitlist_id, phone = args.get("waitlist_id"), args.get("phone")
+    if waitlist_id in (None, "") or not phone:
+        return {"error": "Need the waitlist id and phone number.", "missing_fields": [
+            k for k in ("waitlist_id", "phone") if args.get(k) in (None, "")
+        ]}
+    if leave_waitlist(int(waitlist_id), phone):
+        return {"success": True, "waitlist_id": int(waitlist_id)}
+    return {"success": False, "error": "No waiting entry with that id for this phone number"}
+
+# Fields of a reservation row the model actually needs to talk about it.
+_RESERVATION_SUMMARY_FIELDS = ("id", "restaurant_id", "datetime", "party_size", "status")
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 50
+
+def _summarize_reservation(row: Dict[str, Any]) -> Dict[str, Any]:
+    summary = {k: row.get(k) for k in _RESERVATION_SUMMARY_FIELDS}
+    restaurant = RESTAURANTS_BY_ID.get(row["restaurant_id"])
+    if restaurant:
+        summary["outlet"] = restaurant["name"]
+    return summary
 
 def tool_list_reservations(args: Dict[str, Any]) -> Dict[str, Any]:
+    """List a phone number's reservations one page at a time.
+
+    Defaults to upcoming active bookings; pass include_past / status="all" for
+    history. Returns a compact projection plus next_cursor for the next page.
+    """
     phone = args.get("phone")
     if not phone:
-        return {"reservations": []}
-
-    # Load from persistent DB first
-    db_rows = list_reservations_by_phone(phone)
-
-    # Also include any in-memory reservations from this session that might not yet
-    # have been flushed or that were created before DB persistence was added.
-    mem_rows = [r for r in RESERVATIONS.values() if r["phone"] == phone]
-
-    # Merge, preferring in-memory entries for the same id
-    by_id = {r["id"]: r for r in db_rows}
-    for r in mem_rows:
-        by_id[r["id"]] = r
+        return {"reservations": [], "next_cursor": None}
+
+    status = args.get("status") or "active"
+    if status == "all":
+        status = None
+    date_from = args.get("date_from")
+    if not date_from and not args.get("include_past"):
+        date_from = local_now().strftime("%Y-%m-%d")
+    try:
+        limit = int(args.get("limit") or DEFAULT_PAGE_SIZE)
+    except (TypeError, ValueError):
+        limit = DEFAULT_PAGE_SIZE
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    after = None
+    cursor = args.get("cursor")
+    if cursor and "|" in cursor:
+        dt, rid = cursor.rsplit("|", 1)
+        after = (dt, rid)
+
+    # Every reservation is written through to SQLite when created, so the DB
+    # is the single source for listing. Fetch one extra row to detect more pages.
+    rows = list_reservations_by_phone(
+        phone,
+        status=status,
+        date_from=date_from,
+        date_to=args.get("date_to"),
+        after=after,
+        limit=limit + 1,
+    )
+    page = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = page[-1]
+        next_cursor = f"{last['datetime']}|{last['id']}"
 
-    return {"reservations": list(by_id.values())}
+    return {
+        "reservations": [_summarize_reservation(r) for r in page],
+        "next_cursor": next_cursor,
+    }
 
 def tool_recommend_restaurants(args: Dict[str, Any]) -> Dict[str, Any]:
-    """Recommend restaurants ranked by fit for party size, budget, area, and tags."""
+    """Recommend restaurants ranked by fit for party size, budget, area, and tags.
+
+    With prefer_quiet, outlets (and, given a datetime, slots) that are
+    usually under-booked rank higher, using the precomputed demand curves.
+    """
     area = args.get("area")
     cuisine = args.get("cuisine")
     party_size = args.get("party_size")
     max_cost = args.get("max_cost")
     desired_tags: List[str] = args.get("tags") or []
+    demand = get_demand_table() if args.get("prefer_quiet") else None
+    parsed = parse_booking_datetime(str(args["datetime"])) if demand and args.get("datetime") else None
+    when = parsed.replace(tzinfo=None) if parsed else None
 
     # Start from the same filtered set as search_restaurants
     candidates = search_restaurants(
@@ -117,14 +423,39 @@ def tool_recommend_restaurants(args: Dict[str, Any]) -> Dict[str, Any]:
             excess = r["capacity"] - party_size
             if excess >= 0:
                 s += 2.0 - min(excess / 50.0, 2.0)  # smaller excess is better
+        # Steer towards outlets/slots that are usually under-booked
+        if demand:
+            busy = busy_by_id.get(r["id"])
+            if busy is not None:
+                s += 3.0 * (1.0 - busy)
         return s
 
-    ranked = sorted(candidates, key=score, reverse=True)
-    return {"restaurants": ranked[:10]}
+    busy_by_id: Dict[str, float] = {}
+    if demand:
+        for r in candidates:
+            busy = demand.slot_utilization(r["id"], when) if when else demand.outlet_utilization(r["id"])
+            if busy is not None:
+                busy_by_id[r["id"]] = busy
+
+    ranked = sorted(candidates, key=score, reverse=True)[:10]
+    if demand:
+        ranked = [_with_demand(r, busy_by_id.get(r["id"]), demand, when) for r in ranked]
+    return {"restaurants": ranked}
+
+def _with_demand(r: Dict[str, Any], busy: float | None, demand, when: datetime | None) -> Dict[str, Any]:
+    if busy is None:
+        return r
+    out = {**r, "expected_busy_pct": round(100 * busy)}
+    if when:
+        quieter = demand.quieter_hours(r["id"], when)
+        if quieter:
+            out["quieter_times"] = [f"{h:02d}:00" for h in quieter]
+    return out
 
 def _fuzzy_match(query: str, choices: List[str], cutoff: float = 0.6) -> str | None:
     if not query:
         return None
+    import difflib  # only needed for typo correction; keeps cold imports light
     matches = difflib.get_close_matches(query.lower(), [c.lower() for c in choices], n=1, cutoff=cutoff)
     if not matches:
         return None
@@ -159,6 +490,9 @@ def tool_smart_book(args: Dict[str, Any]) -> Dict[str, Any]:
         time_str = args.get("time")
         if date and time_str:
             dt = f"{date} {time_str}"
+    # An unparseable date/time counts as missing so the user is asked again.
+    if dt and normalize_booking_datetime(str(dt)) is None:
+        dt = None
 
     normalized_area = None
     candidates: List[Dict[str, Any]] = []
@@ -182,6 +516,15 @@ def tool_smart_book(args: Dict[str, Any]) -> Dict[str, Any]:
             max_cost=max_cost,
         )
 
+        if not candidates and area and not normalized_area:
+            # "near Domlur" / a landmark: nearest outlets with room for the party
+            nearby = tool_find_nearby({
+                "place": area, "cuisine": cuisine, "party_size": party_size, "max_cost": max_cost,
+            })
+            if nearby.get("restaurants"):
+                normalized_area = f"near {nearby['near']}"
+                candidates = nearby["restaurants"]
+
         if not candidates:
             return {
                 "error": "No restaurants match your criteria.",
@@ -224,6 +567,7 @@ def tool_smart_book(args: Dict[str, Any]) -> Dict[str, Any]:
         "party_size": party_size,
         "datetime": dt,
         "special_requests": args.get("special_requests", ""),
+        IDEMPOTENCY_ARG: args.get(IDEMPOTENCY_ARG),
     }
     reservation = tool_create_reservation(create_args)
     return {
@@ -247,6 +591,39 @@ TOOLS = {
         },
         "fn": tool_search_restaurants
     },
+    "find_nearby": {
+        "description": "Find the nearest outlets to a Bangalore locality or landmark (e.g. 'Domlur', 'Manyata Tech Park') with space for the party",
+        "schema": {
+            "type": "object",
+            "properties": {
+                "place": {"type": "string"},
+                "party_size": {"type": "integer", "minimum": 1},
+                "datetime": {"type": "string"},
+                "cuisine": {"type": "string"},
+                "max_cost": {"type": "integer"},
+                "max_km": {"type": "number"},
+                "limit": {"type": "integer"},
+            },
+            "required": ["place"]
+        },
+        "fn": tool_find_nearby
+    },
+    "plan_group_booking": {
+        "description": "Plan seating for a large group or corporate booking: picks tables at one outlet, or splits the party across neighbouring outlets when none can seat it alone",
+        "schema": {
+            "type": "object",
+            "properties": {
+                "party_size": {"type": "integer", "minimum": 1},
+                "datetime": {"type": "string"},
+                "restaurant_id": {"type": "string"},
+                "place": {"type": "string"},
+                "cuisine": {"type": "string"},
+                "max_outlets": {"type": "integer"},
+            },
+            "required": ["party_size"]
+        },
+        "fn": tool_plan_group_booking
+    },
     "create_reservation": {
         "description": "Create a reservation",
         "schema": {
@@ -255,7 +632,7 @@ TOOLS = {
                 "restaurant_id": {"type": "string"},
                 "name": {"type": "string"},
                 "phone": {"type": "string"},
-                "party_size": {"type": "integer"},
+                "party_size": {"type": "integer", "minimum": 1},
                 "datetime": {"type": "string"},
                 "special_requests": {"type": "string"},
             },
@@ -274,12 +651,46 @@ TOOLS = {
         },
         "fn": tool_cancel_reservation
     },
+    "join_waitlist": {
+        "description": "Join the waitlist for a fully booked outlet and time; the party is booked automatically if space frees up",
+        "schema": {
+            "type": "object",
+            "properties": {
+                "restaurant_id": {"type": "string"},
+                "name": {"type": "string"},
+                "phone": {"type": "string"},
+                "party_size": {"type": "integer", "minimum": 1},
+                "datetime": {"type": "string"},
+                "special_requests": {"type": "string"},
+            },
+            "required": ["restaurant_id", "name", "phone", "party_size", "datetime"]
+        },
+        "fn": tool_join_waitlist
+    },
+    "leave_waitlist": {
+        "description": "Leave a waitlist",
+        "schema": {
+            "type": "object",
+            "properties": {
+                "waitlist_id": {"type": "integer"},
+                "phone": {"type": "string"},
+            },
+            "required": ["waitlist_id", "phone"]
+        },
+        "fn": tool_leave_waitlist
+    },
     "list_reservations": {
-        "description": "List reservations by phone number",
+        "description": "List reservations by phone number (upcoming active ones by default, paginated via next_cursor)",
         "schema": {
             "type": "object",
             "properties": {
-                "phone": {"type": "string"}
+                "phone": {"type": "string"},
+                "status": {"type": "string", "enum": ["active", "cancelled", "seated", "no_show", "all"]},
+                "include_past": {"type": "boolean"},
+                "date_from": {"type": "string", "format": "date"},
+                "date_to": {"type": "string", "format": "date"},
+                "cursor": {"type": "string"},
+                "limit": {"type": "integer"}
             },
             "required": ["phone"]
         },
@@ -292,12 +703,14 @@ TOOLS = {
             "properties": {
                 "area": {"type": "string"},
                 "cuisine": {"type": "string"},
-                "party_size": {"type": "integer"},
+                "party_size": {"type": "integer", "minimum": 1},
                 "max_cost": {"type": "integer"},
                 "tags": {
                     "type": "array",
                     "items": {"type": "string"}
                 },
+                "prefer_quiet": {"type": "boolean"},
+                "datetime": {"type": "string"},
             },
             "required": []
         },
@@ -312,7 +725,7 @@ TOOLS = {
                 "restaurant_name": {"type": "string"},
                 "restaurant_id": {"type": "string"},
                 "cuisine": {"type": "string"},
-                "party_size": {"type": "integer"},
+                "party_size": {"type": "integer", "minimum": 1},
                 "max_cost": {"type": "integer"},
                 "name": {"type": "string"},
                 "phone": {"type": "string"},
@@ -349,7 +762,7 @@ TOOLS.update({
                 "restaurant_id": {"type": "string"},
                 "name": {"type": "string"},
                 "phone": {"type": "string"},
-                "party_size": {"type": "integer"},
+                "party_size": {"type": "integer", "minimum": 1},
                 "datetime": {"type": "string"},
                 "special_requests": {"type": "string"}
             },
@@ -365,7 +778,7 @@ TOOLS.update({
                 "restaurant_id": {"type": "string"},
                 "name": {"type": "string"},
                 "phone": {"type": "string"},
-                "party_size": {"type": "integer"},
+                "party_size": {"type": "integer", "minimum": 1},
                 "datetime": {"type": "string"},
                 "special_requests": {"type": "string"}
             },
@@ -381,7 +794,7 @@ TOOLS.update({
                 "restaurant_id": {"type": "string"},
                 "name": {"type": "string"},
                 "phone": {"type": "string"},
-                "party_size": {"type": "integer"},
+                "party_size": {"type": "integer", "minimum": 1},
                 "datetime": {"type": "string"},
                 "special_requests": {"type": "string"}
             },
@@ -0,0 +1,287 @@
+"""Record agent turns to a JSONL corpus for offline replay (see turn_replay.py).
+
+Set AGENT_RECORD_PATH=turns.jsonl and every `run_agent` turn appends one line:
+
+    {"v": 1, "at": ..., "session": ..., "prompt_sha": ...,
+     "user": ..., "history": [...],
+     "llm_calls": [{"task", "prompt_tokens", "ms", "response"}],   # response holds the tool_call JSON
+     "tool": {"name", "arguments", "argument_errors", "result", "ms"} | null,
+     "assistant_message": ..., "total_ms": ...}
+
+The system prompt is stored only as a hash (`prompt_sha`) so builds with
+different prompts can be told apart.
+
+PII is pseudonymised before anything is written. Phone numbers, emails
+and guest names are replaced with stable fake values of the same shape.
+Names are learned from tool arguments/results, from the session's collected
+booking details and from phrases such as "my name is ..." or "under ...".
+A session's turns are held back until its first tool call (or HOLD_TURNS
+turns), so a name given before the booking call is known when the earlier
+turns are written.
+
+The same person maps to the same fake in every process writing to the
+corpus, so replayed tool calls still validate and still find each other's
+bookings. Fakes are keyed with AGENT_RECORD_SALT, or else with a salt
+generated once and kept next to the corpus (<corpus>.salt, owner-only).
+Keep that file out of shared copies of the corpus.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List
+
+from result_compactor import estimate_tokens
+
+RECORD_PATH = os.getenv("AGENT_RECORD_PATH")
+RECORD_VERSION = 1
+
+# Turns of a session without a tool call yet are held back, at most this many.
+HOLD_TURNS = 20
+# Sessions tracked for holding; the oldest are flushed beyond this.
+MAX_TRACKED_SESSIONS = 10_000
+
+_PHONE_RE = re.compile(r"(?<![\w-])(?:\+?91[\s-]?)?[6-9]\d{4}[\s-]?\d{5}(?!\d)")
+_EMAIL_RE = re.compile(r"\b[\w.+-]+@[\w-]+(?:\.[\w-]+)+\b")
+# Unambiguous lead-ins match in any case; "this is"/"I am" only before a capitalized name.
+_SELF_NAME_RE = re.compile(
+    r"\b(?:my name is|my name's|name is|name's|under(?: the name)?(?: of)?|in the name of|booked as)"
+    r"\s+([a-z]+(?:\s+[a-z]+)?)",
+    re.IGNORECASE,
+)
+_INTRO_NAME_RE = re.compile(r"\b(?:[Tt]his is|I am|I'm)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)")
+_NOT_NAMES = {
+    "a", "an", "and", "at", "by", "for", "from", "here", "in", "is", "on", "please", "pls", "the",
+    "thanks", "thank", "to", "with", "table", "booking", "reservation", "today", "tonight", "tomorrow",
+    "people", "guests", "pax", "budget", "goodfoods",
+}
+
+
+def prompt_tokens(messages: List[Dict[str, Any]]) -> int:
+    """Estimated prompt size of a message list (same estimate as result_compactor)."""
+    return sum(estimate_tokens(str(m.get("content", ""))) for m in messages)
+
+
+class Redactor:
+    """Replaces phones, emails and known guest names with stable fakes.
+
+    Fakes are keyed with `salt` (default AGENT_RECORD_SALT); without either
+    they are random per instance, which only suits throwaway redaction.
+    """
+
+    def __init__(self, salt: str | None = None):
+        self._salt = (salt or os.getenv("AGENT_RECORD_SALT") or os.urandom(16).hex()).encode("utf-8")
+        self._names: Dict[str, str] = {}  # lowercased real name -> fake
+        self._name_re: re.Pattern | None = None
+
+    def _digest(self, kind: str, value: str) -> str:
+        return hashlib.sha256(self._salt + f"{kind}:{value}".encode("utf-8")).hexdigest()
+
+    def fake_phone(self, phone: str) -> str:
+        digits = re.sub(r"\D", "", str(phone))[-10:]
+        return "9" + str(int(self._digest("phone", digits), 16))[-9:]
+
+    def fake_name(self, name: str) -> str:
+        return "Guest " + self._digest("name", name.strip().lower())[:4].upper()
+
+    def learn_name(self, name: Any) -> None:
+        if not isinstance(name, str) or len(name.strip()) < 2 or name.startswith("Guest "):
+            return
+        key = " ".join(name.lower().split())
+        if key in self._names:
+            return
+        self._names[key] = self.fake_name(key)
+        # Guests are often addressed by first name alone ("Enjoy, Priya!").
+        first = key.split()[0]
+        if first != key and len(first) > 2 and first not in _NOT_NAMES:
+            self._names.setdefault(first, self._names[key])
+        # Longest first so "Priya Sharma" wins over "Priya".
+        names = sorted(self._names, key=len, reverse=True)
+        self._name_re = re.compile(r"\b(" + "|".join(map(re.escape, names)) + r")\b", re.IGNORECASE)
+
+    def learn_phrase(self, phrase: str) -> None:
+        words = []
+        for word in phrase.split():
+            if word.lower() in _NOT_NAMES:
+                break
+            words.append(word)
+        if words:
+            self.learn_name(" ".join(words))
+
+    def learn(self, value: Any) -> None:
+        """Collect guest names from tool arguments/results, booking slots and self-introductions."""
+        if isinstance(value, dict):
+            if "name" in value and ("phone" in value or "party_size" in value):
+                self.learn_name(value["name"])
+            for v in value.values():
+                self.learn(v)
+        elif isinstance(value, list):
+            for v in value:
+                self.learn(v)
+        elif isinstance(value, str):
+            for phrase in _SELF_NAME_RE.findall(value) + _INTRO_NAME_RE.findall(value):
+                self.learn_phrase(phrase)
+            # Embedded JSON: tool_call replies and the session's "Booking
+            # details collected so far: {...}" slots message.
+            start = value.find("{")
+            if start != -1:
+                try:
+                    self.learn(json.loads(value[start:]))
+                except ValueError:
+                    pass
+
+    def text(self, value: str) -> str:
+        value = _PHONE_RE.sub(lambda m: self.fake_phone(m.group(0)), value)
+        value = _EMAIL_RE.sub(lambda m: self._digest("email", m.group(0).lower())[:10] + "@example.com", value)
+        if self._name_re is not None:
+            value = self._name_re.sub(lambda m: self._names[m.group(0).lower()], value)
+        return value
+
+    def redact(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            out = {}
+            for k, v in value.items():
+                if k == "phone" and v not in (None, ""):
+                    out[k] = self.fake_phone(v)
+                else:
+                    out[k] = self.redact(v)
+            return out
+        if isinstance(value, list):
+            return [self.redact(v) for v in value]
+        if isinstance(value, str):
+            return self.text(value)
+        return value
+
+
+def corpus_salt(path: str) -> str:
+    """AGENT_RECORD_SALT, else the salt stored next to the corpus (created on first use)."""
+    salt = os.getenv("AGENT_RECORD_SALT")
+    if salt:
+        return salt
+    salt_path = path + ".salt"
+    try:
+        fd = os.open(salt_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        with open(salt_path, encoding="utf-8") as f:
+            return f.read().strip()
+    salt = os.urandom(16).hex()
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(salt)
+    return salt
+
+
+class TurnRecorder:
+    """Appends one redacted JSON line per agent turn (thread-safe)."""
+
+    def __init__(self, path: str, redactor: Redactor | None = None):
+        self.path = path
+        self.redactor = redactor or Redactor(corpus_salt(path))
+        self._lock = threading.Lock()
+        self._held: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()  # session -> turns
+        self._released: "OrderedDict[str, None]" = OrderedDict()  # sessions past their first tool call
+        atexit.register(self.flush)
+
+    def build_record(
+        self,
+        user_query: str,
+        history: List[Dict[str, Any]],
+        session_id: str | None,
+        result: Dict[str, Any],
+        trace: Dict[str, Any],
+        total_ms: float,
+    ) -> Dict[str, Any]:
+        from llm_client import SYSTEM_PROMPT
+
+        tool = None
+        if result.get("tool_used"):
+            tool = {
+                "name": result["tool_used"],
+                "arguments": result.get("tool_arguments"),
+                "argument_errors": result.get("argument_errors"),
+                "result": result.get("tool_result"),
+                "ms": round(trace.get("tool_ms", 0.0), 3),
+            }
+        return {
+            "v": RECORD_VERSION,
+            "at": datetime.utcnow().isoformat(),
+            "session": hashlib.sha1(session_id.encode("utf-8")).hexdigest()[:12] if session_id else None,
+            "prompt_sha": hashlib.sha1(SYSTEM_PROMPT.encode("utf-8")).hexdigest()[:12],
+            "user": user_query,
+            "history": history,
+            "llm_calls": trace["llm_calls"],
+            "tool": tool,
+            "assistant_message": result.get("assistant_message"),
+            "total_ms": round(total_ms, 3),
+        }
+
+    def write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    def _redact(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Learn names from every turn first: the tool call that reveals a
+        # name comes after the user message that contains it.
+        for record in records:
+            self.redactor.learn(record)
+        return [self.redactor.redact(record) for record in records]
+
+    def record_turn(self, *args, **kwargs) -> None:
+        record = self.build_record(*args, **kwargs)
+        session = record["session"]
+        with self._lock:
+            if session is None or session in self._released:
+                ready = [record]
+            else:
+                held = self._held.setdefault(session, [])
+                held.append(record)
+                if not record["tool"] and len(held) < HOLD_TURNS:
+                    ready = []
+                    if len(self._held) > MAX_TRACKED_SESSIONS:
+                        ready = self._held.popitem(last=False)[1]
+                else:
+                    ready = self._held.pop(session)
+                    self._released[session] = None
+                    if len(self._released) > MAX_TRACKED_SESSIONS:
+                        self._released.popitem(last=False)
+            ready = self._redact(ready)
+        for r in ready:
+            self.write(r)
+
+    def flush(self) -> None:
+        """Write every held turn (sessions that never reached a tool call)."""
+        with self._lock:
+            held = [r for records in self._held.values() for r in records]
+            self._held.clear()
+            ready = self._redact(held)
+        for r in ready:
+            self.write(r)
+
+
+_RECORDER: TurnRecorder | None = TurnRecorder(RECORD_PATH) if RECORD_PATH else None
+
+
+def get_recorder() -> TurnRecorder | None:
+    return _RECORDER
+
+
+def set_recorder(recorder: TurnRecorder | None) -> TurnRecorder | None:
+    """Install (or with None, remove) the process recorder; returns the previous one.
+
+    The previous recorder's held turns are written out first.
+    """
+    global _RECORDER
+    previous, _RECORDER = _RECORDER, recorder
+    if previous is not None:
+        previous.flush()
+    return previous
+
+
+def read_corpus(path: str) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
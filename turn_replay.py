@@ -0,0 +1,199 @@
+"""Replay a recorded turn corpus offline and report conversation cost metrics.
+
+Each recorded turn is re-run through the real `run_agent` and `TOOLS`. A
+stub LLM answers with the turn's recorded responses, in order. Bookings go
+to a scratch copy of reservations.db. What the current build changes
+therefore shows up in the numbers: prompt text, compaction, tool code and
+argument handling. What the model would now answer differently does not.
+
+    AGENT_RECORD_PATH=turns.jsonl streamlit run app.py     # record real turns
+    python turn_replay.py turns.jsonl                      # recorded vs replayed
+    python turn_replay.py turns.jsonl --json build_a.json  # save this build's report
+    python turn_replay.py turns.jsonl --baseline build_a.json
+
+Metrics: turns per booking, LLM calls per turn, prompt tokens per turn,
+tool latency per tool (p50/p95) and agent overhead per turn (everything
+except LLM time). "diverged" counts replayed turns whose tool differs from
+the recorded one, or that asked the stub for more responses than were
+recorded.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+import llm_dispatch
+import reservation_db
+import turn_recorder
+from turn_recorder import Redactor, TurnRecorder, prompt_tokens, read_corpus
+
+# Tools whose successful result is a new booking.
+BOOKING_TOOLS = {"create_reservation", "book_restaurant", "book_table", "make_reservation", "smart_book"}
+
+NO_RESPONSE = json.dumps({"message": "[replay] no recorded response"})
+
+
+def _is_booking(tool: Dict[str, Any] | None) -> bool:
+    if not tool or tool["name"] not in BOOKING_TOOLS or not isinstance(tool.get("result"), dict):
+        return False
+    result = tool["result"]
+    reservation = result.get("reservation") if tool["name"] == "smart_book" else result
+    return bool(isinstance(reservation, dict) and reservation.get("id") and not result.get("already_booked"))
+
+
+def _percentile(values: List[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def summarize(turns: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate metrics over recorded (or replayed) turn records."""
+    by_session: Dict[Any, List[Dict[str, Any]]] = defaultdict(list)
+    for n, turn in enumerate(turns):
+        by_session[turn.get("session") or f"turn-{n}"].append(turn)
+    turns_to_book = []
+    for session_turns in by_session.values():
+        since_last = 0
+        for turn in session_turns:
+            since_last += 1
+            if _is_booking(turn.get("tool")):
+                turns_to_book.append(since_last)
+                since_last = 0
+
+    tool_ms: Dict[str, List[float]] = defaultdict(list)
+    for turn in turns:
+        if turn.get("tool"):
+            tool_ms[turn["tool"]["name"]].append(turn["tool"]["ms"])
+    overhead = [t["total_ms"] - sum(c["ms"] for c in t["llm_calls"]) for t in turns]
+    return {
+        "turns": len(turns),
+        "sessions": len(by_session),
+        "prompt_sha": sorted({t.get("prompt_sha") for t in turns if t.get("prompt_sha")}),
+        "bookings": len(turns_to_book),
+        "turns_per_booking": round(statistics.mean(turns_to_book), 2) if turns_to_book else None,
+        "llm_calls_per_turn": round(statistics.mean(len(t["llm_calls"]) for t in turns), 2) if turns else 0,
+        "prompt_tokens_per_turn": round(
+            statistics.mean(sum(c["prompt_tokens"] for c in t["llm_calls"]) for t in turns), 1
+        ) if turns else 0,
+        "overhead_ms_p50": round(_percentile(overhead, 0.5), 2) if overhead else 0,
+        "tool_ms": {
+            name: {"calls": len(ms), "p50": round(_percentile(ms, 0.5), 2), "p95": round(_percentile(ms, 0.95), 2)}
+            for name, ms in sorted(tool_ms.items())
+        },
+    }
+
+
+class _Collector(TurnRecorder):
+    """Keeps replayed turns in memory; replayed data is already redacted."""
+
+    def __init__(self):
+        super().__init__(path=os.devnull, redactor=Redactor())
+        self.records: List[Dict[str, Any]] = []
+
+    def record_turn(self, *args, **kwargs) -> None:
+        self.records.append(self.build_record(*args, **kwargs))
+
+
+@contextmanager
+def _replay_environment(db_path: str | None) -> Iterator[_Collector]:
+    """Scratch DB, collecting recorder and no real LLM for the duration."""
+    tmp = tempfile.mkdtemp()
+    previous_db, previous_dispatcher = reservation_db.DB_PATH, llm_dispatch._DISPATCHER
+    collector = _Collector()
+    previous_recorder = turn_recorder.set_recorder(collector)
+    try:
+        scratch = os.path.join(tmp, "reservations.db")
+        source = db_path or reservation_db.DB_PATH
+        if os.path.exists(source):
+            shutil.copy(source, scratch)
+        reservation_db.DB_PATH = scratch
+        yield collector
+    finally:
+        reservation_db.DB_PATH = previous_db
+        llm_dispatch._DISPATCHER = previous_dispatcher
+        turn_recorder.set_recorder(previous_recorder)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def replay(turns: List[Dict[str, Any]], db_path: str | None = None) -> Dict[str, Any]:
+    """Re-run recorded turns against the current build; returns the summary plus divergences."""
+    from agent import run_agent
+
+    diverged = 0
+    with _replay_environment(db_path) as collector:
+        for n, turn in enumerate(turns):
+            responses = iter(c["response"] for c in turn["llm_calls"])
+            unmatched = []
+
+            def stub(messages, **_kwargs):
+                response = next(responses, None)
+                if response is None:
+                    unmatched.append(prompt_tokens(messages))
+                    return NO_RESPONSE
+                return response
+
+            llm_dispatch._DISPATCHER = llm_dispatch.LLMDispatcher(call=stub, max_retries=0)
+            run_agent(turn["user"], turn.get("history") or [], session_id=turn.get("session") or f"turn-{n}")
+            replayed = collector.records[-1]
+            replayed["session"] = turn.get("session") or f"turn-{n}"
+            for call in replayed["llm_calls"]:
+                call["ms"] = 0.0  # stub time is not LLM time
+            recorded_tool = (turn.get("tool") or {}).get("name")
+            replayed_tool = (replayed.get("tool") or {}).get("name")
+            if unmatched or recorded_tool != replayed_tool:
+                diverged += 1
+    return {**summarize(collector.records), "diverged": diverged}
+
+
+def _print_report(title: str, report: Dict[str, Any], baseline: Dict[str, Any] | None = None) -> None:
+    print(f"== {title}")
+    for key in ("prompt_sha", "turns", "sessions", "bookings", "turns_per_booking", "llm_calls_per_turn",
+                "prompt_tokens_per_turn", "overhead_ms_p50", "diverged"):
+        if key not in report:
+            continue
+        line = f"  {key:24} {report[key]}"
+        before = (baseline or {}).get(key)
+        if isinstance(before, (int, float)) and isinstance(report[key], (int, float)) and before:
+            line += f"   ({(report[key] - before) / before:+.1%} vs baseline {before})"
+        print(line)
+    for name, stats in report["tool_ms"].items():
+        line = f"  tool {name:19} n={stats['calls']:<4} p50 {stats['p50']:8.2f} ms  p95 {stats['p95']:8.2f} ms"
+        before = ((baseline or {}).get("tool_ms") or {}).get(name)
+        if before:
+            line += f"   (baseline p50 {before['p50']:.2f} ms)"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpus", help="JSONL written with AGENT_RECORD_PATH")
+    parser.add_argument("--db", help="reservations DB to copy for the replay (default: reservations.db)")
+    parser.add_argument("--json", help="write this build's replay report here")
+    parser.add_argument("--baseline", help="replay report JSON of another build to compare with")
+    args = parser.parse_args()
+
+    turns = read_corpus(args.corpus)
+    started = time.perf_counter()
+    report = replay(turns, db_path=args.db)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    _print_report(f"recorded ({args.corpus})", summarize(turns))
+    _print_report(
+        f"replayed on this build ({time.perf_counter() - started:.1f}s)", report, baseline
+    )
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()